@@ -3,5 +3,9 @@ Module d'analyse thématique des articles
 """
 
 from .theme_classifier import ThemeClassifier
+from .ollama_client import OllamaClient, OllamaError, OllamaUnavailable, get_ollama_client
+from .llm_cache import LLMCache
+from .local_classifier import LocalClassifier, load_local_classifier
 
-__all__ = ['ThemeClassifier']
+__all__ = ['ThemeClassifier', 'OllamaClient', 'OllamaError', 'OllamaUnavailable', 'get_ollama_client',
+           'LLMCache', 'LocalClassifier', 'load_local_classifier']
@@ -3,8 +3,8 @@ Analyseur d'audience multi-plateformes
 Analyse séparée : Web, Facebook, Twitter
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional
 from database.db_manager import DatabaseManager
 
 
@@ -27,25 +27,26 @@ class AudienceAnalyzer:
         cursor = conn.cursor()
         
         try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
+            date_limit = self._first_day(days)
             now = datetime.now().isoformat()
             
+            # Agrégats quotidiens (daily_media_stats): une ligne par média et par jour publié
             cursor.execute("""
                 SELECT 
                     m.id,
                     m.nom,
                     m.url,
-                    COUNT(a.id) as total_articles,
-                    MAX(a.date_publication) as derniere_publication,
-                    MIN(a.date_publication) as premiere_publication,
-                    COUNT(DISTINCT DATE(a.date_publication)) as jours_avec_publication,
+                    COALESCE(SUM(d.publications), 0) as total_articles,
+                    MAX(d.derniere_publication) as derniere_publication,
+                    MIN(d.premiere_publication) as premiere_publication,
+                    COUNT(d.jour) as jours_avec_publication,
                     CASE 
-                        WHEN MAX(a.date_publication) IS NULL THEN 999
-                        ELSE CAST((julianday(?) - julianday(MAX(a.date_publication))) AS INTEGER)
+                        WHEN MAX(d.derniere_publication) IS NULL THEN 999
+                        ELSE CAST((julianday(?) - julianday(MAX(d.derniere_publication))) AS INTEGER)
                     END as jours_depuis_derniere_pub
                 FROM medias m
-                LEFT JOIN articles a ON m.id = a.media_id 
-                    AND a.date_publication >= ?
+                LEFT JOIN daily_media_stats d ON m.id = d.media_id 
+                    AND d.plateforme = 'web' AND d.jour >= ?
                 WHERE m.actif = 1
                 GROUP BY m.id, m.nom, m.url
                 ORDER BY total_articles DESC
@@ -93,7 +94,7 @@ class AudienceAnalyzer:
         cursor = conn.cursor()
         
         try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
+            date_limit = self._first_day(days)
             now = datetime.now().isoformat()
             
             cursor.execute("""
@@ -102,21 +103,21 @@ class AudienceAnalyzer:
                     m.nom,
                     m.url,
                     m.facebook_page,
-                    COUNT(fp.id) as total_posts,
-                    SUM(fp.likes) as total_likes,
-                    SUM(fp.comments) as total_comments,
-                    SUM(fp.shares) as total_shares,
-                    SUM(fp.engagement_total) as engagement_total,
-                    ROUND(AVG(fp.engagement_total), 2) as engagement_moyen,
-                    MAX(fp.date_publication) as derniere_publication,
-                    COUNT(DISTINCT DATE(fp.date_publication)) as jours_avec_publication,
+                    COALESCE(SUM(d.publications), 0) as total_posts,
+                    SUM(d.likes) as total_likes,
+                    SUM(d.comments) as total_comments,
+                    SUM(d.shares) as total_shares,
+                    SUM(d.engagement_total) as engagement_total,
+                    ROUND(CAST(SUM(d.engagement_total) AS REAL) / SUM(d.publications), 2) as engagement_moyen,
+                    MAX(d.derniere_publication) as derniere_publication,
+                    COUNT(d.jour) as jours_avec_publication,
                     CASE 
-                        WHEN MAX(fp.date_publication) IS NULL THEN 999
-                        ELSE CAST((julianday(?) - julianday(MAX(fp.date_publication))) AS INTEGER)
+                        WHEN MAX(d.derniere_publication) IS NULL THEN 999
+                        ELSE CAST((julianday(?) - julianday(MAX(d.derniere_publication))) AS INTEGER)
                     END as jours_depuis_derniere_pub
                 FROM medias m
-                LEFT JOIN facebook_posts fp ON m.id = fp.media_id 
-                    AND fp.date_publication >= ?
+                LEFT JOIN daily_media_stats d ON m.id = d.media_id 
+                    AND d.plateforme = 'facebook' AND d.jour >= ?
                 WHERE m.actif = 1 AND m.facebook_page IS NOT NULL
                 GROUP BY m.id, m.nom, m.url, m.facebook_page
                 ORDER BY engagement_total DESC
@@ -169,7 +170,7 @@ class AudienceAnalyzer:
         cursor = conn.cursor()
         
         try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
+            date_limit = self._first_day(days)
             now = datetime.now().isoformat()
             
             cursor.execute("""
@@ -178,23 +179,23 @@ class AudienceAnalyzer:
                     m.nom,
                     m.url,
                     m.twitter_account,
-                    COUNT(tw.id) as total_tweets,
-                    SUM(tw.retweets) as total_retweets,
-                    SUM(tw.replies) as total_replies,
-                    SUM(tw.likes) as total_likes,
-                    SUM(tw.quotes) as total_quotes,
-                    SUM(tw.impressions) as total_impressions,
-                    SUM(tw.engagement_total) as engagement_total,
-                    ROUND(AVG(tw.engagement_total), 2) as engagement_moyen,
-                    MAX(tw.date_publication) as derniere_publication,
-                    COUNT(DISTINCT DATE(tw.date_publication)) as jours_avec_publication,
+                    COALESCE(SUM(d.publications), 0) as total_tweets,
+                    SUM(d.retweets) as total_retweets,
+                    SUM(d.replies) as total_replies,
+                    SUM(d.likes) as total_likes,
+                    SUM(d.quotes) as total_quotes,
+                    SUM(d.impressions) as total_impressions,
+                    SUM(d.engagement_total) as engagement_total,
+                    ROUND(CAST(SUM(d.engagement_total) AS REAL) / SUM(d.publications), 2) as engagement_moyen,
+                    MAX(d.derniere_publication) as derniere_publication,
+                    COUNT(d.jour) as jours_avec_publication,
                     CASE 
-                        WHEN MAX(tw.date_publication) IS NULL THEN 999
-                        ELSE CAST((julianday(?) - julianday(MAX(tw.date_publication))) AS INTEGER)
+                        WHEN MAX(d.derniere_publication) IS NULL THEN 999
+                        ELSE CAST((julianday(?) - julianday(MAX(d.derniere_publication))) AS INTEGER)
                     END as jours_depuis_derniere_pub
                 FROM medias m
-                LEFT JOIN twitter_tweets tw ON m.id = tw.media_id 
-                    AND tw.date_publication >= ?
+                LEFT JOIN daily_media_stats d ON m.id = d.media_id 
+                    AND d.plateforme = 'twitter' AND d.jour >= ?
                 WHERE m.actif = 1 AND m.twitter_account IS NOT NULL
                 GROUP BY m.id, m.nom, m.url, m.twitter_account
                 ORDER BY engagement_total DESC
@@ -292,8 +293,89 @@ class AudienceAnalyzer:
         
         return results
     
+    # ==================== INSTANTANÉS (media_metrics) ====================
+    
+    def materialize_media_metrics(self, periods: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        Enregistrer dans media_metrics le classement et l'audience globale de chaque période
+        
+        Appelé en fin de scraping: les vues de classement et d'audience globale
+        lisent ensuite le dernier instantané au lieu de recalculer.
+        
+        Args:
+            periods: Périodes en jours (défaut: DatabaseManager.METRICS_PERIODS)
+            
+        Returns:
+            Nombre de médias enregistrés par période
+        """
+        saved = {}
+        for days in periods or self.db.METRICS_PERIODS:
+            ranking = {m['id']: m for m in self.db.get_media_ranking_with_twitter(days)}
+            metrics = []
+            
+            for media in self.analyze_global_audience(days):
+                row = ranking.get(media['id'])
+                if row is None:
+                    continue
+                metrics.append({
+                    **row,
+                    'score_volume': media['total_publications'] / 10,
+                    'score_engagement': media['total_engagement'] / 100,
+                    'score_influence': media['score_influence'],
+                    # Totaux de l'audience globale: seuls les médias ayant une page Facebook
+                    # ou un compte Twitter y comptent pour ces plateformes
+                    'details': {
+                        'total_publications': media['total_publications'],
+                        'total_engagement': media['total_engagement'],
+                        'web': media['web'],
+                        'facebook': media['facebook'],
+                        'twitter': media['twitter']
+                    }
+                })
+            
+            saved[days] = self.db.save_media_metrics(days, metrics)
+        
+        return saved
+    
+    def get_global_audience(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Audience globale lue dans le dernier instantané de media_metrics
+        
+        Recalcule (analyze_global_audience) si la période n'est pas matérialisée
+        ou si l'instantané est trop ancien.
+        
+        Returns:
+            Liste des médias avec métriques combinées, triée par score d'influence
+        """
+        snapshot = self.db.get_latest_media_metrics(days)
+        if snapshot is None:
+            return self.analyze_global_audience(days)
+        
+        results = []
+        for media in snapshot:
+            details = media['details'] or {}
+            results.append({
+                'id': media['id'],
+                'nom': media['nom'],
+                'url': media['url'],
+                'total_publications': details.get('total_publications', 0),
+                'total_engagement': details.get('total_engagement', 0),
+                'score_influence': media['score_influence'],
+                'web': details.get('web'),
+                'facebook': details.get('facebook'),
+                'twitter': details.get('twitter')
+            })
+        
+        results.sort(key=lambda x: x['score_influence'], reverse=True)
+        
+        return results
+    
     # ==================== UTILITAIRES ====================
     
+    def _first_day(self, days: int) -> str:
+        """Premier jour (YYYY-MM-DD) d'une période de N jours calendaires, pour daily_media_stats"""
+        return self.db.period_first_day(days)
+    
     def _get_publication_status(self, jours: int) -> str:
         """Détermine le statut de publication"""
         if jours == 999:
@@ -3,28 +3,71 @@ Module de détection de contenus sensibles avec Ollama
 Détecte : incitation à la haine, fake news, discours toxique
 """
 
-import requests
 import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from .llm_cache import LLMCache, prompt_version
+from .ollama_client import OllamaClient, OllamaError, OllamaUnavailable, get_ollama_client
+
 
 class ContentModerator:
     """
     Analyseur de contenus sensibles utilisant Ollama
     """
     
-    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral:latest"):
+    # Prompt d'analyse unifiée ({text}: extrait du contenu)
+    ANALYSIS_PROMPT = """Tu es un modérateur de contenu pour un régulateur des médias au Burkina Faso.
+
+Analyse ce texte et détermine s'il contient du contenu problématique.
+
+IMPORTANT: Distingue entre:
+- RAPPORTER/INFORMER sur des faits = LÉGITIME, scores faibles
+- PROMOUVOIR/INCITER = PROBLÉMATIQUE, scores élevés
+
+Texte: "{text}"
+
+Évalue ces 3 aspects (scores 0-10):
+1. Toxicité: Incitation à la haine, violence, insultes, discrimination
+2. Désinformation: Fausses informations, manipulation, théories du complot
+3. Sensibilité: Traitement irresponsable de sujets sensibles
+
+Puis DÉCIDE quel est le problème PRINCIPAL (si aucun, mets "none"):
+- "toxicity" si c'est principalement du discours de haine/violence
+- "misinformation" si c'est principalement de la désinformation
+- "sensitivity" si c'est principalement un traitement sensationnaliste
+- "none" si le contenu est acceptable
+
+Réponds UNIQUEMENT au format JSON:
+{{
+    "toxicity_score": 0-10,
+    "misinformation_score": 0-10,
+    "sensitivity_score": 0-10,
+    "primary_issue": "toxicity/misinformation/sensitivity/none",
+    "contexte": "informatif/promotionnel",
+    "sources_citees": true/false,
+    "traitement": "factuel/sensationnaliste"
+}}"""
+    
+    # Version du prompt dans les clés du cache LLM: modifier le prompt invalide le cache
+    PROMPT_VERSION = prompt_version(ANALYSIS_PROMPT)
+    
+    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral:latest",
+                 client: Optional[OllamaClient] = None, cache: Optional[LLMCache] = None):
         """
         Initialise le modérateur de contenu
         
         Args:
             ollama_url: URL de l'API Ollama
             model: Modèle Ollama à utiliser
+            client: Client Ollama (par défaut le client partagé du serveur)
+            cache: Cache des résultats LLM de analyze_content (None: pas de cache)
         """
         self.ollama_url = ollama_url
         self.model = model
         self.api_endpoint = f"{ollama_url}/api/generate"
+        self.client = client or get_ollama_client(ollama_url)
+        self.cache = cache
     
     def check_ollama_status(self) -> bool:
         """
@@ -33,11 +76,7 @@ class ContentModerator:
         Returns:
             True si Ollama est disponible, False sinon
         """
-        try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        return self.client.is_available()
     
     def _call_ollama(self, prompt: str, max_tokens: int = 500) -> str:
         """
@@ -51,30 +90,21 @@ class ContentModerator:
             Réponse du modèle
         """
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
+            return self.client.generate(
+                self.model,
+                prompt,
+                options={
                     "temperature": 0.3,  # Faible température pour plus de cohérence
                     "num_predict": max_tokens
-                }
-            }
-            
-            response = requests.post(
-                self.api_endpoint,
-                json=payload,
+                },
                 timeout=60
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '').strip()
-            else:
-                print(f"❌ Erreur Ollama: {response.status_code}")
-                return ""
-                
-        except Exception as e:
+        
+        except OllamaUnavailable:
+            # Disjoncteur ouvert: réponse vide, l'analyse utilise ses valeurs par défaut
+            return ""
+        
+        except OllamaError as e:
             print(f"❌ Erreur lors de l'appel à Ollama: {e}")
             return ""
     
@@ -243,39 +273,16 @@ Réponds UNIQUEMENT au format JSON suivant:
         # Limiter la taille du texte pour l'analyse
         text_sample = text[:2000] if len(text) > 2000 else text
         
-        # Analyse unifiée avec décision de l'IA sur le type principal
-        prompt = f"""Tu es un modérateur de contenu pour un régulateur des médias au Burkina Faso.
-
-Analyse ce texte et détermine s'il contient du contenu problématique.
-
-IMPORTANT: Distingue entre:
-- RAPPORTER/INFORMER sur des faits = LÉGITIME, scores faibles
-- PROMOUVOIR/INCITER = PROBLÉMATIQUE, scores élevés
-
-Texte: "{text_sample}"
-
-Évalue ces 3 aspects (scores 0-10):
-1. Toxicité: Incitation à la haine, violence, insultes, discrimination
-2. Désinformation: Fausses informations, manipulation, théories du complot
-3. Sensibilité: Traitement irresponsable de sujets sensibles
-
-Puis DÉCIDE quel est le problème PRINCIPAL (si aucun, mets "none"):
-- "toxicity" si c'est principalement du discours de haine/violence
-- "misinformation" si c'est principalement de la désinformation
-- "sensitivity" si c'est principalement un traitement sensationnaliste
-- "none" si le contenu est acceptable
-
-Réponds UNIQUEMENT au format JSON:
-{{
-    "toxicity_score": 0-10,
-    "misinformation_score": 0-10,
-    "sensitivity_score": 0-10,
-    "primary_issue": "toxicity/misinformation/sensitivity/none",
-    "contexte": "informatif/promotionnel",
-    "sources_citees": true/false,
-    "traitement": "factuel/sensationnaliste"
-}}"""
-
+        prompt = self.ANALYSIS_PROMPT.format(text=text_sample)
+        
+        # Résultat déjà obtenu pour ce texte, ce prompt et ce modèle: pas d'appel au LLM
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.key('moderation', text_sample, self.PROMPT_VERSION, self.model)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._build_analysis(cached, content_type, text)
+        
         response = self._call_ollama(prompt, max_tokens=200)
         
         try:
@@ -284,59 +291,76 @@ Réponds UNIQUEMENT au format JSON:
             if json_start != -1 and json_end > json_start:
                 json_str = response[json_start:json_end]
                 result = json.loads(json_str)
+                analysis = self._build_analysis(result, content_type, text)
                 
-                # Construire les détails
-                toxicity = {
-                    'est_toxique': result.get('toxicity_score', 0) >= 6,
-                    'score_toxicite': result.get('toxicity_score', 0),
-                    'contexte': result.get('contexte', 'informatif')
-                }
-                
-                misinformation = {
-                    'est_desinformation': result.get('misinformation_score', 0) >= 6,
-                    'score_desinformation': result.get('misinformation_score', 0),
-                    'sources_citees': result.get('sources_citees', False)
-                }
-                
-                sensitivity = {
-                    'est_sensible': result.get('sensitivity_score', 0) >= 6,
-                    'score_sensibilite': result.get('sensitivity_score', 0),
-                    'traitement': result.get('traitement', 'factuel')
-                }
-                
-                # Calcul du score de risque
-                risk_score = (
-                    result.get('toxicity_score', 0) * 0.4 +
-                    result.get('misinformation_score', 0) * 0.4 +
-                    result.get('sensitivity_score', 0) * 0.2
-                )
-                
-                risk_level = self._determine_risk_level(risk_score)
-                
-                should_flag = (
-                    risk_score >= 7.0 or
-                    result.get('toxicity_score', 0) >= 8.0 or
-                    result.get('misinformation_score', 0) >= 8.0
-                )
-                
-                return {
-                    'content_type': content_type,
-                    'analyzed_at': datetime.now().isoformat(),
-                    'toxicity': toxicity,
-                    'misinformation': misinformation,
-                    'sensitivity': sensitivity,
-                    'risk_score': round(risk_score, 2),
-                    'risk_level': risk_level,
-                    'should_flag': should_flag,
-                    'primary_issue': result.get('primary_issue', 'none'),
-                    'text_length': len(text)
-                }
+                if self.cache:
+                    self.cache.put(cache_key, 'moderation', self.PROMPT_VERSION, self.model, result)
+                return analysis
             else:
                 return self._default_analysis_result()
         except Exception as e:
             print(f"⚠️ Erreur parsing: {e}")
             return self._default_analysis_result()
     
+    def _build_analysis(self, result: Dict, content_type: str, text: str) -> Dict:
+        """
+        Construire l'analyse à partir du JSON retourné par le modèle (ou lu dans le cache)
+        
+        Args:
+            result: JSON analysé (scores, primary_issue, contexte...)
+            content_type: Type de contenu
+            text: Texte analysé
+            
+        Returns:
+            Dict avec toutes les analyses
+        """
+        # Construire les détails
+        toxicity = {
+            'est_toxique': result.get('toxicity_score', 0) >= 6,
+            'score_toxicite': result.get('toxicity_score', 0),
+            'contexte': result.get('contexte', 'informatif')
+        }
+        
+        misinformation = {
+            'est_desinformation': result.get('misinformation_score', 0) >= 6,
+            'score_desinformation': result.get('misinformation_score', 0),
+            'sources_citees': result.get('sources_citees', False)
+        }
+        
+        sensitivity = {
+            'est_sensible': result.get('sensitivity_score', 0) >= 6,
+            'score_sensibilite': result.get('sensitivity_score', 0),
+            'traitement': result.get('traitement', 'factuel')
+        }
+        
+        # Calcul du score de risque
+        risk_score = (
+            result.get('toxicity_score', 0) * 0.4 +
+            result.get('misinformation_score', 0) * 0.4 +
+            result.get('sensitivity_score', 0) * 0.2
+        )
+        
+        risk_level = self._determine_risk_level(risk_score)
+        
+        should_flag = (
+            risk_score >= 7.0 or
+            result.get('toxicity_score', 0) >= 8.0 or
+            result.get('misinformation_score', 0) >= 8.0
+        )
+        
+        return {
+            'content_type': content_type,
+            'analyzed_at': datetime.now().isoformat(),
+            'toxicity': toxicity,
+            'misinformation': misinformation,
+            'sensitivity': sensitivity,
+            'risk_score': round(risk_score, 2),
+            'risk_level': risk_level,
+            'should_flag': should_flag,
+            'primary_issue': result.get('primary_issue', 'none'),
+            'text_length': len(text)
+        }
+    
     def _calculate_risk_score(self, toxicity: Dict, misinformation: Dict, sensitivity: Dict) -> float:
         """
         Calcule le score de risque global
@@ -470,17 +494,12 @@ Réponds UNIQUEMENT au format JSON:
             True si la connexion fonctionne
         """
         try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get('models', [])
-                print(f"✅ Connexion à Ollama réussie")
-                print(f"📦 Modèles disponibles: {[m['name'] for m in models]}")
-                return True
-            else:
-                print(f"❌ Erreur de connexion à Ollama: {response.status_code}")
-                return False
-        except Exception as e:
-            print(f"❌ Impossible de se connecter à Ollama: {e}")
+            models = self.client.list_models()
+            print(f"✅ Connexion à Ollama réussie")
+            print(f"📦 Modèles disponibles: {models}")
+            return True
+        except (OllamaError, ValueError) as e:
+            print(f"❌ {e}")
             print(f"💡 Assurez-vous qu'Ollama est lancé: ollama serve")
             return False
 
@@ -0,0 +1,189 @@
+"""
+Cache persistant des résultats LLM (table llm_cache)
+Un article republié par plusieurs médias, re-téléchargé ou re-scrapé n'est
+pas réanalysé: la clé combine le texte normalisé, la version du prompt et
+le modèle, donc modifier un prompt invalide automatiquement ses entrées
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+from database.db_manager import DatabaseManager
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def prompt_version(template: str) -> str:
+    """
+    Version d'un modèle de prompt: empreinte de son texte
+
+    Args:
+        template: Modèle de prompt
+
+    Returns:
+        12 premiers caractères du SHA-256 du modèle
+    """
+    return hashlib.sha256(template.encode('utf-8')).hexdigest()[:12]
+
+
+def normalize_text(text: str) -> str:
+    """Texte normalisé pour la clé de cache: Unicode NFC, espaces fusionnés"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+
+class LLMCache:
+    """Cache des résultats LLM dans SQLite, borné en nombre d'entrées (LRU)"""
+
+    def __init__(self, db: DatabaseManager, max_entries: int = 50000, evict_every: int = 500):
+        """
+        Initialise le cache
+
+        Args:
+            db: Base de données contenant la table llm_cache
+            max_entries: Nombre maximum d'entrées conservées (les moins récemment utilisées sont supprimées)
+            evict_every: Nombre d'ajouts entre deux évictions (dépassement maximal de max_entries)
+        """
+        self.db = db
+        self.max_entries = max_entries
+        self.evict_every = max(1, evict_every)
+        self.stats = {'hits': 0, 'misses': 0, 'ajouts': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tache: str, text: str, version: str, modele: str) -> str:
+        """
+        Clé de cache d'un appel LLM
+
+        Args:
+            tache: Type d'analyse ('classification', 'moderation')
+            text: Texte inséré dans le prompt
+            version: Version du prompt (prompt_version)
+            modele: Nom du modèle
+
+        Returns:
+            SHA-256 hexadécimal
+        """
+        data = '\x00'.join((tache, version, modele, normalize_text(text)))
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Lire un résultat en cache
+
+        Args:
+            cache_key: Clé calculée par key()
+
+        Returns:
+            Résultat analysé, ou None si absent
+        """
+        conn = self.db.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT resultat FROM llm_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.stats['hits' if row else 'misses'] += 1
+        if row is None:
+            return None
+
+        # Mise à jour LRU sans attendre l'écriture
+        def touch(conn: sqlite3.Connection):
+            conn.execute("""
+                UPDATE llm_cache SET hits = hits + 1, last_used_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE cache_key = ?
+            """, (cache_key,))
+
+        self.db.write(touch, wait=False)
+        return json.loads(row['resultat'])
+
+    def put(self, cache_key: str, tache: str, version: str, modele: str, resultat: Dict[str, Any]):
+        """
+        Enregistrer le résultat d'un appel LLM
+
+        Args:
+            cache_key: Clé calculée par key()
+            tache: Type d'analyse
+            version: Version du prompt
+            modele: Nom du modèle
+            resultat: Résultat analysé (sérialisable en JSON)
+        """
+        def write(conn: sqlite3.Connection):
+            conn.execute("""
+                INSERT INTO llm_cache (cache_key, tache, modele, prompt_version, resultat)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    resultat = excluded.resultat,
+                    last_used_at = excluded.last_used_at
+            """, (cache_key, tache, modele, version, json.dumps(resultat, ensure_ascii=False)))
+
+        self.db.write(write, wait=False)
+
+        with self._lock:
+            self.stats['ajouts'] += 1
+            evict = self.stats['ajouts'] % self.evict_every == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Supprimer les entrées les moins récemment utilisées au-delà de max_entries
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        def write(conn: sqlite3.Connection):
+            cursor = conn.execute("""
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache
+                    ORDER BY last_used_at, rowid
+                    LIMIT max(0, (SELECT COUNT(*) FROM llm_cache) - ?)
+                )
+            """, (self.max_entries,))
+            return cursor.rowcount
+
+        removed = self.db.write(write)
+        with self._lock:
+            self.stats['evictions'] += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache
+
+        Returns:
+            Dictionnaire: compteurs du processus (hits, misses, taux_hit en %)
+            et contenu de la table (entrees, hits_total, par_tache)
+        """
+        self.db.flush_writes()
+        conn = self.db.get_connection()
+        try:
+            rows = conn.execute("""
+                SELECT tache, COUNT(*) as entrees, COALESCE(SUM(hits), 0) as hits
+                FROM llm_cache
+                GROUP BY tache
+            """).fetchall()
+        finally:
+            conn.close()
+
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['taux_hit'] = round(100 * stats['hits'] / lookups, 1) if lookups else 0
+        stats['entrees'] = sum(row['entrees'] for row in rows)
+        stats['hits_total'] = sum(row['hits'] for row in rows)
+        stats['par_tache'] = {row['tache']: row['entrees'] for row in rows}
+        return stats
+
+    def summary(self) -> str:
+        """Résumé d'une ligne des statistiques (fin de script)"""
+        stats = self.get_stats()
+        return (f"💾 Cache LLM: {stats['hits']} résultats réutilisés sur "
+                f"{stats['hits'] + stats['misses']} ({stats['taux_hit']}%), {stats['entrees']} entrées")
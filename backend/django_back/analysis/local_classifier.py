@@ -0,0 +1,222 @@
+"""
+Modèle local de classification thématique (CPU, sans LLM)
+Entraîné hors ligne sur les classifications déjà produites par Mistral:
+n-grammes de mots hachés, pondération TF-IDF et régression logistique.
+ThemeClassifier l'utilise en premier et n'appelle le LLM que lorsque la
+confiance du modèle est insuffisante
+"""
+
+import os
+import random
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+DEFAULT_MODEL_PATH = 'data/models/theme_classifier.joblib'
+
+
+def model_text(titre: str, contenu: str) -> str:
+    """Texte soumis au modèle: le même extrait que celui envoyé au LLM"""
+    return f"{titre or ''}\n\n{(contenu or '')[:2000]}"
+
+
+class LocalClassifier:
+    """Classificateur linéaire sur n-grammes hachés, sauvegardé avec joblib"""
+
+    def __init__(self, pipeline: Any, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Initialise le classificateur
+
+        Args:
+            pipeline: Pipeline scikit-learn entraîné (predict_proba, classes_)
+            metadata: Informations d'entraînement (date, échantillons, évaluation)
+        """
+        self.pipeline = pipeline
+        self.metadata = metadata or {}
+        self.classes = [str(c) for c in pipeline.classes_]
+
+        # Poids (catégories x colonnes de hachage) en ordre Fortran: le produit avec
+        # le vecteur creux d'un article ne recopie plus la matrice (30 ms -> 2 ms)
+        estimator = pipeline[-1]
+        if isinstance(getattr(estimator, 'coef_', None), np.ndarray):
+            estimator.coef_ = np.asfortranarray(estimator.coef_)
+
+    @staticmethod
+    def build_pipeline(n_features: int = 2 ** 20, alpha: float = 1e-5):
+        """
+        Pipeline non entraîné: HashingVectorizer (mots et bigrammes) + TF-IDF + régression logistique
+
+        Le hachage évite de conserver un vocabulaire: le modèle sauvegardé ne
+        contient que les poids, et un mot inconnu à l'entraînement ne coûte rien.
+        La régression logistique est ajustée par descente de gradient
+        stochastique (quelques secondes pour des dizaines de milliers d'articles).
+
+        Args:
+            n_features: Nombre de colonnes de hachage
+            alpha: Régularisation (plus faible: probabilités plus tranchées)
+
+        Returns:
+            Pipeline scikit-learn
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import make_pipeline
+
+        return make_pipeline(
+            HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False,
+                              norm=None, lowercase=True),
+            TfidfTransformer(sublinear_tf=True),
+            SGDClassifier(loss='log_loss', alpha=alpha, max_iter=50, random_state=0)
+        )
+
+    @classmethod
+    def train(cls, samples: List[Dict[str, Any]], test_size: float = 0.2,
+              threshold: float = 0.8, seed: int = 42) -> 'LocalClassifier':
+        """
+        Entraîner le modèle sur des articles étiquetés
+
+        Une partie des articles est d'abord réservée pour mesurer la précision
+        et la part d'articles classés sans LLM au seuil donné, puis le modèle
+        final est entraîné sur tous les articles.
+
+        Args:
+            samples: Dictionnaires avec titre, contenu et categorie
+            test_size: Part des articles réservée à l'évaluation (0: pas d'évaluation)
+            threshold: Seuil de confiance évalué
+            seed: Graine du tirage de l'évaluation
+
+        Returns:
+            Classificateur entraîné (évaluation dans metadata['evaluation'])
+
+        Raises:
+            ValueError: Moins de deux catégories dans les articles
+        """
+        texts = [model_text(s['titre'], s['contenu']) for s in samples]
+        labels = [s['categorie'] for s in samples]
+        if len(set(labels)) < 2:
+            raise ValueError("Au moins deux catégories sont nécessaires pour entraîner le modèle")
+
+        evaluation = None
+        indices = list(range(len(samples)))
+        random.Random(seed).shuffle(indices)
+        n_test = int(len(indices) * test_size)
+        train_idx, test_idx = indices[n_test:], indices[:n_test]
+        if test_idx and len({labels[i] for i in train_idx}) >= 2:
+            model = cls(cls.build_pipeline().fit([texts[i] for i in train_idx],
+                                                 [labels[i] for i in train_idx]))
+            evaluation = model.evaluate([texts[i] for i in test_idx],
+                                        [labels[i] for i in test_idx], threshold)
+
+        pipeline = cls.build_pipeline().fit(texts, labels)
+        return cls(pipeline, {
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'samples': len(samples),
+            'categories': dict(Counter(labels)),
+            'evaluation': evaluation,
+        })
+
+    def evaluate(self, texts: List[str], labels: List[str], threshold: float) -> Dict[str, Any]:
+        """
+        Mesurer le modèle sur des articles étiquetés
+
+        Args:
+            texts: Textes (model_text)
+            labels: Catégories attendues
+            threshold: Seuil de confiance en dessous duquel le LLM serait appelé
+
+        Returns:
+            Dictionnaire: articles, precision (tous les articles), couverture
+            (part au-dessus du seuil), precision_couverte et taux_escalade, en %
+        """
+        predictions = self._predict_many(texts)
+        covered = [(cat, label) for (cat, conf), label in zip(predictions, labels) if conf >= threshold]
+
+        def percent(part: int, total: int) -> float:
+            return round(100 * part / total, 1) if total else 0
+
+        correct = sum(1 for (cat, _), label in zip(predictions, labels) if cat == label)
+        correct_covered = sum(1 for cat, label in covered if cat == label)
+        return {
+            'articles': len(texts),
+            'seuil': threshold,
+            'precision': percent(correct, len(texts)),
+            'couverture': percent(len(covered), len(texts)),
+            'precision_couverte': percent(correct_covered, len(covered)),
+            'taux_escalade': percent(len(texts) - len(covered), len(texts)),
+        }
+
+    def _predict_many(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Catégorie la plus probable et sa probabilité pour chaque texte"""
+        probabilities = self.pipeline.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.classes[i], float(row[i])) for i, row in zip(best, probabilities)]
+
+    def predict(self, titre: str, contenu: str) -> Tuple[str, float]:
+        """
+        Classifier un article
+
+        Args:
+            titre: Titre de l'article
+            contenu: Contenu de l'article
+
+        Returns:
+            (catégorie, probabilité de la catégorie)
+        """
+        return self._predict_many([model_text(titre, contenu)])[0]
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        """
+        Sauvegarder le modèle (écriture atomique: un processus en cours de chargement
+        ne lit jamais un fichier partiel)
+
+        Args:
+            path: Chemin du fichier joblib
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        joblib.dump({'pipeline': self.pipeline, 'metadata': self.metadata}, tmp_path, compress=3)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'LocalClassifier':
+        """
+        Charger un modèle sauvegardé
+
+        Args:
+            path: Chemin du fichier joblib
+
+        Returns:
+            Classificateur
+
+        Raises:
+            FileNotFoundError: Aucun modèle à ce chemin
+        """
+        data = joblib.load(path)
+        return cls(data['pipeline'], data.get('metadata'))
+
+
+def load_local_classifier(path: str = DEFAULT_MODEL_PATH) -> Optional[LocalClassifier]:
+    """
+    Charger le modèle local s'il a été entraîné (train_local_classifier.py)
+
+    Args:
+        path: Chemin du fichier joblib
+
+    Returns:
+        Classificateur, ou None si aucun modèle n'est disponible (tout passe par le LLM)
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        model = LocalClassifier.load(path)
+    except Exception as e:
+        print(f"⚠️ Modèle local illisible ({path}): {e}")
+        return None
+
+    print(f"🧠 Modèle local chargé: {model.metadata.get('samples', '?')} articles d'entraînement "
+          f"({model.metadata.get('trained_at', '?')})")
+    return model
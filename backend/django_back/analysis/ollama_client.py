@@ -0,0 +1,256 @@
+"""
+Client Ollama partagé par les analyseurs (classification, modération)
+Connexions HTTP réutilisées, nombre de requêtes simultanées borné,
+nouvelles tentatives avec jitter et disjoncteur: quand le serveur est
+indisponible, les appels échouent immédiatement (repli par mots-clés)
+au lieu d'attendre le timeout à chaque article
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class OllamaError(Exception):
+    """Appel à Ollama impossible (réseau, timeout, réponse invalide)"""
+
+
+class OllamaUnavailable(OllamaError):
+    """Disjoncteur ouvert: Ollama est considéré comme indisponible"""
+
+
+class OllamaClient:
+    """Client HTTP Ollama avec pool de connexions, plafond de concurrence et disjoncteur"""
+
+    def __init__(self, base_url: str = "http://localhost:11434", max_concurrency: int = 2,
+                 keep_alive: str = "30m", connect_timeout: float = 3.0,
+                 max_retries: int = 2, retry_backoff: float = 0.5,
+                 failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """
+        Initialise le client
+
+        Args:
+            base_url: URL du serveur Ollama
+            max_concurrency: Nombre maximum de générations simultanées (au-delà, les appels attendent)
+            keep_alive: Durée pendant laquelle Ollama garde le modèle chargé entre deux appels
+            connect_timeout: Timeout de connexion (s), distinct du timeout de génération
+            max_retries: Nouvelles tentatives sur erreur réseau ou réponse 5xx
+            retry_backoff: Délai de base (s) entre tentatives, doublé à chaque tentative (avec jitter)
+            failure_threshold: Échecs consécutifs ouvrant le disjoncteur
+            reset_timeout: Durée (s) d'ouverture du disjoncteur avant un appel d'essai
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max(1, max_concurrency)
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.stats = {'requetes': 0, 'erreurs': 0, 'tentatives': 0, 'rejets': 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    # ==================== DISJONCTEUR ====================
+
+    @property
+    def circuit_state(self) -> str:
+        """État du disjoncteur: 'ferme', 'ouvert' ou 'essai'"""
+        with self._lock:
+            if self._opened_at is None:
+                return 'ferme'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'ouvert'
+            return 'essai'
+
+    def _before_call(self) -> bool:
+        """
+        Refuser l'appel si le disjoncteur est ouvert (un seul appel d'essai après reset_timeout)
+
+        Returns:
+            True si l'appel est l'appel d'essai
+
+        Raises:
+            OllamaUnavailable: Disjoncteur ouvert
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.stats['rejets'] += 1
+        raise OllamaUnavailable("Ollama indisponible (disjoncteur ouvert)")
+
+    def _record(self, success: bool):
+        """Mettre à jour le disjoncteur après un appel"""
+        with self._lock:
+            self._trial_running = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+
+            self.stats['erreurs'] += 1
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"⚠️ Ollama indisponible ({self._failures} échecs), "
+                          f"repli pendant {self.reset_timeout:.0f}s")
+                self._opened_at = time.monotonic()
+
+    # ==================== APPELS ====================
+
+    def _post(self, path: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """POST JSON avec nouvelles tentatives; une erreur finale compte pour le disjoncteur"""
+        url = f"{self.base_url}{path}"
+        attempt = 0
+
+        while True:
+            try:
+                response = self.session.post(url, json=payload, timeout=(self.connect_timeout, timeout))
+                if response.status_code < 500:
+                    break
+                error: Exception = OllamaError(f"Erreur Ollama: {response.status_code}")
+                retryable = True
+            except requests.Timeout as e:
+                # Serveur surchargé: une nouvelle tentative attendrait encore le timeout
+                error, retryable = OllamaError(f"Timeout Ollama ({timeout}s): {e}"), False
+            except requests.RequestException as e:
+                error, retryable = OllamaError(f"Erreur de connexion à Ollama: {e}"), True
+
+            if not retryable or attempt >= self.max_retries:
+                self._record(False)
+                raise error
+
+            attempt += 1
+            with self._lock:
+                self.stats['tentatives'] += 1
+            # Backoff exponentiel avec jitter: les workers ne réessaient pas tous en même temps
+            time.sleep(random.uniform(0, self.retry_backoff * 2 ** attempt))
+
+        self._record(True)
+        if response.status_code != 200:
+            # Erreur de la requête (modèle absent...): pas une panne du serveur
+            raise OllamaError(f"Erreur Ollama: {response.status_code} {response.text[:200]}")
+
+        try:
+            return response.json()
+        except ValueError:
+            raise OllamaError("Réponse Ollama invalide (JSON attendu)")
+
+    def generate(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                 timeout: float = 60) -> str:
+        """
+        Générer une réponse (sans streaming)
+
+        Args:
+            model: Nom du modèle Ollama
+            prompt: Prompt à envoyer
+            options: Options de génération (temperature, num_predict...)
+            timeout: Durée maximale de génération (s)
+
+        Returns:
+            Texte généré
+
+        Raises:
+            OllamaUnavailable: Disjoncteur ouvert (échec immédiat)
+            OllamaError: Échec de l'appel après les nouvelles tentatives
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": options or {}
+        }
+
+        # Échec immédiat si le disjoncteur est ouvert, sans attendre une place
+        trial = self._before_call()
+        with self._slots:
+            # Le disjoncteur a pu s'ouvrir pendant l'attente d'une place
+            if not trial:
+                self._before_call()
+            with self._lock:
+                self.stats['requetes'] += 1
+            result = self._post('/api/generate', payload, timeout)
+
+        return result.get('response', '').strip()
+
+    def list_models(self, timeout: float = 5) -> List[str]:
+        """
+        Lister les modèles installés
+
+        Returns:
+            Noms des modèles
+
+        Raises:
+            OllamaError: Serveur injoignable
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=timeout)
+        except requests.RequestException as e:
+            raise OllamaError(f"Impossible de se connecter à Ollama: {e}")
+        if response.status_code != 200:
+            raise OllamaError(f"Erreur de connexion à Ollama: {response.status_code}")
+
+        # Serveur joignable: referme le disjoncteur sans attendre reset_timeout
+        self._record(True)
+        return [m['name'] for m in response.json().get('models', [])]
+
+    def is_available(self, timeout: float = 5) -> bool:
+        """
+        Vérifier si Ollama est accessible
+
+        Returns:
+            True si le serveur répond
+        """
+        try:
+            self.list_models(timeout=timeout)
+            return True
+        except (OllamaError, ValueError):
+            return False
+
+
+def default_concurrency() -> int:
+    """Générations simultanées du client partagé: OLLAMA_NUM_PARALLEL (comme le serveur), sinon 2"""
+    try:
+        return max(1, int(os.environ.get('OLLAMA_NUM_PARALLEL', 2)))
+    except ValueError:
+        return 2
+
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ollama_client(base_url: str = "http://localhost:11434") -> OllamaClient:
+    """
+    Client partagé par tous les analyseurs du processus pour un serveur
+
+    Args:
+        base_url: URL du serveur Ollama
+
+    Returns:
+        Client Ollama (le même pour une même URL)
+    """
+    key = base_url.rstrip('/')
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = OllamaClient(key, max_concurrency=default_concurrency())
+        return client
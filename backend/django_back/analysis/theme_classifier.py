@@ -4,11 +4,57 @@ Classificateur thématique utilisant Ollama + Mistral
 Classification automatique des articles en catégories
 """
 
-import requests
 import json
-from typing import Dict, List, Optional, Tuple
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
 from datetime import datetime
 
+from .llm_cache import LLMCache, prompt_version
+from .local_classifier import LocalClassifier
+from .ollama_client import OllamaClient, OllamaUnavailable, get_ollama_client
+
+
+def _keyword_tree_pattern(tree: Dict[str, dict]) -> str:
+    """Expression d'un arbre de préfixes (clé '' : fin d'un mot-clé)"""
+    branches = []
+    for char in sorted(key for key in tree if key):
+        escaped = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(escaped + _keyword_tree_pattern(tree[char]))
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # Fin de mot-clé possible ici: la suite est facultative (le plus long l'emporte)
+    return f"(?:{pattern})?" if '' in tree else pattern
+
+
+def _compile_keyword_pattern(keywords: Dict[str, List[str]]) -> Pattern[str]:
+    """
+    Compiler les mots-clés de toutes les catégories en une seule expression
+    
+    Le groupe 1 capture le mot-clé trouvé; un mot-clé ne correspond qu'à un
+    mot entier (éventuellement au pluriel), 'or' ne correspond donc pas à
+    'ordre' ni 'can' à 'candidat'. Les mots-clés sont factorisés par préfixe
+    ('sécuritaire' et 'sécurité' partagent 'sécurit'): à chaque position le
+    moteur ne teste que les mots-clés commençant par le caractère lu.
+    
+    Args:
+        keywords: Mots-clés (en minuscules) par catégorie
+    
+    Returns:
+        Expression compilée
+    """
+    tree: Dict[str, dict] = {}
+    for liste in keywords.values():
+        for mot in liste:
+            node = tree
+            for char in mot:
+                node = node.setdefault(char, {})
+            node[''] = {}
+    return re.compile(rf"\b({_keyword_tree_pattern(tree)})(?:s|x)?\b")
+
 
 class ThemeClassifier:
     """Classificateur thématique avec Mistral via Ollama"""
@@ -24,17 +70,126 @@ class ThemeClassifier:
         'Autres'
     ]
     
-    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral"):
+    # Mots-clés par catégorie (enrichis pour le contexte burkinabè)
+    FALLBACK_KEYWORDS = {
+        'Politique': [
+            'gouvernement', 'ministre', 'président', 'assemblée', 'député', 'sénat',
+            'élection', 'vote', 'parti', 'politique', 'diplomatie', 'conseil',
+            'transition', 'mpsr', 'capitaine', 'traore', 'ibrahim', 'primature',
+            'décret', 'loi', 'réforme', 'constitutionnel', 'institutionnel',
+            'collectivité', 'décentralisation', 'préfet', 'gouverneur', 'maire',
+            'ambassadeur', 'sommet', 'cedeao', 'aes', 'souveraineté'
+        ],
+        'Économie': [
+            'économie', 'fcfa', 'budget', 'commerce', 'entreprise', 'banque',
+            'agriculture', 'industrie', 'emploi', 'investissement', 'marché',
+            'production', 'exportation', 'croissance', 'pib', 'inflation',
+            'coton', 'or', 'mine', 'minier', 'bceao', 'bourse', 'dette',
+            'entrepreneuriat', 'pme', 'secteur privé', 'développement',
+            'financier', 'fiscal', 'douane', 'import', 'export', 'chômage'
+        ],
+        'Sécurité': [
+            'sécurité', 'armée', 'militaire', 'police', 'terrorisme', 'attaque',
+            'fds', 'vdp', 'gendarmerie', 'criminalité', 'justice', 'tribunal',
+            'procès', 'condamnation', 'terroriste', 'djihadiste', 'neutralisation',
+            'opération', 'combat', 'combattant', 'défense', 'sécuritaire',
+            'frontière', 'renseignement', 'délinquance', 'trafic', 'banditisme',
+            'enlèvement', 'otage', 'attentat', 'explosion', 'engin explosif'
+        ],
+        'Santé': [
+            'santé', 'hôpital', 'médecin', 'maladie', 'épidémie', 'vaccination',
+            'chu', 'csps', 'patient', 'traitement', 'médicament', 'covid',
+            'paludisme', 'soins', 'sanitaire', 'infirmier', 'clinique',
+            'oms', 'malnutrition', 'mortalité', 'planning familial', 'hygiène',
+            'assainissement', 'prévention', 'dépistage', 'consultation',
+            'pharmacie', 'urgence', 'chirurgie', 'maternité'
+        ],
+        'Culture': [
+            'culture', 'festival', 'artiste', 'musique', 'cinéma', 'théâtre',
+            'éducation', 'école', 'université', 'étudiant', 'livre', 'fespaco',
+            'siao', 'tradition', 'patrimoine', 'art', 'culturel', 'enseignant',
+            'alphabétisation', 'recherche', 'bibliothèque', 'musée', 'sculpture',
+            'danse', 'littérature', 'poésie', 'concert', 'exposition',
+            'coutume', 'folklore', 'griot', 'tam-tam', 'masque', 'cérémonies'
+        ],
+        'Sport': [
+            'sport', 'football', 'match', 'équipe', 'joueur', 'entraîneur',
+            'championnat', 'coupe', 'étalons', 'compétition', 'victoire',
+            'défaite', 'but', 'stade', 'can', 'qualification', 'sélection',
+            'athlétisme', 'basketball', 'handball', 'cyclisme', 'lutte',
+            'fédération', 'sportif', 'performance', 'médaille', 'podium',
+            'tournoi', 'finale', 'penalty', 'arbitre', 'supporters'
+        ]
+    }
+    
+    # Tous les mots-clés en une expression compilée une fois (mots entiers, pluriel en s/x)
+    _KEYWORD_PATTERN = _compile_keyword_pattern(FALLBACK_KEYWORDS)
+    
+    # Prompt de classification ({text}: titre et début du contenu)
+    CLASSIFICATION_PROMPT = """Tu es un expert en classification d'articles de presse burkinabè.
+
+Analyse cet article et détermine sa catégorie principale parmi :
+
+- Politique : gouvernement, ministre, président, assemblée nationale, conseil des ministres, transition, MPSR, capitaine Ibrahim Traoré, diplomatie, élections, parti politique, décret, loi, réforme institutionnelle, conseil constitutionnel, primature, députés, sénat, collectivités territoriales, décentralisation, autorités administratives
+
+- Économie : finance, budget, FCFA, commerce, entreprise, banque, agriculture, coton, or, mines, industrie, emploi, chômage, investissement, marché, production, exportation, importation, croissance économique, PIB, inflation, dette, BCEAO, bourse, entrepreneuriat, PME, secteur privé, développement économique
+
+- Sécurité : armée, FDS (Forces de Défense et Sécurité), VDP (Volontaires pour la Défense de la Patrie), police, gendarmerie, terrorisme, djihadistes, attaque, neutralisation, opération militaire, sécurité intérieure, justice, tribunal, procès, condamnation, criminalité, délinquance, trafic, frontières, renseignement
+
+- Santé : hôpital, CHU, CSPS, médecin, infirmier, maladie, épidémie, paludisme, COVID-19, vaccination, médicament, soins, santé publique, ministère de la santé, OMS, malnutrition, mortalité infantile, planning familial, hygiène, assainissement
+
+- Culture : FESPACO, SIAO, festival, artiste, musique, cinéma, théâtre, danse, littérature, livre, patrimoine, tradition, coutume, éducation, école, université, étudiant, enseignant, alphabétisation, recherche, bibliothèque, musée, arts plastiques, sculpture
+
+- Sport : football, Étalons (équipe nationale), CAN, championnat, match, victoire, défaite, joueur, entraîneur, stade, compétition, athlétisme, basketball, handball, cyclisme, lutte traditionnelle, sport scolaire, fédération sportive
+
+- Autres : si l'article ne correspond clairement à aucune catégorie ci-dessus, ou traite de sujets divers (faits divers généraux, météo, nécrologie, annonces, etc.)
+
+Article à analyser :
+---
+{text}
+---
+
+Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
+{{
+    "categorie": "nom_de_la_categorie",
+    "confiance": 0.95,
+    "mots_cles": ["mot1", "mot2", "mot3"],
+    "justification": "courte explication"
+}}"""
+    
+    # Version du prompt dans les clés du cache LLM: modifier le prompt invalide le cache
+    PROMPT_VERSION = prompt_version(CLASSIFICATION_PROMPT)
+    
+    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral",
+                 client: Optional[OllamaClient] = None, cache: Optional[LLMCache] = None,
+                 local_model: Optional[LocalClassifier] = None, local_threshold: float = 0.8,
+                 local_only: bool = False):
         """
         Initialise le classificateur
         
         Args:
             ollama_url: URL du serveur Ollama
             model: Nom du modèle (mistral par défaut)
+            client: Client Ollama (par défaut le client partagé du serveur)
+            cache: Cache des résultats LLM (None: chaque article est soumis au modèle)
+            local_model: Modèle local essayé avant le LLM (None: tout passe par le LLM)
+            local_threshold: Confiance minimale du modèle local; en dessous, l'article
+                est soumis au LLM (escalade)
+            local_only: Pas de LLM (Ollama indisponible): les articles sur lesquels le
+                modèle local n'est pas assez confiant restent non classifiés, pour être
+                soumis au LLM lors d'une prochaine classification
         """
         self.ollama_url = ollama_url
         self.model = model
         self.api_url = f"{ollama_url}/api/generate"
+        self.client = client or get_ollama_client(ollama_url)
+        self.cache = cache
+        self.local_model = local_model
+        self.local_threshold = local_threshold
+        self.local_only = local_only
+        self.local_stats = {'local': 0, 'escalades': 0}
+        self._stats_lock = threading.Lock()
+        self.batch_stats: Dict[str, float] = {}
     
     def check_ollama_status(self) -> bool:
         """
@@ -43,13 +198,9 @@ class ThemeClassifier:
         Returns:
             True si Ollama est accessible, False sinon
         """
-        try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        return self.client.is_available()
     
-    def classify_article(self, titre: str, contenu: str, max_tokens: int = 500) -> Dict[str, any]:
+    def classify_article(self, titre: str, contenu: str, max_tokens: int = 500) -> Optional[Dict[str, any]]:
         """
         Classifier un article dans une catégorie thématique
         
@@ -59,65 +210,55 @@ class ThemeClassifier:
             max_tokens: Nombre maximum de tokens à analyser
         
         Returns:
-            Dictionnaire avec catégorie, confiance, et mots-clés
+            Dictionnaire avec catégorie, confiance, et mots-clés, ou None si l'article
+            doit rester non classifié (local_only et modèle local pas assez confiant)
         """
+        # Modèle local d'abord: le LLM n'est appelé que si sa confiance est insuffisante
+        local_result = None
+        if self.local_model:
+            categorie, confiance = self.local_model.predict(titre, contenu)
+            confident = confiance >= self.local_threshold
+            with self._stats_lock:
+                self.local_stats['local' if confident else 'escalades'] += 1
+            local_result = {
+                'categorie': categorie if categorie in self.CATEGORIES else 'Autres',
+                'confiance': round(confiance, 3),
+                'mots_cles': [],
+                'justification': f"Modèle local (probabilité {confiance:.2f})",
+                'methode': 'local_model'
+            }
+            if confident:
+                return local_result
+        
+        # Sans LLM, un résultat par mots-clés serait enregistré comme définitif
+        if self.local_only:
+            return None
+        
         # Tronquer le contenu si trop long
         text_to_analyze = f"{titre}\n\n{contenu[:2000]}"
         
-        # Prompt pour Mistral
-        prompt = f"""Tu es un expert en classification d'articles de presse burkinabè.
-
-Analyse cet article et détermine sa catégorie principale parmi :
-
-- Politique : gouvernement, ministre, président, assemblée nationale, conseil des ministres, transition, MPSR, capitaine Ibrahim Traoré, diplomatie, élections, parti politique, décret, loi, réforme institutionnelle, conseil constitutionnel, primature, députés, sénat, collectivités territoriales, décentralisation, autorités administratives
-
-- Économie : finance, budget, FCFA, commerce, entreprise, banque, agriculture, coton, or, mines, industrie, emploi, chômage, investissement, marché, production, exportation, importation, croissance économique, PIB, inflation, dette, BCEAO, bourse, entrepreneuriat, PME, secteur privé, développement économique
-
-- Sécurité : armée, FDS (Forces de Défense et Sécurité), VDP (Volontaires pour la Défense de la Patrie), police, gendarmerie, terrorisme, djihadistes, attaque, neutralisation, opération militaire, sécurité intérieure, justice, tribunal, procès, condamnation, criminalité, délinquance, trafic, frontières, renseignement
-
-- Santé : hôpital, CHU, CSPS, médecin, infirmier, maladie, épidémie, paludisme, COVID-19, vaccination, médicament, soins, santé publique, ministère de la santé, OMS, malnutrition, mortalité infantile, planning familial, hygiène, assainissement
-
-- Culture : FESPACO, SIAO, festival, artiste, musique, cinéma, théâtre, danse, littérature, livre, patrimoine, tradition, coutume, éducation, école, université, étudiant, enseignant, alphabétisation, recherche, bibliothèque, musée, arts plastiques, sculpture
-
-- Sport : football, Étalons (équipe nationale), CAN, championnat, match, victoire, défaite, joueur, entraîneur, stade, compétition, athlétisme, basketball, handball, cyclisme, lutte traditionnelle, sport scolaire, fédération sportive
-
-- Autres : si l'article ne correspond clairement à aucune catégorie ci-dessus, ou traite de sujets divers (faits divers généraux, météo, nécrologie, annonces, etc.)
-
-Article à analyser :
----
-{text_to_analyze}
----
-
-Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
-{{
-    "categorie": "nom_de_la_categorie",
-    "confiance": 0.95,
-    "mots_cles": ["mot1", "mot2", "mot3"],
-    "justification": "courte explication"
-}}"""
-
+        prompt = self.CLASSIFICATION_PROMPT.format(text=text_to_analyze)
+        
+        # Résultat déjà obtenu pour ce texte, ce prompt et ce modèle: pas d'appel au LLM
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.key('classification', text_to_analyze, self.PROMPT_VERSION, self.model)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._build_classification(cached)
+        
         try:
-            # Appel à Ollama
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,  # Basse température pour plus de cohérence
-                        "num_predict": 200,
-                    }
+            # Appel à Ollama (client partagé: échec immédiat si le serveur est indisponible)
+            response_text = self.client.generate(
+                self.model,
+                prompt,
+                options={
+                    "temperature": 0.3,  # Basse température pour plus de cohérence
+                    "num_predict": 200,
                 },
                 timeout=30
             )
             
-            if response.status_code != 200:
-                return self._fallback_classification(titre, contenu)
-            
-            result = response.json()
-            response_text = result.get('response', '').strip()
-            
             # Parser la réponse JSON
             try:
                 # Extraire le JSON de la réponse
@@ -127,28 +268,62 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
                 if json_start >= 0 and json_end > json_start:
                     json_str = response_text[json_start:json_end]
                     classification = json.loads(json_str)
+                    result = self._build_classification(classification)
                     
-                    # Valider la catégorie
-                    categorie = classification.get('categorie', 'Autres')
-                    if categorie not in self.CATEGORIES:
-                        categorie = 'Autres'
-                    
-                    return {
-                        'categorie': categorie,
-                        'confiance': float(classification.get('confiance', 0.7)),
-                        'mots_cles': classification.get('mots_cles', [])[:5],
-                        'justification': classification.get('justification', ''),
-                        'methode': 'mistral_ollama'
-                    }
+                    if self.cache:
+                        self.cache.put(cache_key, 'classification', self.PROMPT_VERSION,
+                                       self.model, classification)
+                    return result
                 else:
-                    return self._fallback_classification(titre, contenu)
+                    return local_result or self._fallback_classification(titre, contenu)
             
             except json.JSONDecodeError:
-                return self._fallback_classification(titre, contenu)
+                return local_result or self._fallback_classification(titre, contenu)
+        
+        # Escalade impossible: la prédiction du modèle local vaut mieux que les mots-clés
+        except OllamaUnavailable:
+            return local_result or self._fallback_classification(titre, contenu)
         
         except Exception as e:
             print(f"⚠️ Erreur classification Mistral: {e}")
-            return self._fallback_classification(titre, contenu)
+            return local_result or self._fallback_classification(titre, contenu)
+    
+    def get_local_stats(self) -> Dict[str, any]:
+        """
+        Statistiques du modèle local depuis la création du classificateur
+        
+        Returns:
+            Dictionnaire: local (articles classés sans LLM), escalades (articles
+            soumis au LLM) et taux_escalade en %
+        """
+        with self._stats_lock:
+            stats = dict(self.local_stats)
+        total = stats['local'] + stats['escalades']
+        stats['taux_escalade'] = round(100 * stats['escalades'] / total, 1) if total else 0
+        return stats
+    
+    def _build_classification(self, classification: Dict[str, any]) -> Dict[str, any]:
+        """
+        Construire le résultat à partir du JSON retourné par Mistral (ou lu dans le cache)
+        
+        Args:
+            classification: JSON analysé (categorie, confiance, mots_cles, justification)
+        
+        Returns:
+            Dictionnaire avec catégorie validée, confiance, et mots-clés
+        """
+        # Valider la catégorie
+        categorie = classification.get('categorie', 'Autres')
+        if categorie not in self.CATEGORIES:
+            categorie = 'Autres'
+        
+        return {
+            'categorie': categorie,
+            'confiance': float(classification.get('confiance', 0.7)),
+            'mots_cles': classification.get('mots_cles', [])[:5],
+            'justification': classification.get('justification', ''),
+            'methode': 'mistral_ollama'
+        }
     
     def _fallback_classification(self, titre: str, contenu: str) -> Dict[str, any]:
         """
@@ -163,62 +338,14 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
         """
         text = f"{titre} {contenu}".lower()
         
-        # Mots-clés par catégorie (enrichis pour le contexte burkinabè)
-        keywords = {
-            'Politique': [
-                'gouvernement', 'ministre', 'président', 'assemblée', 'député', 'sénat',
-                'élection', 'vote', 'parti', 'politique', 'diplomatie', 'conseil',
-                'transition', 'mpsr', 'capitaine', 'traore', 'ibrahim', 'primature',
-                'décret', 'loi', 'réforme', 'constitutionnel', 'institutionnel',
-                'collectivité', 'décentralisation', 'préfet', 'gouverneur', 'maire',
-                'ambassadeur', 'sommet', 'cedeao', 'aes', 'souveraineté'
-            ],
-            'Économie': [
-                'économie', 'fcfa', 'budget', 'commerce', 'entreprise', 'banque',
-                'agriculture', 'industrie', 'emploi', 'investissement', 'marché',
-                'production', 'exportation', 'croissance', 'pib', 'inflation',
-                'coton', 'or', 'mine', 'minier', 'bceao', 'bourse', 'dette',
-                'entrepreneuriat', 'pme', 'secteur privé', 'développement',
-                'financier', 'fiscal', 'douane', 'import', 'export', 'chômage'
-            ],
-            'Sécurité': [
-                'sécurité', 'armée', 'militaire', 'police', 'terrorisme', 'attaque',
-                'fds', 'vdp', 'gendarmerie', 'criminalité', 'justice', 'tribunal',
-                'procès', 'condamnation', 'terroriste', 'djihadiste', 'neutralisation',
-                'opération', 'combat', 'combattant', 'défense', 'sécuritaire',
-                'frontière', 'renseignement', 'délinquance', 'trafic', 'banditisme',
-                'enlèvement', 'otage', 'attentat', 'explosion', 'engin explosif'
-            ],
-            'Santé': [
-                'santé', 'hôpital', 'médecin', 'maladie', 'épidémie', 'vaccination',
-                'chu', 'csps', 'patient', 'traitement', 'médicament', 'covid',
-                'paludisme', 'soins', 'sanitaire', 'infirmier', 'clinique',
-                'oms', 'malnutrition', 'mortalité', 'planning familial', 'hygiène',
-                'assainissement', 'prévention', 'dépistage', 'consultation',
-                'pharmacie', 'urgence', 'chirurgie', 'maternité'
-            ],
-            'Culture': [
-                'culture', 'festival', 'artiste', 'musique', 'cinéma', 'théâtre',
-                'éducation', 'école', 'université', 'étudiant', 'livre', 'fespaco',
-                'siao', 'tradition', 'patrimoine', 'art', 'culturel', 'enseignant',
-                'alphabétisation', 'recherche', 'bibliothèque', 'musée', 'sculpture',
-                'danse', 'littérature', 'poésie', 'concert', 'exposition',
-                'coutume', 'folklore', 'griot', 'tam-tam', 'masque', 'cérémonies'
-            ],
-            'Sport': [
-                'sport', 'football', 'match', 'équipe', 'joueur', 'entraîneur',
-                'championnat', 'coupe', 'étalons', 'compétition', 'victoire',
-                'défaite', 'but', 'stade', 'can', 'qualification', 'sélection',
-                'athlétisme', 'basketball', 'handball', 'cyclisme', 'lutte',
-                'fédération', 'sportif', 'performance', 'médaille', 'podium',
-                'tournoi', 'finale', 'penalty', 'arbitre', 'supporters'
-            ]
-        }
+        # Un seul parcours du texte: mots-clés distincts trouvés, en mots entiers
+        # Espaces fusionnés: 'engin' et 'explosif' sur deux lignes correspondent à 'engin explosif'
+        found = {' '.join(match.group(1).split()) for match in self._KEYWORD_PATTERN.finditer(text)}
         
-        # Compter les occurrences
+        # Nombre de mots-clés distincts par catégorie
         scores = {}
-        for categorie, mots in keywords.items():
-            score = sum(1 for mot in mots if mot in text)
+        for categorie, mots in self.FALLBACK_KEYWORDS.items():
+            score = sum(1 for mot in mots if mot in found)
             if score > 0:
                 scores[categorie] = score
         
@@ -226,11 +353,10 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
         if scores:
             categorie = max(scores, key=scores.get)
             max_score = scores[categorie]
-            total_keywords = sum(len(mots) for mots in keywords.values())
             confiance = min(0.9, max_score / 10)  # Confiance basée sur le nombre de mots-clés
             
-            # Extraire les mots-clés trouvés
-            mots_cles_trouves = [mot for mot in keywords[categorie] if mot in text][:5]
+            # Mots-clés trouvés, dans l'ordre de la liste
+            mots_cles_trouves = [mot for mot in self.FALLBACK_KEYWORDS[categorie] if mot in found][:5]
             
             return {
                 'categorie': categorie,
@@ -248,39 +374,84 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
             'methode': 'keywords_fallback'
         }
     
-    def classify_batch(self, articles: List[Dict[str, str]], show_progress: bool = True) -> List[Dict[str, any]]:
+    def classify_batch(self, articles: List[Dict[str, str]], show_progress: bool = True,
+                       max_workers: int = 1,
+                       on_result: Optional[Callable[[Dict[str, any]], None]] = None) -> List[Dict[str, any]]:
         """
-        Classifier un lot d'articles
+        Classifier un lot d'articles, plusieurs requêtes Ollama en parallèle
+        
+        Le parallélisme effectif est aussi borné par le client Ollama
+        (max_concurrency, réglable par OLLAMA_NUM_PARALLEL). Débit et latences
+        du lot (et, avec un modèle local, son taux d'escalade vers le LLM) sont
+        conservés dans self.batch_stats.
         
         Args:
             articles: Liste de dictionnaires avec 'titre' et 'contenu'
             show_progress: Afficher la progression
+            max_workers: Nombre d'articles classifiés simultanément
+            on_result: Callback appelé pour chaque classification, dans l'ordre des articles
+                (sauvegarde groupée au fil de l'eau)
         
         Returns:
-            Liste des classifications
+            Liste des classifications, dans l'ordre des articles (sans les articles
+            laissés non classifiés, voir local_only)
         """
         results = []
         total = len(articles)
+        latencies = []
         
         if show_progress:
-            print(f"🤖 Classification de {total} articles...")
+            print(f"🤖 Classification de {total} articles ({max_workers} en parallèle)...")
         
-        for i, article in enumerate(articles, 1):
-            if show_progress and i % 10 == 0:
-                print(f"   Progression: {i}/{total} articles")
-            
+        def classify(article: Dict[str, str]) -> Optional[Dict[str, any]]:
+            start = time.perf_counter()
             classification = self.classify_article(
-                article.get('titre', ''),
-                article.get('contenu', '')
+                article.get('titre') or '',
+                article.get('contenu') or ''
+            )
+            latencies.append(time.perf_counter() - start)
+            if classification is None:
+                return None
+            return {'article_id': article.get('id'), **classification}
+        
+        local_before = self.get_local_stats()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total or 1))) as executor:
+            # map() rend les résultats dans l'ordre des articles, au fur et à mesure
+            for i, result in enumerate(executor.map(classify, articles), 1):
+                if result is not None:
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+                if show_progress and i % 10 == 0:
+                    print(f"   Progression: {i}/{total} articles")
+        duration = time.perf_counter() - started
+        
+        latencies.sort()
+        self.batch_stats = {
+            'articles': total,
+            'duree': round(duration, 2),
+            'debit': round(total / duration, 2) if duration > 0 else 0,
+            'latence_p50': round(_percentile(latencies, 0.50), 3),
+            'latence_p95': round(_percentile(latencies, 0.95), 3),
+        }
+        if self.local_model:
+            # Part du lot soumise au LLM faute de confiance suffisante du modèle local
+            local_after = self.get_local_stats()
+            local = local_after['local'] - local_before['local']
+            escalades = local_after['escalades'] - local_before['escalades']
+            self.batch_stats['local'] = local
+            self.batch_stats['taux_escalade'] = (
+                round(100 * escalades / (local + escalades), 1) if local + escalades else 0
             )
-            
-            results.append({
-                'article_id': article.get('id'),
-                **classification
-            })
         
         if show_progress:
-            print(f"✅ Classification terminée")
+            print(f"✅ Classification terminée: {self.batch_stats['debit']} articles/s, "
+                  f"latence p50 {self.batch_stats['latence_p50']}s, "
+                  f"p95 {self.batch_stats['latence_p95']}s")
+            if self.local_model:
+                print(f"🧠 Modèle local: {self.batch_stats['local']} articles sans LLM, "
+                      f"escalade {self.batch_stats['taux_escalade']}%")
         
         return results
     
@@ -318,3 +489,10 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
             'confiance_moyenne': round(avg_confidence, 2),
             'methodes': methodes
         }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Percentile (plus proche rang) d'une liste triée, 0 si vide"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
@@ -5,9 +5,11 @@ URLs pour l'API REST
 from django.urls import path
 from .views import (
     # Médias
-    MediaListView, MediaDetailView,
+    MediaListView, MediaDetailView, MediaExtractionProfileView,
     # Articles
     ArticleListView,
+    # Recherche
+    SearchView,
     # Classifications
     ClassificationListView, CategoryStatsView, WeeklyCategoryStatsView,
     # Facebook
@@ -34,10 +36,15 @@ urlpatterns = [
     # Médias
     path('medias/', MediaListView.as_view(), name='media-list'),
     path('medias/<int:media_id>/', MediaDetailView.as_view(), name='media-detail'),
+    path('medias/<int:media_id>/extraction-profile/', MediaExtractionProfileView.as_view(),
+         name='media-extraction-profile'),
     
     # Articles
     path('articles/', ArticleListView.as_view(), name='article-list'),
     
+    # Recherche
+    path('search/', SearchView.as_view(), name='search'),
+    
     # Classifications
     path('classifications/', ClassificationListView.as_view(), name='classification-list'),
     path('classifications/stats/', CategoryStatsView.as_view(), name='category-stats'),
@@ -10,6 +10,7 @@ from django.http import JsonResponse
 
 import sys
 import os
+from urllib.parse import urlparse
 
 # Ajouter le chemin parent pour importer les modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -29,6 +30,14 @@ from .serializers import (
 db = DatabaseManager()
 analyzer = AudienceAnalyzer(db)
 
+# Taille maximale d'une page de liste (articles, posts, tweets, historique)
+MAX_PAGE_SIZE = 200
+
+
+def page_limit(request, default: int) -> int:
+    """Paramètre limit de la requête, borné entre 1 et MAX_PAGE_SIZE"""
+    return max(1, min(int(request.GET.get('limit', default)), MAX_PAGE_SIZE))
+
 
 # ==================== MÉDIAS ====================
 
@@ -147,43 +156,7 @@ class MediaDetailView(APIView):
         
         try:
             # Mettre à jour le média
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            update_fields = []
-            params = []
-            
-            if 'nom' in serializer.validated_data:
-                update_fields.append('nom = ?')
-                params.append(serializer.validated_data['nom'])
-            
-            if 'url' in serializer.validated_data:
-                update_fields.append('url = ?')
-                params.append(serializer.validated_data['url'])
-            
-            if 'type_site' in serializer.validated_data:
-                update_fields.append('type_site = ?')
-                params.append(serializer.validated_data['type_site'])
-            
-            if 'facebook_page' in serializer.validated_data:
-                update_fields.append('facebook_page = ?')
-                params.append(serializer.validated_data['facebook_page'])
-            
-            if 'twitter_account' in serializer.validated_data:
-                update_fields.append('twitter_account = ?')
-                params.append(serializer.validated_data['twitter_account'])
-            
-            if 'actif' in serializer.validated_data:
-                update_fields.append('actif = ?')
-                params.append(serializer.validated_data['actif'])
-            
-            if update_fields:
-                params.append(media_id)
-                query = f"UPDATE medias SET {', '.join(update_fields)} WHERE id = ?"
-                cursor.execute(query, params)
-                conn.commit()
-            
-            conn.close()
+            db.update_media(media_id, **serializer.validated_data)
             
             # Récupérer le média mis à jour
             medias = db.get_all_medias(actif_only=False)
@@ -222,11 +195,7 @@ class MediaDetailView(APIView):
             )
         
         try:
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM medias WHERE id = ?', (media_id,))
-            conn.commit()
-            conn.close()
+            db.delete_media(media_id)
             
             return Response(
                 {'message': 'Média supprimé avec succès'},
@@ -240,18 +209,56 @@ class MediaDetailView(APIView):
             )
 
 
+class MediaExtractionProfileView(APIView):
+    """Règles d'extraction apprises pour le domaine d'un média"""
+    
+    def get(self, request, media_id):
+        """GET /api/medias/{id}/extraction-profile/"""
+        medias = db.get_all_medias(actif_only=False)
+        media = next((m for m in medias if m.id == media_id), None)
+        
+        if not media:
+            return Response(
+                {'error': 'Média non trouvé'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        domain = urlparse(media.url).netloc.replace('www.', '')
+        
+        return Response({
+            'media_id': media.id,
+            'domain': domain,
+            'preferred': db.get_extraction_profile(domain),
+            'rules': db.get_extraction_stats(domain)
+        })
+
+
 # ==================== ARTICLES ====================
 
 class ArticleListView(APIView):
     """Liste des articles"""
     
     def get(self, request):
-        """GET /api/articles/?media_id=X&limit=100"""
+        """
+        GET /api/articles/?media_id=X&limit=100
+        GET /api/articles/?cursor=&media_id=X&days=30&limit=100 - Pagination par curseur: {results, next}
+        """
         media_id = request.GET.get('media_id')
-        limit = int(request.GET.get('limit', 100))
+        limit = page_limit(request, 100)
         days = int(request.GET.get('days', 7))
         
-        if media_id:
+        if 'cursor' in request.GET:
+            try:
+                page = db.get_articles_page(
+                    media_id=int(media_id) if media_id else None,
+                    days=int(request.GET['days']) if request.GET.get('days') else None,
+                    limit=limit,
+                    cursor=request.GET['cursor']
+                )
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            articles = page['results']
+        elif media_id:
             articles = db.get_articles_by_media(int(media_id), limit=limit)
         else:
             articles = db.get_recent_articles(days=days, limit=limit)
@@ -275,9 +282,54 @@ class ArticleListView(APIView):
             'created_at': a.created_at
         } for a in articles], many=True)
         
+        if 'cursor' in request.GET:
+            return Response({'results': serializer.data, 'next': page['next']})
         return Response(serializer.data)
 
 
+# ==================== RECHERCHE ====================
+
+class SearchView(APIView):
+    """Recherche plein texte dans les articles, posts Facebook et tweets"""
+    
+    def get(self, request):
+        """
+        GET /api/search/?q=sécurité&types=article,tweet&media_id=X&categorie=Politique
+            &date_from=2025-01-01&date_to=2025-01-31&limit=20&cursor=...
+        """
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': "Le paramètre 'q' est requis"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        types = [t.strip() for t in request.GET.get('types', '').split(',') if t.strip()]
+        
+        try:
+            media_id = request.GET.get('media_id')
+            limit = max(1, min(int(request.GET.get('limit', 20)), 100))
+            
+            results = db.search(
+                query,
+                types=types or None,
+                media_id=int(media_id) if media_id else None,
+                categorie=request.GET.get('categorie'),
+                date_from=request.GET.get('date_from'),
+                date_to=request.GET.get('date_to'),
+                limit=limit,
+                cursor=request.GET.get('cursor')
+            )
+        
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(results)
+
+
 # ==================== CLASSIFICATIONS ====================
 
 class ClassificationListView(APIView):
@@ -329,9 +381,25 @@ class FacebookPostListView(APIView):
     """Liste des posts Facebook"""
     
     def get(self, request):
-        """GET /api/facebook/posts/?media_id=X&limit=100"""
+        """
+        GET /api/facebook/posts/?media_id=X&limit=100
+        GET /api/facebook/posts/?cursor=&media_id=X&limit=100 - Pagination par curseur: {results, next}
+        """
         media_id = request.GET.get('media_id')
-        limit = int(request.GET.get('limit', 100))
+        limit = page_limit(request, 100)
+        
+        if 'cursor' in request.GET:
+            try:
+                page = db.get_facebook_posts_page(
+                    media_id=int(media_id) if media_id else None,
+                    days=int(request.GET['days']) if request.GET.get('days') else None,
+                    limit=limit,
+                    cursor=request.GET['cursor']
+                )
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = FacebookPostSerializer(page['results'], many=True)
+            return Response({'results': serializer.data, 'next': page['next']})
         
         if not media_id:
             return Response(
@@ -350,9 +418,25 @@ class TwitterTweetListView(APIView):
     """Liste des tweets"""
     
     def get(self, request):
-        """GET /api/twitter/tweets/?media_id=X&limit=100"""
+        """
+        GET /api/twitter/tweets/?media_id=X&limit=100
+        GET /api/twitter/tweets/?cursor=&media_id=X&limit=100 - Pagination par curseur: {results, next}
+        """
         media_id = request.GET.get('media_id')
-        limit = int(request.GET.get('limit', 100))
+        limit = page_limit(request, 100)
+        
+        if 'cursor' in request.GET:
+            try:
+                page = db.get_twitter_tweets_page(
+                    media_id=int(media_id) if media_id else None,
+                    days=int(request.GET['days']) if request.GET.get('days') else None,
+                    limit=limit,
+                    cursor=request.GET['cursor']
+                )
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = TwitterTweetSerializer(page['results'], many=True)
+            return Response({'results': serializer.data, 'next': page['next']})
         
         if not media_id:
             return Response(
@@ -406,7 +490,7 @@ class AudienceGlobalView(APIView):
     def get(self, request):
         """GET /api/audience/global/?days=30"""
         days = int(request.GET.get('days', 30))
-        data = analyzer.analyze_global_audience(days=days)
+        data = analyzer.get_global_audience(days=days)
         serializer = AudienceGlobalSerializer(data, many=True)
         return Response(serializer.data)
 
@@ -429,7 +513,10 @@ class MediaRankingView(APIView):
     def get(self, request):
         """GET /api/ranking/?days=30"""
         days = int(request.GET.get('days', 30))
-        data = db.get_media_ranking_with_twitter(days=days)
+        # Dernier instantané matérialisé en fin de scraping, sinon calcul direct
+        data = db.get_latest_media_metrics(days)
+        if data is None:
+            data = db.get_media_ranking_with_twitter(days=days)
         serializer = MediaRankingSerializer(data, many=True)
         return Response(serializer.data)
 
@@ -616,11 +703,15 @@ class ScrapingHistoryView(APIView):
     """Historique des tâches de scraping"""
     
     def get(self, request):
-        """GET /api/scraping/history/?limit=10&offset=0"""
-        limit = int(request.GET.get('limit', 10))
-        offset = int(request.GET.get('offset', 0))
+        """GET /api/scraping/history/?limit=10&offset=0 ou ?limit=10&cursor=..."""
+        limit = page_limit(request, 10)
+        offset = max(0, int(request.GET.get('offset', 0)))
         
-        history = db.get_scraping_tasks(limit=limit, offset=offset)
+        try:
+            history = db.get_scraping_tasks(limit=limit, offset=offset,
+                                            cursor=request.GET.get('cursor'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(history)
 
 
@@ -641,7 +732,9 @@ def stats_overview(request):
     category_stats = db.get_category_stats(days=days)
     
     # Classement
-    ranking = db.get_media_ranking_with_twitter(days=days)
+    ranking = db.get_latest_media_metrics(days)
+    if ranking is None:
+        ranking = db.get_media_ranking_with_twitter(days=days)
     
     stats = {
         'total_medias': len(medias),
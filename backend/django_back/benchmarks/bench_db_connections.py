@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latence des requêtes API selon la gestion des connexions SQLite
+
+Compare l'ancienne stratégie (un sqlite3.connect par appel, sans PRAGMA)
+au pool de connexions configurées une fois (database/connection_pool.py),
+sur des requêtes équivalentes à celles des vues de l'API.
+
+Usage:
+    python benchmarks/bench_db_connections.py
+    python benchmarks/bench_db_connections.py --articles 20000 --requests 500 --threads 4
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.db_manager import DatabaseManager
+from database.models import Article
+
+
+class LegacyDatabaseManager(DatabaseManager):
+    """Ancienne stratégie: une nouvelle connexion par appel"""
+
+    def get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def seed(db_path: str, medias: int, articles: int):
+    """Créer une base de test: médias, articles et classifications"""
+    db = DatabaseManager(db_path)
+    media_ids = [db.add_media(f"Média {i}", f"https://media{i}.example", 'rss') for i in range(medias)]
+
+    batch = []
+    for i in range(articles):
+        batch.append(Article(
+            media_id=random.choice(media_ids),
+            titre=f"Article de test numéro {i}",
+            contenu="Le gouvernement a annoncé de nouvelles mesures. " * 20,
+            url=f"https://media.example/article-{i}/",
+            source_type='rss_feed'
+        ))
+        if len(batch) == 500:
+            db.add_articles_bulk(batch)
+            batch = []
+    db.add_articles_bulk(batch)
+
+    conn = db.get_connection()
+    try:
+        conn.execute("""
+            INSERT INTO classifications (article_id, categorie, confiance, methode)
+            SELECT id, 'Politique', 0.9, 'mistral_ollama' FROM articles
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    db.close()
+
+
+def scenarios(db: DatabaseManager, max_article_id: int):
+    """Requêtes représentatives des vues de l'API"""
+    def media_detail():
+        medias = db.get_all_medias(actif_only=False)
+        return next((m for m in medias if m.id == 1), None)
+
+    def article_detail():
+        article_id = random.randint(1, max_article_id)
+        return db.get_article(article_id), db.get_classification(article_id)
+
+    def crawl_state():
+        return db.get_crawl_state(1), db.get_extraction_profile('media1.example')
+
+    def stats_overview():
+        return (db.get_all_medias(), db.get_recent_articles(days=30, limit=10000),
+                db.get_category_stats(days=30), db.get_media_ranking_with_twitter(days=30))
+
+    return {'media_detail': media_detail, 'article_detail': article_detail,
+            'crawl_state': crawl_state, 'stats_overview': stats_overview}
+
+
+def measure(func, requests: int, threads: int) -> list:
+    """Latences (ms) de N requêtes réparties sur plusieurs threads"""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(count):
+        local = []
+        for _ in range(count):
+            start = time.perf_counter()
+            func()
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(requests // threads,)) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark des connexions SQLite')
+    parser.add_argument('--medias', type=int, default=30, help='Nombre de médias')
+    parser.add_argument('--articles', type=int, default=5000, help="Nombre d'articles")
+    parser.add_argument('--requests', type=int, default=300, help='Requêtes par scénario')
+    parser.add_argument('--threads', type=int, default=1, help='Threads simultanés')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        print(f"🔧 Base de test: {args.medias} médias, {args.articles} articles")
+        seed(db_path, args.medias, args.articles)
+
+        managers = {
+            'connexion par appel': LegacyDatabaseManager(db_path, pool_size=0),
+            'pool + PRAGMA': DatabaseManager(db_path),
+        }
+
+        print(f"\n⏱️ Latence par requête ({args.requests} requêtes, {args.threads} thread(s)):")
+        print(f"   {'scénario':<16} {'stratégie':<22} {'p50 ms':>8} {'p95 ms':>8}")
+
+        for name in scenarios(managers['pool + PRAGMA'], args.articles):
+            p50s = {}
+            for label, db in managers.items():
+                func = scenarios(db, args.articles)[name]
+                func()  # Préchauffage
+                latencies = sorted(measure(func, args.requests, args.threads))
+                p50s[label] = statistics.median(latencies)
+                p95 = latencies[int(len(latencies) * 0.95) - 1]
+                print(f"   {name:<16} {label:<22} {p50s[label]:8.3f} {p95:8.3f}")
+            print(f"   {'':<16} {'gain':<22} x{p50s['connexion par appel'] / p50s['pool + PRAGMA']:.1f}")
+
+        for db in managers.values():
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
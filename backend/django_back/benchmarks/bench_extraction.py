@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de l'extraction d'articles sur des pages sauvegardées
+
+Compare l'extraction historique (BeautifulSoup + une cascade de select_one
+par champ) au moteur en un seul parcours lxml (scrapers/extraction.py),
+et vérifie que les deux produisent les mêmes champs.
+
+Pages: fichiers .html d'un dossier (--pages-dir) ou pages HTML du cache
+HTTP (--cache-dir, voir run_scraper.py --http-cache).
+
+Usage:
+    python benchmarks/bench_extraction.py --cache-dir data/http_cache
+    python benchmarks/bench_extraction.py --pages-dir pages/ --repeat 5
+"""
+
+import argparse
+import gzip
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from dateutil import parser as date_parser
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers import extraction
+from scrapers.extraction import ArticleExtractor
+
+
+def load_pages(pages_dir: str = None, cache_dir: str = None, limit: int = 1000) -> List[Tuple[str, str]]:
+    """Charger des pages (url, html) depuis un dossier ou le cache HTTP"""
+    pages = []
+
+    if pages_dir:
+        for path in sorted(Path(pages_dir).glob('*.html'))[:limit]:
+            pages.append((f"https://example.com/{path.stem}/", path.read_text(encoding='utf-8', errors='replace')))
+
+    if cache_dir and (Path(cache_dir) / 'index.db').exists():
+        conn = sqlite3.connect(str(Path(cache_dir) / 'index.db'))
+        rows = conn.execute("""
+            SELECT url, content_hash FROM responses
+            WHERE headers LIKE '%text/html%' LIMIT ?
+        """, (limit,)).fetchall()
+        conn.close()
+        for url, content_hash in rows:
+            blob = Path(cache_dir) / 'blobs' / content_hash[:2] / f"{content_hash}.gz"
+            with gzip.open(blob, 'rb') as f:
+                pages.append((url, f.read().decode('utf-8', errors='replace')))
+
+    return pages
+
+
+def legacy_extract(html: str, url: str, base_url: str) -> dict:
+    """Extraction historique: un arbre BeautifulSoup, une cascade select_one par champ"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    titre = None
+    for selector in extraction.TITLE_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem:
+            text = elem.get_text(strip=True)
+            if text and len(text) > 10:
+                titre = text
+                break
+    if not titre:
+        meta_title = soup.find('meta', property='og:title')
+        if meta_title and meta_title.get('content'):
+            titre = meta_title['content']
+        elif soup.find('title'):
+            titre = soup.find('title').get_text(strip=True).split('|')[0].split('-')[0].strip()
+
+    date_pub = None
+    for selector in extraction.DATE_META_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem and elem.get('content'):
+            try:
+                date_pub = date_parser.parse(elem['content'])
+                break
+            except (ValueError, OverflowError):
+                pass
+    if not date_pub:
+        time_elem = soup.find('time', datetime=True)
+        if time_elem:
+            try:
+                date_pub = date_parser.parse(time_elem['datetime'])
+            except (ValueError, OverflowError):
+                pass
+    if not date_pub:
+        for selector in extraction.DATE_SELECTORS:
+            elem = soup.select_one(selector)
+            if elem:
+                date_pub = extraction.parse_french_date(elem.get_text(strip=True))
+                if date_pub:
+                    break
+    if not date_pub:
+        date_pub = extraction.extract_date_from_url(url)
+
+    contenu = ""
+    for selector in extraction.CONTENT_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem:
+            for tag in elem.find_all(list(extraction.EXCLUDED_TAGS)):
+                tag.decompose()
+            text = elem.get_text(separator='\n', strip=True)
+            if text and len(text) > 100:
+                contenu = text[:5000]
+                break
+
+    auteur = None
+    meta_author = soup.find('meta', attrs={'name': 'author'})
+    if meta_author and meta_author.get('content'):
+        auteur = meta_author['content']
+    else:
+        for selector in extraction.AUTHOR_SELECTORS:
+            elem = soup.select_one(selector)
+            if elem:
+                text = elem.get_text(strip=True)
+                if text and len(text) < 100:
+                    auteur = text
+                    break
+
+    image_url = None
+    og_image = soup.find('meta', property='og:image')
+    if og_image and og_image.get('content'):
+        image_url = og_image['content']
+    else:
+        for selector in extraction.IMAGE_SELECTORS:
+            img = soup.select_one(selector)
+            if img and img.get('src'):
+                image_url = urljoin(base_url, img['src'])
+                break
+
+    return {'titre': titre, 'date_publication': date_pub, 'contenu': contenu,
+            'auteur': auteur, 'image_url': image_url}
+
+
+def bench(name: str, func, pages, repeat: int) -> float:
+    """Mesurer le temps CPU moyen par page"""
+    start = time.process_time()
+    for _ in range(repeat):
+        for url, html in pages:
+            func(html, url)
+    per_page = (time.process_time() - start) / (repeat * len(pages)) * 1000
+    print(f"   {name:<28} {per_page:8.2f} ms CPU/page")
+    return per_page
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de l'extraction d'articles")
+    parser.add_argument('--pages-dir', type=str, help='Dossier de pages .html sauvegardées')
+    parser.add_argument('--cache-dir', type=str, default='data/http_cache',
+                        help='Cache HTTP à utiliser (défaut: data/http_cache)')
+    parser.add_argument('--limit', type=int, default=500, help='Nombre maximum de pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Nombre de passes')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.cache_dir, args.limit)
+    if not pages:
+        print("❌ Aucune page trouvée (utiliser --pages-dir ou scraper avec --http-cache)")
+        return
+
+    print(f"📄 {len(pages)} pages, {args.repeat} passes\n")
+
+    extractor = ArticleExtractor('https://example.com')
+
+    # Vérifier l'équivalence des champs
+    differences = 0
+    for url, html in pages:
+        old = legacy_extract(html, url, 'https://example.com')
+        new = extractor.extract(html, url)
+        fields = [field for field in old if old[field] != new[field]]
+        if fields:
+            differences += 1
+            if differences <= 5:
+                print(f"   ⚠️ {url}: champs différents {fields}")
+    print(f"✅ {len(pages) - differences}/{len(pages)} pages identiques\n")
+
+    print("⏱️ Temps CPU:")
+    legacy = bench('BeautifulSoup + cascades', lambda html, url: legacy_extract(html, url, 'https://example.com'),
+                   pages, args.repeat)
+    single = bench('lxml un seul parcours', extractor.extract, pages, args.repeat)
+    print(f"\n🚀 Gain: x{legacy / single:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la classification de secours par mots-clés (Ollama indisponible)
+
+Compare l'ancienne implémentation (dictionnaire reconstruit à chaque appel,
+un test de sous-chaîne par mot-clé, répété pour les mots-clés trouvés) à
+l'expression compilée une fois au chargement de ThemeClassifier, sur des
+articles synthétiques.
+
+Usage:
+    python benchmarks/bench_fallback_classifier.py
+    python benchmarks/bench_fallback_classifier.py --articles 10000 --words 600
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis.theme_classifier import ThemeClassifier
+
+# Mots courants contenant des mots-clés courts ('or', 'but', 'can', 'art', 'loi', 'aes')
+FILLER = [
+    'le', 'la', 'les', 'des', 'une', 'dans', 'pour', 'avec', 'sur', 'par', 'selon',
+    'ordre', 'alors', 'encore', 'dehors', 'debut', 'attribut', 'candidat', 'vacances',
+    'partie', 'quartier', 'départ', 'emploie', 'exploitation', 'collaboration', 'aussi',
+    'région', 'habitants', 'journée', 'rencontre', 'population', 'semaine', 'ville',
+    'ouagadougou', 'bobo-dioulasso', 'koudougou', 'province', 'village', 'responsables',
+]
+
+
+class LegacyThemeClassifier(ThemeClassifier):
+    """Ancienne implémentation de _fallback_classification"""
+
+    def _fallback_classification(self, titre: str, contenu: str):
+        text = f"{titre} {contenu}".lower()
+
+        # Dictionnaire reconstruit à chaque appel
+        keywords = {categorie: list(mots) for categorie, mots in self.FALLBACK_KEYWORDS.items()}
+
+        scores = {}
+        for categorie, mots in keywords.items():
+            score = sum(1 for mot in mots if mot in text)
+            if score > 0:
+                scores[categorie] = score
+
+        if scores:
+            categorie = max(scores, key=scores.get)
+            max_score = scores[categorie]
+            confiance = min(0.9, max_score / 10)
+            mots_cles_trouves = [mot for mot in keywords[categorie] if mot in text][:5]
+
+            return {
+                'categorie': categorie,
+                'confiance': confiance,
+                'mots_cles': mots_cles_trouves,
+                'justification': f"{max_score} mots-clés trouvés",
+                'methode': 'keywords_fallback'
+            }
+
+        return {
+            'categorie': 'Autres',
+            'confiance': 0.5,
+            'mots_cles': [],
+            'justification': 'Aucun mot-clé spécifique trouvé',
+            'methode': 'keywords_fallback'
+        }
+
+
+def make_articles(count: int, words: int, seed: int = 42) -> list:
+    """Articles synthétiques: une catégorie dominante, quelques mots-clés d'autres catégories"""
+    rng = random.Random(seed)
+    categories = list(ThemeClassifier.FALLBACK_KEYWORDS)
+    articles = []
+
+    for _ in range(count):
+        main = ThemeClassifier.FALLBACK_KEYWORDS[rng.choice(categories)]
+        others = ThemeClassifier.FALLBACK_KEYWORDS[rng.choice(categories)]
+        body = []
+        for _ in range(words):
+            roll = rng.random()
+            if roll < 0.04:
+                body.append(rng.choice(main))
+            elif roll < 0.05:
+                body.append(rng.choice(others))
+            else:
+                body.append(rng.choice(FILLER))
+        articles.append((' '.join(body[:8]).capitalize(), ' '.join(body)))
+
+    return articles
+
+
+def measure(classifier: ThemeClassifier, articles: list):
+    """Durée totale (s) et résultats de la classification de secours"""
+    start = time.perf_counter()
+    results = [classifier._fallback_classification(titre, contenu) for titre, contenu in articles]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la classification par mots-clés')
+    parser.add_argument('--articles', type=int, default=10000, help="Nombre d'articles")
+    parser.add_argument('--words', type=int, default=400, help='Mots par article')
+    args = parser.parse_args()
+
+    print(f"🔧 {args.articles} articles synthétiques de {args.words} mots")
+    articles = make_articles(args.articles, args.words)
+
+    classifiers = {
+        'sous-chaînes': LegacyThemeClassifier(),
+        'regex compilée': ThemeClassifier(),
+    }
+
+    print("\n⏱️ Classification de secours:")
+    print(f"   {'implémentation':<16} {'total s':>8} {'articles/s':>11} {'µs/article':>11}")
+
+    durations, results = {}, {}
+    for label, classifier in classifiers.items():
+        measure(classifier, articles[:100])  # Préchauffage
+        durations[label], results[label] = measure(classifier, articles)
+        per_article = durations[label] / len(articles) * 1e6
+        print(f"   {label:<16} {durations[label]:8.3f} {len(articles) / durations[label]:11.0f} "
+              f"{per_article:11.1f}")
+
+    print(f"   {'gain':<16} x{durations['sous-chaînes'] / durations['regex compilée']:.1f}")
+
+    # Écarts dus aux correspondances à l'intérieur des mots ('or' dans 'ordre')
+    legacy, compiled = results['sous-chaînes'], results['regex compilée']
+    differ = sum(1 for a, b in zip(legacy, compiled) if a['categorie'] != b['categorie'])
+    false_hits = sum(len(a['mots_cles']) - len(set(a['mots_cles']) & set(b['mots_cles']))
+                     for a, b in zip(legacy, compiled) if a['categorie'] == b['categorie'])
+    print(f"\n🔎 Catégorie différente: {differ} articles ({differ / len(articles) * 100:.1f}%)")
+    print(f"   Mots-clés trouvés à l'intérieur d'autres mots (ancienne version): {false_hits}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,8 @@ Utilise Mistral via Ollama pour la classification thématique
 
 import argparse
 from database.db_manager import DatabaseManager
+from analysis.llm_cache import LLMCache
+from analysis.local_classifier import load_local_classifier
 from analysis.theme_classifier import ThemeClassifier
 
 
@@ -17,6 +19,14 @@ def main():
                        help='Reclassifier tous les articles (même déjà classifiés)')
     parser.add_argument('--stats', action='store_true',
                        help='Afficher uniquement les statistiques')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Articles classifiés en parallèle (défaut: OLLAMA_NUM_PARALLEL ou 2)')
+    parser.add_argument('--batch-size', type=int, default=50,
+                       help='Classifications enregistrées par transaction')
+    parser.add_argument('--local-threshold', type=float, default=0.8,
+                       help='Confiance minimale du modèle local avant escalade vers Mistral')
+    parser.add_argument('--no-local-model', action='store_true',
+                       help='Ignorer le modèle local (tous les articles passent par Mistral)')
     
     args = parser.parse_args()
     
@@ -50,16 +60,23 @@ def main():
     
     # Initialiser le classificateur
     print("🤖 Initialisation du classificateur Mistral...")
-    classifier = ThemeClassifier()
+    local_model = None if args.no_local_model else load_local_classifier()
+    classifier = ThemeClassifier(cache=LLMCache(db), local_model=local_model,
+                                 local_threshold=args.local_threshold)
     
     # Vérifier Ollama
     if not classifier.check_ollama_status():
         print("❌ Ollama n'est pas accessible!")
         print("💡 Assurez-vous qu'Ollama est démarré: ollama serve")
         print("💡 Et que Mistral est installé: ollama pull mistral")
-        return
-    
-    print("✅ Ollama accessible\n")
+        if not local_model:
+            return
+        # Les articles incertains restent non classifiés: Mistral les classera à la prochaine exécution
+        classifier.local_only = True
+        print(f"⚠️ Modèle local seul: les articles sous le seuil ({args.local_threshold}) "
+              f"restent à classifier par Mistral\n")
+    else:
+        print("✅ Ollama accessible\n")
     
     # Récupérer les articles à classifier
     if args.force:
@@ -81,40 +98,42 @@ def main():
     print("🚀 CLASSIFICATION EN COURS")
     print("="*60 + "\n")
     
+    workers = args.workers or classifier.client.max_concurrency
+    if workers > classifier.client.max_concurrency:
+        print(f"⚠️ {workers} workers mais {classifier.client.max_concurrency} requêtes Ollama simultanées "
+              f"au plus (augmenter OLLAMA_NUM_PARALLEL)\n")
+    
+    pending = []
     classified_count = 0
     errors = 0
+    titles = {article['id']: article['titre'] for article in articles}
     
-    for i, article in enumerate(articles, 1):
+    def flush():
+        """Enregistrer les classifications en attente en une transaction"""
+        nonlocal classified_count, errors
         try:
-            print(f"[{i}/{len(articles)}] {article['titre'][:60]}...")
-            
-            # Classifier
-            result = classifier.classify_article(
-                article['titre'],
-                article['contenu'] or ''
-            )
-            
-            # Sauvegarder
-            db.add_classification(
-                article_id=article['id'],
-                categorie=result['categorie'],
-                confiance=result['confiance'],
-                mots_cles=result.get('mots_cles', []),
-                justification=result.get('justification', ''),
-                methode=result.get('methode', 'mistral_ollama')
-            )
-            
-            print(f"   ✅ {result['categorie']} (confiance: {result['confiance']:.2f})")
-            if result.get('mots_cles'):
-                print(f"   🔑 Mots-clés: {', '.join(result['mots_cles'][:3])}")
-            
-            classified_count += 1
-        
+            classified_count += db.add_classifications_bulk(pending)
         except Exception as e:
-            print(f"   ❌ Erreur: {e}")
-            errors += 1
-        
+            print(f"   ❌ Erreur d'enregistrement ({len(pending)} classifications): {e}")
+            errors += len(pending)
+        pending.clear()
+    
+    def on_result(result):
+        """Afficher une classification (dans l'ordre des articles) et l'enregistrer par lots"""
+        i = len(pending) + classified_count + errors + 1
+        print(f"[{i}/{len(articles)}] {(titles.get(result['article_id']) or '')[:60]}...")
+        print(f"   ✅ {result['categorie']} (confiance: {result['confiance']:.2f})")
+        if result.get('mots_cles'):
+            print(f"   🔑 Mots-clés: {', '.join(result['mots_cles'][:3])}")
         print()
+        
+        pending.append(result)
+        if len(pending) >= args.batch_size:
+            flush()
+    
+    classifier.classify_batch(articles, show_progress=False, max_workers=workers, on_result=on_result)
+    flush()
+    batch_stats = classifier.batch_stats
     
     # Résumé
     print("="*60)
@@ -122,8 +141,18 @@ def main():
     print("="*60 + "\n")
     
     print(f"✅ Articles classifiés: {classified_count}")
+    left = len(articles) - classified_count - errors
+    if left > 0:
+        print(f"⏳ Laissés pour Mistral (modèle local pas assez confiant): {left}")
     if errors > 0:
         print(f"❌ Erreurs: {errors}")
+    print(f"⏱️ Débit: {batch_stats['debit']} articles/s ({workers} en parallèle, {batch_stats['duree']}s)")
+    print(f"⏱️ Latence par article: p50 {batch_stats['latence_p50']}s, p95 {batch_stats['latence_p95']}s")
+    if local_model:
+        local_stats = classifier.get_local_stats()
+        print(f"🧠 Modèle local: {local_stats['local']} articles sans Mistral, "
+              f"escalade {local_stats['taux_escalade']}% (seuil {args.local_threshold})")
+    print(classifier.cache.summary())
     
     # Statistiques finales
     print("\n" + "="*60)
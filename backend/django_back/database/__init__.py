@@ -3,6 +3,8 @@ Module de gestion de la base de données
 """
 
 from .db_manager import DatabaseManager
+from .connection_pool import ConnectionPool
+from .write_queue import WriteQueue
 from .models import Article, Media
 
-__all__ = ['DatabaseManager', 'Article', 'Media']
+__all__ = ['DatabaseManager', 'ConnectionPool', 'WriteQueue', 'Article', 'Media']
@@ -0,0 +1,127 @@
+"""
+Pool de connexions SQLite réutilisables
+Chaque connexion est configurée une seule fois (WAL, busy_timeout, cache, mmap)
+puis rendue au pool par close() au lieu d'être fermée
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from typing import Dict, Optional, Union
+
+# Réglages appliqués à chaque nouvelle connexion
+DEFAULT_PRAGMAS: Dict[str, Union[int, str]] = {
+    'journal_mode': 'WAL',  # Lectures concurrentes pendant les écritures
+    'busy_timeout': 30000,  # ms: plusieurs workers de scraping écrivent en parallèle
+    'synchronous': 'NORMAL',  # Sûr en WAL, évite un fsync par transaction
+    'cache_size': -16000,  # 16 Mo de cache de pages par connexion
+    'mmap_size': 268435456,  # 256 Mo lus par mmap
+    'temp_store': 'MEMORY',
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connexion SQLite dont close() la rend au pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool: Optional['ConnectionPool'] = None
+        self.checked_out = False
+
+    def close(self):
+        """Annuler la transaction en cours et rendre la connexion au pool"""
+        if self.pool is None:
+            super().close()
+        elif self.checked_out:
+            self.checked_out = False
+            self.pool.release(self)
+
+    def close_for_good(self):
+        """Fermer réellement la connexion"""
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Pool de connexions SQLite partagé entre threads
+
+    Une connexion n'est utilisée que par un thread à la fois (entre
+    get_connection() et close()), elle peut donc changer de thread.
+    """
+
+    def __init__(self, db_path: str, size: int = 8,
+                 pragmas: Optional[Dict[str, Union[int, str]]] = None):
+        """
+        Initialise le pool
+
+        Args:
+            db_path: Chemin vers le fichier de base de données
+            size: Nombre maximum de connexions inactives conservées (0: aucune réutilisation)
+            pragmas: Réglages des connexions (par défaut DEFAULT_PRAGMAS)
+        """
+        self.db_path = db_path
+        self.size = max(0, size)
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(self.db_path, timeout=30, factory=PooledConnection,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        conn.pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """
+        Obtenir une connexion inactive, ou en ouvrir une nouvelle
+
+        Returns:
+            Connexion configurée (row_factory sqlite3.Row)
+        """
+        # Après un fork (scheduler, workers), ne pas réutiliser les connexions du parent
+        if os.getpid() != self._pid:
+            with self._lock:
+                if os.getpid() != self._pid:
+                    self._idle = queue.LifoQueue()
+                    self._pid = os.getpid()
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        conn.checked_out = True
+        return conn
+
+    def release(self, conn: PooledConnection):
+        """
+        Rendre une connexion au pool
+
+        Args:
+            conn: Connexion obtenue par acquire()
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()  # Transaction non validée par l'appelant
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            conn.close_for_good()
+            return
+
+        if os.getpid() != self._pid or self._idle.qsize() >= self.size:
+            conn.close_for_good()
+        else:
+            self._idle.put(conn)
+
+    def close_all(self):
+        """Fermer toutes les connexions inactives"""
+        while True:
+            try:
+                self._idle.get_nowait().close_for_good()
+            except queue.Empty:
+                break
@@ -5,24 +5,105 @@ Gestionnaire de base de données SQLite
 import sqlite3
 import json
 import os
+import re
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Set, Tuple, Union
 from pathlib import Path
 
+from .connection_pool import ConnectionPool
+from .pagination import decode_cursor, encode_cursor, fetch_keyset_page
+from .write_queue import WriteQueue
 from .models import Article, Media
 
 
 class DatabaseManager:
     """Gestionnaire de la base de données SQLite"""
     
-    def __init__(self, db_path: str = 'data/media_scan.db'):
+    # Colonnes modifiables de la table crawl_state
+    CRAWL_STATE_COLUMNS = ('feed_url', 'feed_type', 'feed_failures', 'checked_at',
+                           'etag', 'last_modified', 'feed_hash', 'links_hash', 'links')
+    
+    # Colonnes d'articles recalculables par re-parsing
+    ARTICLE_UPDATABLE_COLUMNS = ('titre', 'contenu', 'extrait', 'auteur',
+                                 'date_publication', 'image_url')
+    
+    # Colonnes ajoutées après la création initiale des tables (migration automatique)
+    COLUMN_MIGRATIONS = {
+        'crawl_state': [
+            ('feed_type', 'TEXT'),
+            ('feed_failures', 'INTEGER DEFAULT 0'),
+            ('checked_at', 'TIMESTAMP'),
+            ('links_hash', 'TEXT'),
+            ('links', 'TEXT'),
+        ],
+        'media_metrics': [
+            ('periode_jours', 'INTEGER'),
+            ('details', 'TEXT'),
+        ],
+    }
+    
+    # Index portant sur des colonnes ajoutées par COLUMN_MIGRATIONS (créés après la migration)
+    MIGRATED_INDEXES = [
+        "CREATE INDEX IF NOT EXISTS idx_media_metrics_snapshot ON media_metrics(periode_jours, created_at)",
+    ]
+    
+    # Périodes (jours) des instantanés de media_metrics, et ancienneté maximale servie
+    METRICS_PERIODS = (1, 7, 30)
+    METRICS_MAX_AGE_HOURS = 24
+    METRICS_HISTORY_DAYS = 90
+    
+    # Colonnes de media_metrics: classement (get_media_ranking_with_twitter) et scores
+    METRICS_COLUMNS = (
+        'total_articles', 'total_posts_facebook', 'total_tweets',
+        'total_likes_fb', 'total_comments_fb', 'total_shares_fb', 'engagement_total_fb',
+        'total_retweets', 'total_replies', 'total_likes_tw', 'total_quotes',
+        'total_impressions', 'engagement_total_tw', 'engagement_total', 'engagement_moyen',
+        'score_volume', 'score_engagement', 'score_influence',
+    )
+    
+    # Index plein texte par type de contenu: (table FTS, table source, titre, pondération BM25)
+    SEARCH_SOURCES = {
+        'article': ('articles_fts', 'articles', 'x.titre', 'bm25(5.0, 1.0)'),
+        'facebook_post': ('facebook_posts_fts', 'facebook_posts', 'NULL', 'bm25()'),
+        'tweet': ('twitter_tweets_fts', 'twitter_tweets', 'NULL', 'bm25()'),
+    }
+    
+    # Sources des agrégats quotidiens: plateforme -> (table, valeurs agrégées dans l'ordre
+    # likes, comments, shares, retweets, replies, quotes, impressions, engagement_total)
+    DAILY_STATS_SOURCES = {
+        'web': ('articles', '0, 0, 0, 0, 0, 0, 0, 0'),
+        'facebook': ('facebook_posts', 'SUM(likes), SUM(comments), SUM(shares), 0, 0, 0, 0, SUM(engagement_total)'),
+        'twitter': ('twitter_tweets', 'SUM(likes), 0, 0, SUM(retweets), SUM(replies), SUM(quotes), '
+                                      'SUM(impressions), SUM(engagement_total)'),
+    }
+    
+    # Colonnes de médias modifiables depuis l'API
+    MEDIA_UPDATABLE_COLUMNS = ('nom', 'url', 'type_site', 'facebook_page',
+                               'twitter_account', 'actif')
+    
+    def __init__(self, db_path: str = 'data/media_scan.db', pool_size: int = 8,
+                 write_queue: bool = True, flush_interval: float = 0.0,
+                 max_write_batch: int = 200):
         """
         Initialise le gestionnaire de base de données
         
         Args:
             db_path: Chemin vers le fichier de base de données
+            pool_size: Connexions inactives conservées pour être réutilisées (0: une connexion par appel)
+            write_queue: Faire passer les écritures par un thread écrivain unique (transactions groupées)
+            flush_interval: Délai maximal (secondes) de regroupement des écritures (0: écritures déjà en attente)
+            max_write_batch: Nombre maximum d'écritures par transaction
         """
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, size=pool_size)
+        self.use_write_queue = write_queue
+        self.flush_interval = flush_interval
+        self.max_write_batch = max_write_batch
+        self._writer: Optional[WriteQueue] = None
+        self._writer_pid = None
+        self._writer_lock = threading.Lock()
         
         # Créer le dossier data s'il n'existe pas
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -42,7 +123,14 @@ class DatabaseManager:
         
         conn = self.get_connection()
         try:
+            existing_tables = {row['name'] for row in
+                               conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
             conn.executescript(schema)
+            self._migrate_columns(conn)
+            self._backfill_search_indexes(conn, existing_tables)
+            if 'daily_media_stats' not in existing_tables and 'articles' in existing_tables:
+                self._rebuild_daily_stats(conn)
+                print("📅 Agrégats quotidiens calculés (daily_media_stats)")
             conn.commit()
             
             # Initialiser le média AIB par défaut si la table est vide
@@ -60,16 +148,99 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def _migrate_columns(self, conn: sqlite3.Connection):
+        """
+        Ajouter les colonnes manquantes aux tables créées par une version antérieure
+        
+        Args:
+            conn: Connexion ouverte
+        """
+        for table, columns in self.COLUMN_MIGRATIONS.items():
+            existing = {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for col_name, col_type in columns:
+                if col_name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
+        for index_sql in self.MIGRATED_INDEXES:
+            conn.execute(index_sql)
+    
     def get_connection(self) -> sqlite3.Connection:
         """
-        Crée une nouvelle connexion à la base de données
+        Obtient une connexion du pool (configurée une fois: WAL, busy_timeout, cache, mmap)
+        
+        close() rend la connexion au pool; une transaction non validée est annulée.
         
         Returns:
             Connexion SQLite avec row_factory configuré
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self.pool.acquire()
+    
+    def close(self):
+        """Valider les écritures en attente et fermer les connexions inactives du pool"""
+        if self._writer and self._writer_pid == os.getpid():
+            self._writer.close()
+        self._writer = None
+        self.pool.close_all()
+    
+    # ==================== ÉCRITURES ====================
+    
+    @property
+    def writer(self) -> WriteQueue:
+        """File d'écriture du processus courant (créée à la première écriture)"""
+        # Après un fork, le thread écrivain du parent n'existe pas dans l'enfant
+        if self._writer is None or self._writer_pid != os.getpid():
+            with self._writer_lock:
+                if self._writer is None or self._writer_pid != os.getpid():
+                    self._writer = WriteQueue(self.pool.acquire,
+                                              flush_interval=self.flush_interval,
+                                              max_batch=self.max_write_batch)
+                    self._writer_pid = os.getpid()
+        return self._writer
+    
+    def write(self, func: Callable[[sqlite3.Connection], Any], wait: bool = True,
+              transaction: bool = True) -> Union[Any, Future]:
+        """
+        Exécuter une écriture via le thread écrivain unique
+        
+        Les écritures concurrentes (workers de scraping, API) sont regroupées en
+        une transaction: pas de contention de verrou entre threads, et les
+        lectures (WAL) ne sont jamais bloquées. La fonction ne doit pas appeler
+        commit(); une erreur n'annule que sa propre écriture.
+        
+        Args:
+            func: Fonction (connexion) -> résultat exécutant les requêtes d'écriture
+            wait: Attendre la validation de la transaction (sinon retourne un Future)
+            transaction: False pour une commande impossible dans une transaction (VACUUM),
+                exécutée seule par l'écrivain
+            
+        Returns:
+            Résultat de func, ou Future si wait=False
+        """
+        if not self.use_write_queue:
+            conn = self.get_connection()
+            try:
+                result = func(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            
+            if wait:
+                return result
+            future = Future()
+            future.set_result(result)
+            return future
+        
+        future = self.writer.submit(func, transaction)
+        return future.result() if wait else future
+    
+    def flush_writes(self, timeout: Optional[float] = None):
+        """
+        Attendre la validation des écritures soumises sans attente (wait=False)
+        
+        Args:
+            timeout: Attente maximale en secondes
+        """
+        if self.use_write_queue and self._writer and self._writer_pid == os.getpid():
+            self._writer.flush(timeout)
     
     # ==================== MÉDIAS ====================
     
@@ -88,10 +259,9 @@ class DatabaseManager:
         Returns:
             ID du média
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO medias (nom, url, type_site, facebook_page, twitter_account)
                 VALUES (?, ?, ?, ?, ?)
@@ -102,18 +272,11 @@ class DatabaseManager:
                     twitter_account = excluded.twitter_account
             """, (nom, url, type_site, facebook_page, twitter_account))
             
-            media_id = cursor.lastrowid
-            
-            # Si c'était un UPDATE, récupérer l'ID existant
-            if media_id == 0:
-                cursor.execute("SELECT id FROM medias WHERE url = ?", (url,))
-                media_id = cursor.fetchone()[0]
-            
-            conn.commit()
-            return media_id
+            # lastrowid n'est pas fiable après un UPDATE (connexion de l'écrivain partagée)
+            cursor.execute("SELECT id FROM medias WHERE url = ?", (url,))
+            return cursor.fetchone()[0]
         
-        finally:
-            conn.close()
+        return self.write(write)
     
     def get_media_by_url(self, url: str) -> Optional[Media]:
         """Récupérer un média par son URL"""
@@ -173,19 +336,75 @@ class DatabaseManager:
     
     def update_media_last_scrape(self, media_id: int):
         """Met à jour la date de dernière collecte d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 UPDATE medias 
                 SET derniere_collecte = CURRENT_TIMESTAMP
                 WHERE id = ?
             """, (media_id,))
-            conn.commit()
         
-        finally:
-            conn.close()
+        return self.write(write)
+    
+    def update_media_type(self, media_id: int, type_site: str):
+        """
+        Met à jour le type de site d'un média (wordpress, rss, html)
+        
+        Args:
+            media_id: ID du média
+            type_site: Type de site détecté
+        """
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.execute("UPDATE medias SET type_site = ? WHERE id = ?", (type_site, media_id))
+        
+        return self.write(write)
+    
+    def update_media(self, media_id: int, **fields) -> bool:
+        """
+        Met à jour les informations d'un média
+        
+        Seules les colonnes fournies sont mises à jour.
+        
+        Args:
+            media_id: ID du média
+            **fields: Colonnes à mettre à jour (nom, url, type_site, facebook_page, twitter_account, actif)
+            
+        Returns:
+            True si le média a été modifié
+        """
+        columns = [c for c in fields if c in self.MEDIA_UPDATABLE_COLUMNS]
+        if not columns:
+            return False
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE medias SET {', '.join(f'{c} = ?' for c in columns)}
+                WHERE id = ?
+            """, [fields[c] for c in columns] + [media_id])
+            return cursor.rowcount > 0
+        
+        return self.write(write)
+    
+    def delete_media(self, media_id: int) -> bool:
+        """
+        Supprime un média
+        
+        Args:
+            media_id: ID du média
+            
+        Returns:
+            True si le média a été supprimé
+        """
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM medias WHERE id = ?", (media_id,))
+            return cursor.rowcount > 0
+        
+        return self.write(write)
     
     def get_medias_with_facebook(self, actif_only: bool = True) -> List[Media]:
         """Récupérer tous les médias ayant une page Facebook configurée"""
@@ -283,6 +502,140 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    # ==================== ÉTAT DE COLLECTE ====================
+    
+    def get_crawl_state(self, media_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Récupérer l'état de collecte d'un média (validateurs du flux RSS)
+        
+        Args:
+            media_id: ID du média
+            
+        Returns:
+            Dictionnaire (feed_url, feed_type, feed_failures, etag, ...) ou None
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT * FROM crawl_state WHERE media_id = ?", (media_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        
+        finally:
+            conn.close()
+    
+    def save_crawl_state(self, media_id: int, **fields):
+        """
+        Enregistrer l'état de collecte d'un média
+        
+        Seules les colonnes fournies sont mises à jour.
+        
+        Args:
+            media_id: ID du média
+            **fields: Colonnes de crawl_state à mettre à jour (feed_url, feed_type, etag, ...)
+        """
+        columns = [c for c in fields if c in self.CRAWL_STATE_COLUMNS]
+        if not columns:
+            return
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                INSERT INTO crawl_state (media_id, {', '.join(columns)})
+                VALUES (?, {', '.join('?' for _ in columns)})
+                ON CONFLICT(media_id) DO UPDATE SET
+                    {', '.join(f'{c} = excluded.{c}' for c in columns)},
+                    updated_at = CURRENT_TIMESTAMP
+            """, [media_id] + [fields[c] for c in columns])
+        
+        return self.write(write)
+    
+    # ==================== PROFILS D'EXTRACTION ====================
+    
+    def get_extraction_profile(self, domain: str) -> Dict[str, str]:
+        """
+        Récupérer la règle d'extraction préférée de chaque champ pour un domaine
+        
+        Args:
+            domain: Domaine du site (sans www.)
+            
+        Returns:
+            Dictionnaire {champ: sélecteur} (règle au meilleur bilan succès - échecs)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT field, selector FROM (
+                    SELECT field, selector,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY field
+                               ORDER BY hits - misses DESC, updated_at DESC
+                           ) AS rang
+                    FROM extraction_profiles
+                    WHERE domain = ? AND hits > misses
+                )
+                WHERE rang = 1
+            """, (domain,))
+            return {row['field']: row['selector'] for row in cursor.fetchall()}
+        
+        finally:
+            conn.close()
+    
+    def get_extraction_stats(self, domain: str) -> List[Dict[str, Any]]:
+        """
+        Récupérer les statistiques de toutes les règles d'extraction d'un domaine
+        
+        Args:
+            domain: Domaine du site (sans www.)
+            
+        Returns:
+            Liste de dictionnaires (field, selector, hits, misses, updated_at)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT field, selector, hits, misses, updated_at
+                FROM extraction_profiles
+                WHERE domain = ?
+                ORDER BY field, hits - misses DESC
+            """, (domain,))
+            return [dict(row) for row in cursor.fetchall()]
+        
+        finally:
+            conn.close()
+    
+    def save_extraction_stats(self, domain: str, rows: Iterable[Tuple[str, str, int, int]]):
+        """
+        Cumuler les compteurs des règles d'extraction d'un domaine
+        
+        Args:
+            domain: Domaine du site (sans www.)
+            rows: Tuples (champ, sélecteur, hits, misses) à ajouter
+        """
+        rows = [(domain, field, selector, hits, misses) for field, selector, hits, misses in rows]
+        if not rows:
+            return
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO extraction_profiles (domain, field, selector, hits, misses)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(domain, field, selector) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses,
+                    updated_at = CURRENT_TIMESTAMP
+            """, rows)
+        
+        return self.write(write)
+    
     # ==================== ARTICLES ====================
     
     def add_article(self, article: Article) -> int:
@@ -295,10 +648,9 @@ class DatabaseManager:
         Returns:
             ID de l'article inséré, ou 0 si déjà existant
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO articles (
                     media_id, titre, contenu, extrait, url, auteur,
@@ -322,16 +674,78 @@ class DatabaseManager:
                 article.commentaires
             ))
             
-            article_id = cursor.lastrowid
-            conn.commit()
-            
-            return article_id
+            # Aucune ligne insérée si l'URL existe déjà
+            return cursor.lastrowid if cursor.rowcount else 0
+        
+        try:
+            return self.write(write)
         
         except sqlite3.IntegrityError:
             return 0
+    
+    def add_articles_bulk(self, articles: List[Article]) -> Dict[str, int]:
+        """
+        Ajoute un lot d'articles en une seule transaction
         
-        finally:
-            conn.close()
+        Les articles dont l'URL existe déjà sont ignorés.
+        
+        Args:
+            articles: Instances d'Article
+            
+        Returns:
+            Dictionnaire {url: ID} des articles réellement insérés
+        """
+        if not articles:
+            return {}
+        
+        # Une URL présente plusieurs fois dans le lot n'est insérée qu'une fois
+        by_url = {}
+        for article in articles:
+            by_url.setdefault(article.url, article)
+        urls_json = json.dumps(list(by_url))
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT url FROM articles
+                WHERE url IN (SELECT value FROM json_each(?))
+            """, (urls_json,))
+            existing = {row['url'] for row in cursor.fetchall()}
+            
+            cursor.executemany("""
+                INSERT INTO articles (
+                    media_id, titre, contenu, extrait, url, auteur,
+                    date_publication, image_url, categories, tags,
+                    source_type, vues, commentaires
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO NOTHING
+            """, [(
+                article.media_id,
+                article.titre,
+                article.contenu,
+                article.extrait,
+                article.url,
+                article.auteur,
+                article.date_publication,
+                article.image_url,
+                json.dumps(article.categories) if article.categories else None,
+                json.dumps(article.tags) if article.tags else None,
+                article.source_type,
+                article.vues,
+                article.commentaires
+            ) for url, article in by_url.items() if url not in existing])
+            
+            cursor.execute("""
+                SELECT id, url FROM articles
+                WHERE url IN (SELECT value FROM json_each(?))
+            """, (urls_json,))
+            inserted = {row['url']: row['id'] for row in cursor.fetchall()
+                        if row['url'] not in existing}
+            
+            return inserted
+        
+        return self.write(write)
     
     def get_article_by_url(self, url: str) -> Optional[Article]:
         """Récupérer un article par son URL"""
@@ -369,6 +783,34 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def get_existing_article_urls(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Déterminer en une seule requête quelles URLs sont déjà en base
+        
+        Args:
+            urls: URLs candidates
+            
+        Returns:
+            Ensemble des URLs déjà présentes dans la table articles
+        """
+        urls = list(urls)
+        if not urls:
+            return set()
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            # json_each évite la limite du nombre de paramètres SQLite
+            cursor.execute("""
+                SELECT url FROM articles
+                WHERE url IN (SELECT value FROM json_each(?))
+            """, (json.dumps(urls),))
+            return {row['url'] for row in cursor.fetchall()}
+        
+        finally:
+            conn.close()
+    
     def get_articles_by_media(self, media_id: int, limit: int = 100) -> List[Article]:
         """Récupérer les articles d'un média"""
         conn = self.get_connection()
@@ -407,6 +849,118 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def get_articles_page(self, media_id: Optional[int] = None, days: Optional[int] = None,
+                          limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parcourir les articles du plus récent au plus ancien, page par page
+        
+        Args:
+            media_id: Filtrer sur un média
+            days: Ne garder que les articles publiés depuis N jours
+            limit: Nombre d'articles par page
+            cursor: Curseur 'next' de la page précédente
+            
+        Returns:
+            Dictionnaire {results: List[Article], next: curseur ou None}
+            
+        Raises:
+            ValueError: Curseur invalide
+        """
+        conditions, params = self._listing_filters(media_id, days)
+        conn = self.get_connection()
+        
+        try:
+            page = fetch_keyset_page(conn, f"""
+                SELECT * FROM articles
+                WHERE {conditions} {{keyset}}
+            """, params, cursor, limit)
+            
+            return {
+                'results': [self._row_to_article(row) for row in page['rows']],
+                'next': page['next']
+            }
+        
+        finally:
+            conn.close()
+    
+    def _listing_filters(self, media_id: Optional[int] = None,
+                         days: Optional[int] = None) -> Tuple[str, List[Any]]:
+        """Conditions WHERE communes aux listes paginées (média, période)"""
+        conditions, params = [], []
+        if media_id:
+            conditions.append("media_id = ?")
+            params.append(media_id)
+        if days:
+            conditions.append("date_publication >= ?")
+            params.append((datetime.now() - timedelta(days=days)).isoformat())
+        return ''.join(f"{c} AND " for c in conditions), params
+    
+    def get_articles_for_reparse(self, source_types: Iterable[str], media_id: Optional[int] = None,
+                                 days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Lister les articles à re-parser depuis le cache HTTP
+        
+        Args:
+            source_types: Sources concernées (html_scraping, rss_feed)
+            media_id: Restreindre à un média
+            days: Restreindre aux articles scrapés depuis N jours
+            
+        Returns:
+            Liste de dictionnaires (id, media_id, url, source_type, date_publication,
+            media_url: URL du site du média)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+                SELECT a.id, a.media_id, a.url, a.source_type, a.date_publication,
+                       m.url AS media_url
+                FROM articles a
+                LEFT JOIN medias m ON m.id = a.media_id
+                WHERE a.source_type IN (SELECT value FROM json_each(?))
+            """
+            params: List[Any] = [json.dumps(list(source_types))]
+            
+            if media_id is not None:
+                query += " AND a.media_id = ?"
+                params.append(media_id)
+            if days is not None:
+                query += " AND a.scraped_at >= datetime('now', ?)"
+                params.append(f'-{int(days)} days')
+            
+            cursor.execute(query + " ORDER BY a.id", params)
+            return [dict(row) for row in cursor.fetchall()]
+        
+        finally:
+            conn.close()
+    
+    def update_article(self, article_id: int, **fields) -> bool:
+        """
+        Mettre à jour les champs extraits d'un article (re-parsing)
+        
+        Args:
+            article_id: ID de l'article
+            **fields: Colonnes à mettre à jour (titre, contenu, auteur, ...)
+            
+        Returns:
+            True si l'article a été modifié
+        """
+        columns = [c for c in fields if c in self.ARTICLE_UPDATABLE_COLUMNS]
+        if not columns:
+            return False
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                UPDATE articles SET {', '.join(f'{c} = ?' for c in columns)}
+                WHERE id = ?
+            """, [fields[c] for c in columns] + [article_id])
+            return cursor.rowcount > 0
+        
+        return self.write(write)
+    
     def _row_to_article(self, row: sqlite3.Row) -> Article:
         """Convertit une ligne SQL en objet Article"""
         return Article(
@@ -433,19 +987,16 @@ class DatabaseManager:
     def add_scraping_log(self, media_id: int, status: str, methode: str, 
                         articles_collectes: int = 0, message: str = ""):
         """Ajoute un log de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO scraping_logs (media_id, status, methode, articles_collectes, message)
                 VALUES (?, ?, ?, ?, ?)
             """, (media_id, status, methode, articles_collectes, message))
             
-            conn.commit()
         
-        finally:
-            conn.close()
+        return self.write(write)
     
     # ==================== CLASSIFICATIONS ====================
     
@@ -453,10 +1004,9 @@ class DatabaseManager:
                           mots_cles: List[str] = None, justification: str = "",
                           methode: str = "mistral_ollama"):
         """Ajoute une classification thématique"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO classifications (
                     article_id, categorie, confiance, mots_cles, justification, methode
@@ -477,10 +1027,51 @@ class DatabaseManager:
                 methode
             ))
             
-            conn.commit()
         
-        finally:
-            conn.close()
+        return self.write(write)
+    
+    def add_classifications_bulk(self, classifications: List[Dict[str, Any]]) -> int:
+        """
+        Ajouter plusieurs classifications en une seule transaction
+        
+        Args:
+            classifications: Dictionnaires avec article_id, categorie, confiance
+                et optionnellement mots_cles, justification, methode
+            
+        Returns:
+            Nombre de classifications enregistrées
+        """
+        if not classifications:
+            return 0
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO classifications (
+                    article_id, categorie, confiance, mots_cles, justification, methode
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    categorie = excluded.categorie,
+                    confiance = excluded.confiance,
+                    mots_cles = excluded.mots_cles,
+                    justification = excluded.justification,
+                    methode = excluded.methode,
+                    created_at = CURRENT_TIMESTAMP
+            """, [
+                (
+                    c['article_id'],
+                    c['categorie'],
+                    c['confiance'],
+                    json.dumps(c['mots_cles']) if c.get('mots_cles') else None,
+                    c.get('justification', ''),
+                    c.get('methode', 'mistral_ollama')
+                )
+                for c in classifications
+            ])
+            return len(classifications)
+        
+        return self.write(write)
     
     def get_classification(self, article_id: int) -> Optional[Dict[str, Any]]:
         """Récupère la classification d'un article"""
@@ -598,12 +1189,11 @@ class DatabaseManager:
                          url: str, image_url: str = None, date_publication: str = None,
                          likes: int = 0, comments: int = 0, shares: int = 0) -> int:
         """Ajoute ou met à jour un post Facebook"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         engagement_total = likes + comments + shares
         
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO facebook_posts (
                     media_id, post_id, message, url, image_url, date_publication,
@@ -620,13 +1210,55 @@ class DatabaseManager:
                 likes, comments, shares, engagement_total
             ))
             
-            post_id_db = cursor.lastrowid
-            conn.commit()
+            # lastrowid n'est pas fiable après un UPDATE (connexion de l'écrivain partagée)
+            cursor.execute("SELECT id FROM facebook_posts WHERE post_id = ?", (post_id,))
+            return cursor.fetchone()[0]
+        
+        return self.write(write)
+    
+    def add_facebook_posts_bulk(self, media_id: int, posts: List[Dict[str, Any]]) -> int:
+        """
+        Ajoute ou met à jour un lot de posts Facebook en une seule transaction
+        
+        Args:
+            media_id: ID du média
+            posts: Posts au format de FacebookScraper (post_id, message, url, image_url,
+                date_publication, likes, comments, shares)
             
-            return post_id_db
+        Returns:
+            Nombre de posts ajoutés ou mis à jour
+        """
+        rows = []
+        for post in posts:
+            likes, comments, shares = post.get('likes', 0), post.get('comments', 0), post.get('shares', 0)
+            rows.append((
+                media_id, post['post_id'], post.get('message'), post.get('url'),
+                post.get('image_url'), post.get('date_publication'),
+                likes, comments, shares, likes + comments + shares
+            ))
         
-        finally:
-            conn.close()
+        if not rows:
+            return 0
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO facebook_posts (
+                    media_id, post_id, message, url, image_url, date_publication,
+                    likes, comments, shares, engagement_total
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(post_id) DO UPDATE SET
+                    likes = excluded.likes,
+                    comments = excluded.comments,
+                    shares = excluded.shares,
+                    engagement_total = excluded.engagement_total,
+                    scraped_at = CURRENT_TIMESTAMP
+            """, rows)
+            
+            return len(rows)
+        
+        return self.write(write)
     
     def get_facebook_posts_by_media(self, media_id: int, limit: int = 100) -> List[Dict[str, Any]]:
         """Récupère les posts Facebook d'un média"""
@@ -641,7 +1273,38 @@ class DatabaseManager:
                 LIMIT ?
             """, (media_id, limit))
             
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in cursor.fetchall()]
+        
+        finally:
+            conn.close()
+    
+    def get_facebook_posts_page(self, media_id: Optional[int] = None, days: Optional[int] = None,
+                                limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parcourir les posts Facebook du plus récent au plus ancien, page par page
+        
+        Args:
+            media_id: Filtrer sur un média
+            days: Ne garder que les posts publiés depuis N jours
+            limit: Nombre de posts par page
+            cursor: Curseur 'next' de la page précédente
+            
+        Returns:
+            Dictionnaire {results, next: curseur ou None}
+            
+        Raises:
+            ValueError: Curseur invalide
+        """
+        conditions, params = self._listing_filters(media_id, days)
+        conn = self.get_connection()
+        
+        try:
+            page = fetch_keyset_page(conn, f"""
+                SELECT * FROM facebook_posts
+                WHERE {conditions} {{keyset}}
+            """, params, cursor, limit)
+            
+            return {'results': [dict(row) for row in page['rows']], 'next': page['next']}
         
         finally:
             conn.close()
@@ -678,10 +1341,9 @@ class DatabaseManager:
     
     def calculate_media_metrics(self, media_id: int, days: int = 30) -> Optional[Dict[str, Any]]:
         """Calcule les métriques d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             date_limit = (datetime.now() - timedelta(days=days)).isoformat()
             periode_debut = date_limit
             periode_fin = datetime.now().isoformat()
@@ -738,12 +1400,10 @@ class DatabaseManager:
                 metrics['engagement_total'], metrics['engagement_moyen']
             ))
             
-            conn.commit()
-            
             return metrics
         
-        finally:
-            conn.close()
+        # Lectures et insertion dans la même transaction de l'écrivain
+        return self.write(write)
     
     def get_media_ranking(self, days: int = 30) -> List[Dict[str, Any]]:
         """Classement des médias par engagement"""
@@ -751,27 +1411,29 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
+            date_limit = self.period_first_day(days)
             
+            # Agrégats quotidiens: pas de produit articles × posts dans la jointure
             cursor.execute("""
                 SELECT 
                     m.id,
                     m.nom,
                     m.url,
-                    COUNT(DISTINCT a.id) as total_articles,
-                    COUNT(DISTINCT fp.id) as total_posts_facebook,
-                    COALESCE(SUM(fp.likes), 0) as total_likes,
-                    COALESCE(SUM(fp.comments), 0) as total_comments,
-                    COALESCE(SUM(fp.shares), 0) as total_shares,
-                    COALESCE(SUM(fp.engagement_total), 0) as engagement_total,
-                    COALESCE(AVG(fp.engagement_total), 0) as engagement_moyen
+                    COALESCE(SUM(CASE WHEN d.plateforme = 'web' THEN d.publications END), 0) as total_articles,
+                    COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.publications END), 0) as total_posts_facebook,
+                    COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.likes END), 0) as total_likes,
+                    COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.comments END), 0) as total_comments,
+                    COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.shares END), 0) as total_shares,
+                    COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.engagement_total END), 0) as engagement_total,
+                    COALESCE(CAST(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.engagement_total END) AS REAL) /
+                             SUM(CASE WHEN d.plateforme = 'facebook' THEN d.publications END), 0) as engagement_moyen
                 FROM medias m
-                LEFT JOIN articles a ON m.id = a.media_id AND a.date_publication >= ?
-                LEFT JOIN facebook_posts fp ON m.id = fp.media_id AND fp.date_publication >= ?
+                LEFT JOIN daily_media_stats d ON m.id = d.media_id
+                    AND d.plateforme IN ('web', 'facebook') AND d.jour >= ?
                 WHERE m.actif = 1
                 GROUP BY m.id, m.nom, m.url
                 ORDER BY engagement_total DESC, total_articles DESC
-            """, (date_limit, date_limit))
+            """, (date_limit,))
             
             return [dict(row) for row in cursor.fetchall()]
         
@@ -785,12 +1447,11 @@ class DatabaseManager:
                          retweets: int = 0, replies: int = 0, likes: int = 0,
                          quotes: int = 0, impressions: int = 0) -> int:
         """Ajoute ou met à jour un tweet"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         engagement_total = retweets + replies + likes + quotes
         
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO twitter_tweets (
                     media_id, tweet_id, text, url, image_url, date_publication,
@@ -809,13 +1470,59 @@ class DatabaseManager:
                 retweets, replies, likes, quotes, impressions, engagement_total
             ))
             
-            tweet_id_db = cursor.lastrowid
-            conn.commit()
+            # lastrowid n'est pas fiable après un UPDATE (connexion de l'écrivain partagée)
+            cursor.execute("SELECT id FROM twitter_tweets WHERE tweet_id = ?", (tweet_id,))
+            return cursor.fetchone()[0]
+        
+        return self.write(write)
+    
+    def add_twitter_tweets_bulk(self, media_id: int, tweets: List[Dict[str, Any]]) -> int:
+        """
+        Ajoute ou met à jour un lot de tweets en une seule transaction
+        
+        Args:
+            media_id: ID du média
+            tweets: Tweets au format de TwitterScraper (tweet_id, text, url, image_url,
+                date_publication, retweets, replies, likes, quotes, impressions)
             
-            return tweet_id_db
+        Returns:
+            Nombre de tweets ajoutés ou mis à jour
+        """
+        rows = []
+        for tweet in tweets:
+            retweets, replies = tweet.get('retweets', 0), tweet.get('replies', 0)
+            likes, quotes = tweet.get('likes', 0), tweet.get('quotes', 0)
+            rows.append((
+                media_id, tweet['tweet_id'], tweet.get('text'), tweet.get('url'),
+                tweet.get('image_url'), tweet.get('date_publication'),
+                retweets, replies, likes, quotes, tweet.get('impressions', 0),
+                retweets + replies + likes + quotes
+            ))
         
-        finally:
-            conn.close()
+        if not rows:
+            return 0
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO twitter_tweets (
+                    media_id, tweet_id, text, url, image_url, date_publication,
+                    retweets, replies, likes, quotes, impressions, engagement_total
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(tweet_id) DO UPDATE SET
+                    retweets = excluded.retweets,
+                    replies = excluded.replies,
+                    likes = excluded.likes,
+                    quotes = excluded.quotes,
+                    impressions = excluded.impressions,
+                    engagement_total = excluded.engagement_total,
+                    scraped_at = CURRENT_TIMESTAMP
+            """, rows)
+            
+            return len(rows)
+        
+        return self.write(write)
     
     def get_twitter_tweets_by_media(self, media_id: int, limit: int = 100) -> List[Dict[str, Any]]:
         """Récupère les tweets d'un média"""
@@ -835,6 +1542,37 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def get_twitter_tweets_page(self, media_id: Optional[int] = None, days: Optional[int] = None,
+                                limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parcourir les tweets du plus récent au plus ancien, page par page
+        
+        Args:
+            media_id: Filtrer sur un média
+            days: Ne garder que les tweets publiés depuis N jours
+            limit: Nombre de tweets par page
+            cursor: Curseur 'next' de la page précédente
+            
+        Returns:
+            Dictionnaire {results, next: curseur ou None}
+            
+        Raises:
+            ValueError: Curseur invalide
+        """
+        conditions, params = self._listing_filters(media_id, days)
+        conn = self.get_connection()
+        
+        try:
+            page = fetch_keyset_page(conn, f"""
+                SELECT * FROM twitter_tweets
+                WHERE {conditions} {{keyset}}
+            """, params, cursor, limit)
+            
+            return {'results': [dict(row) for row in page['rows']], 'next': page['next']}
+        
+        finally:
+            conn.close()
+    
     def get_recent_twitter_tweets(self, days: int = 7, limit: int = 500):
         """Récupère les tweets récents"""
         conn = self.get_connection()
@@ -867,10 +1605,9 @@ class DatabaseManager:
     
     def calculate_media_metrics_with_twitter(self, media_id: int, days: int = 30) -> Optional[Dict[str, Any]]:
         """Calcule les métriques d'un média (articles + Facebook + Twitter)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             date_limit = (datetime.now() - timedelta(days=days)).isoformat()
             periode_debut = date_limit
             periode_fin = datetime.now().isoformat()
@@ -963,12 +1700,10 @@ class DatabaseManager:
                 metrics['engagement_total'], metrics['engagement_moyen']
             ))
             
-            conn.commit()
-            
             return metrics
         
-        finally:
-            conn.close()
+        # Lectures et insertion dans la même transaction de l'écrivain
+        return self.write(write)
     
     def get_media_ranking_with_twitter(self, days: int = 30) -> List[Dict[str, Any]]:
         """Classement des médias par engagement (Facebook + Twitter)"""
@@ -976,41 +1711,43 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
+            date_limit = self.period_first_day(days)
             
+            # Agrégats quotidiens: une ligne par média, jour et plateforme, sans produit
+            # articles × posts × tweets dans la jointure
             cursor.execute("""
-                SELECT 
-                    m.id,
-                    m.nom,
-                    m.url,
-                    COUNT(DISTINCT a.id) as total_articles,
-                    COUNT(DISTINCT fp.id) as total_posts_facebook,
-                    COUNT(DISTINCT tw.id) as total_tweets,
-                    COALESCE(SUM(fp.likes), 0) as total_likes_fb,
-                    COALESCE(SUM(fp.comments), 0) as total_comments_fb,
-                    COALESCE(SUM(fp.shares), 0) as total_shares_fb,
-                    COALESCE(SUM(fp.engagement_total), 0) as engagement_total_fb,
-                    COALESCE(SUM(tw.retweets), 0) as total_retweets,
-                    COALESCE(SUM(tw.replies), 0) as total_replies,
-                    COALESCE(SUM(tw.likes), 0) as total_likes_tw,
-                    COALESCE(SUM(tw.quotes), 0) as total_quotes,
-                    COALESCE(SUM(tw.impressions), 0) as total_impressions,
-                    COALESCE(SUM(tw.engagement_total), 0) as engagement_total_tw,
-                    COALESCE(SUM(fp.engagement_total), 0) + COALESCE(SUM(tw.engagement_total), 0) as engagement_total,
+                SELECT *,
+                    engagement_total_fb + engagement_total_tw as engagement_total,
                     CASE 
-                        WHEN (COUNT(DISTINCT fp.id) + COUNT(DISTINCT tw.id)) > 0 
-                        THEN (COALESCE(SUM(fp.engagement_total), 0) + COALESCE(SUM(tw.engagement_total), 0)) / 
-                             (COUNT(DISTINCT fp.id) + COUNT(DISTINCT tw.id))
+                        WHEN (total_posts_facebook + total_tweets) > 0 
+                        THEN (engagement_total_fb + engagement_total_tw) / (total_posts_facebook + total_tweets)
                         ELSE 0 
                     END as engagement_moyen
-                FROM medias m
-                LEFT JOIN articles a ON m.id = a.media_id AND a.date_publication >= ?
-                LEFT JOIN facebook_posts fp ON m.id = fp.media_id AND fp.date_publication >= ?
-                LEFT JOIN twitter_tweets tw ON m.id = tw.media_id AND tw.date_publication >= ?
-                WHERE m.actif = 1
-                GROUP BY m.id, m.nom, m.url
+                FROM (
+                    SELECT 
+                        m.id,
+                        m.nom,
+                        m.url,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'web' THEN d.publications END), 0) as total_articles,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.publications END), 0) as total_posts_facebook,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.publications END), 0) as total_tweets,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.likes END), 0) as total_likes_fb,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.comments END), 0) as total_comments_fb,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.shares END), 0) as total_shares_fb,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'facebook' THEN d.engagement_total END), 0) as engagement_total_fb,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.retweets END), 0) as total_retweets,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.replies END), 0) as total_replies,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.likes END), 0) as total_likes_tw,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.quotes END), 0) as total_quotes,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.impressions END), 0) as total_impressions,
+                        COALESCE(SUM(CASE WHEN d.plateforme = 'twitter' THEN d.engagement_total END), 0) as engagement_total_tw
+                    FROM medias m
+                    LEFT JOIN daily_media_stats d ON m.id = d.media_id AND d.jour >= ?
+                    WHERE m.actif = 1
+                    GROUP BY m.id, m.nom, m.url
+                )
                 ORDER BY engagement_total DESC, total_articles DESC
-            """, (date_limit, date_limit, date_limit))
+            """, (date_limit,))
             
             return [dict(row) for row in cursor.fetchall()]
         
@@ -1031,10 +1768,9 @@ class DatabaseManager:
         Returns:
             ID de l'analyse
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             import json
             
             toxicity = analysis.get('toxicity', {})
@@ -1089,11 +1825,9 @@ class DatabaseManager:
                 'mistral:latest'
             ))
             
-            conn.commit()
             return cursor.lastrowid
             
-        finally:
-            conn.close()
+        return self.write(write)
     
     def get_content_moderation(self, content_type: str, content_id: int) -> Optional[dict]:
         """
@@ -1237,6 +1971,289 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    # ==================== RECHERCHE ====================
+    
+    def search(self, query: str, types: Optional[Iterable[str]] = None, media_id: Optional[int] = None,
+               categorie: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, limit: int = 20,
+               cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Recherche plein texte (FTS5) dans les articles, posts Facebook et tweets
+        
+        Les résultats sont classés par pertinence BM25 (le titre d'un article pèse
+        plus que son contenu); les accents sont ignorés.
+        
+        Args:
+            query: Texte recherché (mots, "expressions exactes", préfixes avec *)
+            types: Types de contenu ('article', 'facebook_post', 'tweet'), tous par défaut
+            media_id: Filtrer sur un média
+            categorie: Filtrer sur une catégorie (articles uniquement)
+            date_from: Date de publication minimale (YYYY-MM-DD)
+            date_to: Date de publication maximale (YYYY-MM-DD)
+            limit: Nombre de résultats par page
+            cursor: Curseur 'next' de la page précédente
+            
+        Returns:
+            Dictionnaire {results, next}: next est None sur la dernière page
+            
+        Raises:
+            ValueError: Curseur ou type de contenu invalide
+        """
+        types = list(types or self.SEARCH_SOURCES)
+        unknown = [t for t in types if t not in self.SEARCH_SOURCES]
+        if unknown:
+            raise ValueError(f"Type de contenu inconnu: {', '.join(unknown)}")
+        if categorie:
+            # Seuls les articles sont classifiés
+            types = [t for t in types if t == 'article']
+        
+        after = decode_cursor(cursor, 3)
+        match = self._fts_query(query)
+        if not match or not types:
+            return {'results': [], 'next': None}
+        
+        conn = self.get_connection()
+        
+        try:
+            results = []
+            for type_name in types:
+                order = list(self.SEARCH_SOURCES).index(type_name)
+                fts, table, title, weights = self.SEARCH_SOURCES[type_name]
+                
+                conditions = [f"{fts} MATCH ?", f"{fts}.rank MATCH ?"]
+                params: List[Any] = [match, weights]
+                if media_id:
+                    conditions.append("x.media_id = ?")
+                    params.append(media_id)
+                if categorie:
+                    conditions.append("c.categorie = ?")
+                    params.append(categorie)
+                if date_from:
+                    conditions.append("date(x.date_publication) >= date(?)")
+                    params.append(date_from)
+                if date_to:
+                    conditions.append("date(x.date_publication) <= date(?)")
+                    params.append(date_to)
+                if after:
+                    # Reprendre après le dernier résultat: (score, type, id)
+                    conditions.append(f"({fts}.rank, ?, x.id) > (?, ?, ?)")
+                    params.extend([order] + after)
+                
+                classified = type_name == 'article'
+                rows = conn.execute(f"""
+                    SELECT x.id, x.media_id, m.nom AS media_nom, {title} AS titre,
+                           x.url, x.date_publication,
+                           {'c.categorie' if classified else 'NULL'} AS categorie,
+                           snippet({fts}, -1, '<mark>', '</mark>', '…', 16) AS extrait,
+                           {fts}.rank AS score
+                    FROM {fts}
+                    JOIN {table} x ON x.id = {fts}.rowid
+                    LEFT JOIN medias m ON m.id = x.media_id
+                    {'LEFT JOIN classifications c ON c.article_id = x.id' if classified else ''}
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY {fts}.rank, x.id
+                    LIMIT ?
+                """, params + [limit + 1]).fetchall()
+                
+                results.extend((row['score'], order, row['id'], type_name, row) for row in rows)
+            
+            # Fusionner les types: les scores BM25 sont négatifs, plus petit = plus pertinent
+            results.sort(key=lambda r: r[:3])
+            page = results[:limit]
+            
+            return {
+                'results': [{
+                    'type': type_name,
+                    'id': row['id'],
+                    'media_id': row['media_id'],
+                    'media_nom': row['media_nom'],
+                    'titre': row['titre'],
+                    'extrait': row['extrait'],
+                    'url': row['url'],
+                    'date_publication': row['date_publication'],
+                    'categorie': row['categorie'],
+                    'score': round(-score, 6)
+                } for score, _, _, type_name, row in page],
+                'next': encode_cursor(page[-1][:3]) if len(results) > limit else None
+            }
+        
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """
+        Convertir une recherche utilisateur en requête FTS5 sans erreur de syntaxe
+        
+        Les mots et "expressions exactes" sont combinés en ET; un mot suivi de *
+        est recherché comme préfixe.
+        
+        Args:
+            text: Texte saisi
+            
+        Returns:
+            Requête MATCH (vide si aucun mot)
+        """
+        terms = []
+        for phrase, word, prefix in re.findall(r'"([^"]*)"|(\w+)(\*?)', text or ''):
+            if word:
+                terms.append(f'"{word}"{prefix}')
+            elif re.findall(r'\w+', phrase):
+                terms.append('"' + ' '.join(re.findall(r'\w+', phrase)) + '"')
+        return ' '.join(terms)
+    
+    def _backfill_search_indexes(self, conn: sqlite3.Connection, existing_tables: Set[str]):
+        """
+        Indexer le contenu existant dans les index plein texte créés par cette version
+        
+        Args:
+            conn: Connexion ouverte
+            existing_tables: Tables présentes avant l'application du schéma
+        """
+        for fts, table, _, _ in self.SEARCH_SOURCES.values():
+            if fts not in existing_tables and table in existing_tables:
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                if count:
+                    print(f"🔎 Index de recherche {fts} construit ({count} lignes)")
+    
+    # ==================== AGRÉGATS QUOTIDIENS ====================
+    
+    def rebuild_daily_stats(self):
+        """
+        Recalculer entièrement daily_media_stats depuis les contenus
+        
+        Les triggers tiennent les agrégats à jour; utile après une modification
+        directe de la base (import, réparation).
+        """
+        self.write(self._rebuild_daily_stats)
+    
+    @staticmethod
+    def period_first_day(days: int) -> str:
+        """
+        Premier jour d'une période de N jours calendaires se terminant aujourd'hui
+        
+        Les agrégats étant quotidiens, la période '7 jours' couvre aujourd'hui et
+        les 6 jours précédents (exactement 7 valeurs de daily_media_stats.jour).
+        
+        Args:
+            days: Nombre de jours de la période (au moins 1)
+            
+        Returns:
+            Date au format YYYY-MM-DD
+        """
+        return (datetime.now() - timedelta(days=max(1, days) - 1)).date().isoformat()
+    
+    def _rebuild_daily_stats(self, conn: sqlite3.Connection):
+        """Recalculer tous les agrégats quotidiens sur une connexion ouverte"""
+        conn.execute("DELETE FROM daily_media_stats")
+        for plateforme, (table, sums) in self.DAILY_STATS_SOURCES.items():
+            conn.execute(f"""
+                INSERT INTO daily_media_stats
+                SELECT media_id, ?, substr(date_publication, 1, 10), COUNT(*), {sums},
+                       MIN(date_publication), MAX(date_publication)
+                FROM {table}
+                WHERE date(substr(date_publication, 1, 10)) IS NOT NULL
+                GROUP BY media_id, substr(date_publication, 1, 10)
+            """, (plateforme,))
+    
+    # ==================== MÉTRIQUES MATÉRIALISÉES ====================
+    
+    def save_media_metrics(self, periode_jours: int, metrics: List[Dict[str, Any]]) -> int:
+        """
+        Enregistrer un instantané des métriques de tous les médias pour une période
+        
+        Toutes les lignes partagent le même created_at: l'instantané le plus récent
+        est lu d'un seul accès à l'index (periode_jours, created_at). Les instantanés
+        de plus de METRICS_HISTORY_DAYS jours sont supprimés.
+        
+        Args:
+            periode_jours: Durée de la période (jours)
+            metrics: Une entrée par média (clé 'id' et colonnes METRICS_COLUMNS,
+                'details' optionnel, sérialisé en JSON)
+            
+        Returns:
+            Nombre de lignes enregistrées
+        """
+        now = datetime.now()
+        created_at = now.isoformat()
+        periode_debut = self.period_first_day(periode_jours)
+        periode_fin = now.date().isoformat()
+        columns = ', '.join(self.METRICS_COLUMNS)
+        placeholders = ', '.join('?' * len(self.METRICS_COLUMNS))
+        
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            cursor.executemany(f"""
+                INSERT INTO media_metrics (
+                    media_id, periode_debut, periode_fin, periode_jours, created_at, details,
+                    {columns}
+                ) VALUES (?, ?, ?, ?, ?, ?, {placeholders})
+            """, [
+                (m['id'], periode_debut, periode_fin, periode_jours, created_at,
+                 json.dumps(m['details'], ensure_ascii=False) if m.get('details') is not None else None,
+                 *(m.get(col, 0) for col in self.METRICS_COLUMNS))
+                for m in metrics
+            ])
+            cursor.execute("""
+                DELETE FROM media_metrics
+                WHERE periode_jours = ? AND created_at < ?
+            """, (periode_jours, (now - timedelta(days=self.METRICS_HISTORY_DAYS)).isoformat()))
+            return len(metrics)
+        
+        return self.write(write)
+    
+    def get_latest_media_metrics(self, days: int,
+                                 max_age_hours: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Lire le dernier instantané de métriques d'une période (classement des médias)
+        
+        Args:
+            days: Durée de la période (jours), parmi METRICS_PERIODS
+            max_age_hours: Ancienneté maximale de l'instantané (défaut: METRICS_MAX_AGE_HOURS)
+            
+        Returns:
+            Médias actifs triés par engagement (mêmes clés que get_media_ranking_with_twitter,
+            plus les scores, 'details' et 'created_at'), ou None si aucun instantané récent
+            ne couvre la période courante (instantané d'avant minuit: calcul direct)
+        """
+        if max_age_hours is None:
+            max_age_hours = self.METRICS_MAX_AGE_HOURS
+        oldest = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT MAX(created_at) as created_at
+                FROM media_metrics
+                WHERE periode_jours = ? AND periode_debut = ?
+            """, (days, self.period_first_day(days)))
+            created_at = cursor.fetchone()['created_at']
+            
+            if created_at is None or created_at < oldest:
+                return None
+            
+            columns = ', '.join(f"mm.{col}" for col in self.METRICS_COLUMNS)
+            cursor.execute(f"""
+                SELECT m.id, m.nom, m.url, {columns}, mm.details, mm.created_at
+                FROM media_metrics mm
+                JOIN medias m ON m.id = mm.media_id
+                WHERE mm.periode_jours = ? AND mm.created_at = ? AND m.actif = 1
+                ORDER BY mm.engagement_total DESC, mm.total_articles DESC
+            """, (days, created_at))
+            
+            results = []
+            for row in cursor.fetchall():
+                metrics = dict(row)
+                metrics['details'] = json.loads(row['details']) if row['details'] else None
+                results.append(metrics)
+            return results
+        
+        finally:
+            conn.close()
+    
     # ==================== STATISTIQUES ====================
     
     def get_scraping_stats(self) -> dict:
@@ -1327,6 +2344,36 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def get_classification_training_set(self, methodes: Tuple[str, ...] = ('mistral_ollama',),
+                                        min_confidence: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Récupère les articles classifiés servant à entraîner le modèle local
+        
+        Args:
+            methodes: Méthodes de classification retenues (les étiquettes du LLM par défaut,
+                jamais celles du modèle local lui-même)
+            min_confidence: Confiance minimale des classifications retenues
+        
+        Returns:
+            Liste de dictionnaires (titre, contenu, categorie, confiance)
+        """
+        conn = self.get_connection()
+        
+        try:
+            placeholders = ','.join('?' * len(methodes))
+            rows = conn.execute(f"""
+                SELECT a.titre, a.contenu, c.categorie, c.confiance
+                FROM classifications c
+                JOIN articles a ON a.id = c.article_id
+                WHERE c.methode IN ({placeholders}) AND c.confiance >= ?
+                ORDER BY c.article_id
+            """, (*methodes, min_confidence)).fetchall()
+            
+            return [dict(row) for row in rows]
+        
+        finally:
+            conn.close()
+    
     def get_article(self, article_id: int) -> Optional[Dict[str, Any]]:
         """
         Récupère un article par son ID
@@ -1443,10 +2490,9 @@ class DatabaseManager:
                                            days: int = 7, fb_posts: int = 10, 
                                            tweets: int = 10) -> Dict[str, Any]:
         """Créer ou mettre à jour la configuration de l'automatisation"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             # Calculer next_run basé sur la fréquence
             now = datetime.now()
             if frequency == 'hourly':
@@ -1479,8 +2525,6 @@ class DatabaseManager:
                 """, (enabled, frequency, days, fb_posts, tweets, next_run.isoformat()))
                 schedule_id = cursor.lastrowid
             
-            conn.commit()
-            
             # Retourner la config mise à jour
             cursor.execute("SELECT * FROM scraping_schedule WHERE id = ?", (schedule_id,))
             row = cursor.fetchone()
@@ -1498,24 +2542,20 @@ class DatabaseManager:
                 'updated_at': row['updated_at']
             }
         
-        finally:
-            conn.close()
+        return self.write(write)
     
     def delete_scraping_schedule(self):
         """Supprimer la configuration de l'automatisation"""
-        conn = self.get_connection()
-        try:
+        def write(conn: sqlite3.Connection):
             conn.execute("DELETE FROM scraping_schedule")
-            conn.commit()
-        finally:
-            conn.close()
+        
+        return self.write(write)
     
     def update_schedule_last_run(self):
         """Mettre à jour last_run et calculer next_run"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("SELECT * FROM scraping_schedule LIMIT 1")
             schedule = cursor.fetchone()
             
@@ -1537,37 +2577,31 @@ class DatabaseManager:
                     SET last_run = ?, next_run = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 """, (now.isoformat(), next_run.isoformat(), schedule['id']))
-                conn.commit()
         
-        finally:
-            conn.close()
+        return self.write(write)
     
     # ==================== SCRAPING TASKS ====================
     
     def create_scraping_task(self, task_type: str, parameters: Dict[str, Any] = None) -> int:
         """Créer une nouvelle tâche de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT INTO scraping_tasks (type, status, parameters)
                 VALUES (?, 'running', ?)
             """, (task_type, json.dumps(parameters) if parameters else None))
-            conn.commit()
             return cursor.lastrowid
         
-        finally:
-            conn.close()
+        return self.write(write)
     
     def update_scraping_task(self, task_id: int, status: str, 
                             total_articles: int = 0, total_fb_posts: int = 0, 
                             total_tweets: int = 0, error_message: str = None):
         """Mettre à jour une tâche de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        def write(conn: sqlite3.Connection):
+            cursor = conn.cursor()
+            
             completed_at = datetime.now().isoformat() if status in ['completed', 'failed'] else None
             
             cursor.execute("""
@@ -1577,24 +2611,47 @@ class DatabaseManager:
                 WHERE id = ?
             """, (status, completed_at, total_articles, total_fb_posts, total_tweets, 
                   error_message, task_id))
-            conn.commit()
         
-        finally:
-            conn.close()
+        return self.write(write)
     
-    def get_scraping_tasks(self, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
-        """Récupérer l'historique des tâches de scraping"""
+    def get_scraping_tasks(self, limit: int = 10, offset: int = 0,
+                           cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Récupérer l'historique des tâches de scraping, des plus récentes aux plus anciennes
+        
+        Args:
+            limit: Nombre de tâches par page (au moins 1)
+            offset: Tâches à sauter (ancienne pagination, ignoré si cursor est fourni)
+            cursor: Curseur 'next' de la page précédente (pagination par clé)
+            
+        Returns:
+            Dictionnaire {tasks, total, next}
+            
+        Raises:
+            ValueError: Curseur invalide
+        """
+        limit = max(1, limit)
         conn = self.get_connection()
-        cursor = conn.cursor()
+        cursor_db = conn.cursor()
         
         try:
             # Récupérer les tâches
-            cursor.execute("""
-                SELECT * FROM scraping_tasks 
-                ORDER BY started_at DESC 
-                LIMIT ? OFFSET ?
-            """, (limit, offset))
-            rows = cursor.fetchall()
+            if offset and not cursor:
+                cursor_db.execute("""
+                    SELECT * FROM scraping_tasks 
+                    ORDER BY started_at DESC, id DESC
+                    LIMIT ? OFFSET ?
+                """, (limit + 1, offset))
+                rows = cursor_db.fetchall()
+                next_cursor = (encode_cursor([rows[limit - 1]['started_at'], rows[limit - 1]['id']])
+                               if len(rows) > limit else None)
+                rows = rows[:limit]
+            else:
+                page = fetch_keyset_page(conn, """
+                    SELECT * FROM scraping_tasks
+                    WHERE {keyset}
+                """, [], cursor, limit, sort_column='started_at')
+                rows, next_cursor = page['rows'], page['next']
             
             tasks = []
             for row in rows:
@@ -1611,12 +2668,13 @@ class DatabaseManager:
                 })
             
             # Compter le total
-            cursor.execute("SELECT COUNT(*) as total FROM scraping_tasks")
-            total = cursor.fetchone()['total']
+            cursor_db.execute("SELECT COUNT(*) as total FROM scraping_tasks")
+            total = cursor_db.fetchone()['total']
             
             return {
                 'tasks': tasks,
-                'total': total
+                'total': total,
+                'next': next_cursor
             }
         
         finally:
@@ -1626,9 +2684,8 @@ class DatabaseManager:
     
     def vacuum(self):
         """Optimise la base de données"""
-        conn = self.get_connection()
-        try:
+        def write(conn: sqlite3.Connection):
             conn.execute("VACUUM")
-            conn.commit()
-        finally:
-            conn.close()
+        
+        # VACUUM est impossible dans une transaction: exécuté seul par l'écrivain
+        return self.write(write, transaction=False)
@@ -0,0 +1,114 @@
+"""
+Pagination par curseur (keyset)
+Le curseur encode les clés de tri du dernier élément d'une page: la page
+suivante reprend après ces clés au lieu de sauter N lignes (OFFSET)
+"""
+
+import base64
+import binascii
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encoder les clés de tri du dernier élément d'une page
+
+    Args:
+        values: Clés de tri (valeurs JSON)
+
+    Returns:
+        Curseur opaque utilisable dans une URL
+    """
+    data = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """
+    Décoder un curseur produit par encode_cursor
+
+    Args:
+        cursor: Curseur reçu du client (None ou vide: première page)
+        size: Nombre de clés attendu
+
+    Returns:
+        Liste des clés de tri, ou None pour la première page
+
+    Raises:
+        ValueError: Curseur invalide
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Curseur invalide")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Curseur invalide")
+    return values
+
+
+def fetch_keyset_page(conn: sqlite3.Connection, query: str, params: Sequence[Any],
+                      cursor: Optional[str], limit: int, sort_column: str = 'date_publication',
+                      id_column: str = 'id') -> Dict[str, Any]:
+    """
+    Lire une page triée par (sort_column DESC, id DESC) à partir d'un curseur
+
+    Chaque page est une lecture d'index à partir de la position du curseur:
+    une page profonde coûte autant que la première. Les lignes sans valeur
+    de tri (NULL) viennent après toutes les autres, par id décroissant.
+
+    Args:
+        conn: Connexion ouverte
+        query: SELECT ... WHERE ... terminé par le marqueur {keyset} (après les filtres),
+            sans ORDER BY ni LIMIT
+        params: Paramètres des filtres de la requête
+        cursor: Curseur 'next' de la page précédente (None: première page)
+        limit: Nombre de lignes par page (au moins 1)
+        sort_column: Colonne de tri principale (aussi lue dans les lignes)
+        id_column: Colonne unique départageant les égalités
+
+    Returns:
+        Dictionnaire {rows, next}: next est None sur la dernière page
+
+    Raises:
+        ValueError: Curseur invalide
+    """
+    after = decode_cursor(cursor, 2)
+    limit = max(1, limit)
+    params = list(params)
+    rows: List[sqlite3.Row] = []
+
+    if after is None or after[0] is not None:
+        keyset = f"{sort_column} IS NOT NULL"
+        keyset_params: List[Any] = []
+        if after:
+            keyset += f" AND ({sort_column}, {id_column}) < (?, ?)"
+            keyset_params = after
+        rows = conn.execute(
+            query.format(keyset=keyset) + f" ORDER BY {sort_column} DESC, {id_column} DESC LIMIT ?",
+            params + keyset_params + [limit + 1]
+        ).fetchall()
+
+    if len(rows) <= limit:
+        # Lignes sans valeur de tri, après toutes les lignes datées
+        keyset = f"{sort_column} IS NULL"
+        keyset_params = []
+        if after and after[0] is None:
+            keyset += f" AND {id_column} < ?"
+            keyset_params = [after[1]]
+        rows += conn.execute(
+            query.format(keyset=keyset) + f" ORDER BY {id_column} DESC LIMIT ?",
+            params + keyset_params + [limit + 1 - len(rows)]
+        ).fetchall()
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and page:
+        next_cursor = encode_cursor([page[-1][sort_column], page[-1][id_column]])
+    return {'rows': page, 'next': next_cursor}
@@ -61,7 +61,7 @@ CREATE TABLE IF NOT EXISTS classifications (
     confiance REAL NOT NULL,  -- Score de confiance (0-1)
     mots_cles TEXT,  -- JSON array des mots-clés
     justification TEXT,  -- Explication de la classification
-    methode TEXT,  -- mistral_ollama, keywords_fallback
+    methode TEXT,  -- mistral_ollama, local_model, keywords_fallback
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
@@ -152,6 +152,10 @@ CREATE TABLE IF NOT EXISTS media_metrics (
     score_engagement REAL DEFAULT 0,  -- Basé sur interactions sociales
     score_influence REAL DEFAULT 0,  -- Score composite final
     
+    -- Instantané matérialisé en fin de scraping (1, 7 ou 30 jours)
+    periode_jours INTEGER,
+    details TEXT,  -- JSON: audience par plateforme (web, facebook, twitter)
+    
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     FOREIGN KEY (media_id) REFERENCES medias(id) ON DELETE CASCADE
@@ -160,6 +164,7 @@ CREATE TABLE IF NOT EXISTS media_metrics (
 -- Index pour améliorer les performances
 CREATE INDEX IF NOT EXISTS idx_articles_media ON articles(media_id);
 CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date_publication);
+CREATE INDEX IF NOT EXISTS idx_articles_media_date ON articles(media_id, date_publication);  -- Pagination par (date, id)
 CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
 CREATE INDEX IF NOT EXISTS idx_articles_scraped ON articles(scraped_at);
 CREATE INDEX IF NOT EXISTS idx_medias_url ON medias(url);
@@ -171,8 +176,10 @@ CREATE INDEX IF NOT EXISTS idx_entites_article ON entites(article_id);
 CREATE INDEX IF NOT EXISTS idx_entites_type ON entites(type);
 CREATE INDEX IF NOT EXISTS idx_facebook_posts_media ON facebook_posts(media_id);
 CREATE INDEX IF NOT EXISTS idx_facebook_posts_date ON facebook_posts(date_publication);
+CREATE INDEX IF NOT EXISTS idx_facebook_posts_media_date ON facebook_posts(media_id, date_publication);
 CREATE INDEX IF NOT EXISTS idx_twitter_tweets_media ON twitter_tweets(media_id);
 CREATE INDEX IF NOT EXISTS idx_twitter_tweets_date ON twitter_tweets(date_publication);
+CREATE INDEX IF NOT EXISTS idx_twitter_tweets_media_date ON twitter_tweets(media_id, date_publication);
 CREATE INDEX IF NOT EXISTS idx_media_metrics_media ON media_metrics(media_id);
 CREATE INDEX IF NOT EXISTS idx_media_metrics_periode ON media_metrics(periode_debut, periode_fin);
 
@@ -264,3 +271,295 @@ CREATE TABLE IF NOT EXISTS scraping_tasks (
 CREATE INDEX IF NOT EXISTS idx_scraping_tasks_status ON scraping_tasks(status);
 CREATE INDEX IF NOT EXISTS idx_scraping_tasks_type ON scraping_tasks(type);
 CREATE INDEX IF NOT EXISTS idx_scraping_tasks_started ON scraping_tasks(started_at DESC);
+
+-- ==================== TABLE: CRAWL_STATE ====================
+-- État de collecte par média (flux découvert, validateurs HTTP du flux RSS)
+CREATE TABLE IF NOT EXISTS crawl_state (
+    media_id INTEGER PRIMARY KEY,
+    feed_url TEXT,
+    feed_type TEXT,  -- rss20, atom10, ... ou 'none' si le site n'a pas de flux
+    feed_failures INTEGER DEFAULT 0,  -- Échecs consécutifs du flux enregistré
+    checked_at TIMESTAMP,  -- Dernière découverte complète du flux
+    etag TEXT,
+    last_modified TEXT,
+    feed_hash TEXT,  -- SHA-256 du contenu du flux
+    links_hash TEXT,  -- Empreinte des liens d'articles de la page d'accueil (sites HTML)
+    links TEXT,  -- JSON des liens d'articles de la page d'accueil déjà traités
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (media_id) REFERENCES medias(id) ON DELETE CASCADE
+);
+
+-- ==================== TABLE: EXTRACTION_PROFILES ====================
+-- Règles d'extraction gagnantes par domaine (sélecteur ou règle par champ)
+CREATE TABLE IF NOT EXISTS extraction_profiles (
+    domain TEXT NOT NULL,
+    field TEXT NOT NULL,  -- titre, date_publication, contenu, auteur, image_url, contenu_rss
+    selector TEXT NOT NULL,  -- Sélecteur CSS ou règle ('url', 'article p')
+    hits INTEGER DEFAULT 0,  -- Pages où la règle a produit le champ
+    misses INTEGER DEFAULT 0,  -- Pages où la règle préférée a échoué
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (domain, field, selector)
+);
+
+-- ==================== RECHERCHE PLEIN TEXTE (FTS5) ====================
+-- Index à contenu externe (le texte n'est pas dupliqué), synchronisés par triggers.
+-- unicode61 remove_diacritics 2: "securite" trouve "sécurité", "Élections" trouve "elections"
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    titre, contenu,
+    content='articles', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, titre, contenu) VALUES (new.id, new.titre, new.contenu);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, titre, contenu)
+    VALUES ('delete', old.id, old.titre, old.contenu);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF titre, contenu ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, titre, contenu)
+    VALUES ('delete', old.id, old.titre, old.contenu);
+    INSERT INTO articles_fts(rowid, titre, contenu) VALUES (new.id, new.titre, new.contenu);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS facebook_posts_fts USING fts5(
+    message,
+    content='facebook_posts', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS facebook_posts_fts_insert AFTER INSERT ON facebook_posts BEGIN
+    INSERT INTO facebook_posts_fts(rowid, message) VALUES (new.id, new.message);
+END;
+
+CREATE TRIGGER IF NOT EXISTS facebook_posts_fts_delete AFTER DELETE ON facebook_posts BEGIN
+    INSERT INTO facebook_posts_fts(facebook_posts_fts, rowid, message)
+    VALUES ('delete', old.id, old.message);
+END;
+
+CREATE TRIGGER IF NOT EXISTS facebook_posts_fts_update AFTER UPDATE OF message ON facebook_posts BEGIN
+    INSERT INTO facebook_posts_fts(facebook_posts_fts, rowid, message)
+    VALUES ('delete', old.id, old.message);
+    INSERT INTO facebook_posts_fts(rowid, message) VALUES (new.id, new.message);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS twitter_tweets_fts USING fts5(
+    text,
+    content='twitter_tweets', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS twitter_tweets_fts_insert AFTER INSERT ON twitter_tweets BEGIN
+    INSERT INTO twitter_tweets_fts(rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS twitter_tweets_fts_delete AFTER DELETE ON twitter_tweets BEGIN
+    INSERT INTO twitter_tweets_fts(twitter_tweets_fts, rowid, text)
+    VALUES ('delete', old.id, old.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS twitter_tweets_fts_update AFTER UPDATE OF text ON twitter_tweets BEGIN
+    INSERT INTO twitter_tweets_fts(twitter_tweets_fts, rowid, text)
+    VALUES ('delete', old.id, old.text);
+    INSERT INTO twitter_tweets_fts(rowid, text) VALUES (new.id, new.text);
+END;
+
+-- ==================== TABLE: DAILY_MEDIA_STATS ====================
+-- Agrégats quotidiens par média et par plateforme, tenus à jour par les triggers
+-- ci-dessous: les tableaux de bord lisent O(médias × jours) lignes au lieu des contenus
+CREATE TABLE IF NOT EXISTS daily_media_stats (
+    media_id INTEGER NOT NULL,
+    plateforme TEXT NOT NULL,  -- web, facebook, twitter
+    jour DATE NOT NULL,  -- substr(date_publication, 1, 10)
+    publications INTEGER DEFAULT 0,
+    likes INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,  -- Facebook
+    shares INTEGER DEFAULT 0,  -- Facebook
+    retweets INTEGER DEFAULT 0,  -- Twitter
+    replies INTEGER DEFAULT 0,  -- Twitter
+    quotes INTEGER DEFAULT 0,  -- Twitter
+    impressions INTEGER DEFAULT 0,  -- Twitter
+    engagement_total INTEGER DEFAULT 0,
+    premiere_publication TIMESTAMP,
+    derniere_publication TIMESTAMP,
+    
+    PRIMARY KEY (media_id, plateforme, jour)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_media_stats_jour ON daily_media_stats(plateforme, jour);
+
+-- Chaque écriture recalcule uniquement le jour concerné (lecture de l'index media_id, date_publication);
+-- les INSERT listent les valeurs dans l'ordre des colonnes de daily_media_stats
+CREATE TRIGGER IF NOT EXISTS articles_daily_insert AFTER INSERT ON articles
+WHEN new.date_publication IS NOT NULL BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = new.media_id AND plateforme = 'web' AND jour = substr(new.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'web', substr(new.date_publication, 1, 10), COUNT(*), 0, 0, 0, 0, 0, 0, 0, 0,
+           MIN(date_publication), MAX(date_publication)
+    FROM articles
+    WHERE media_id = new.media_id
+      AND date_publication >= substr(new.date_publication, 1, 10)
+      AND date_publication < date(substr(new.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_daily_update AFTER UPDATE OF media_id, date_publication ON articles BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = old.media_id AND plateforme = 'web' AND jour = substr(old.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'web', substr(old.date_publication, 1, 10), COUNT(*), 0, 0, 0, 0, 0, 0, 0, 0,
+           MIN(date_publication), MAX(date_publication)
+    FROM articles
+    WHERE media_id = old.media_id
+      AND date_publication >= substr(old.date_publication, 1, 10)
+      AND date_publication < date(substr(old.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+    DELETE FROM daily_media_stats
+    WHERE media_id = new.media_id AND plateforme = 'web' AND jour = substr(new.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'web', substr(new.date_publication, 1, 10), COUNT(*), 0, 0, 0, 0, 0, 0, 0, 0,
+           MIN(date_publication), MAX(date_publication)
+    FROM articles
+    WHERE media_id = new.media_id
+      AND date_publication >= substr(new.date_publication, 1, 10)
+      AND date_publication < date(substr(new.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_daily_delete AFTER DELETE ON articles
+WHEN old.date_publication IS NOT NULL BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = old.media_id AND plateforme = 'web' AND jour = substr(old.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'web', substr(old.date_publication, 1, 10), COUNT(*), 0, 0, 0, 0, 0, 0, 0, 0,
+           MIN(date_publication), MAX(date_publication)
+    FROM articles
+    WHERE media_id = old.media_id
+      AND date_publication >= substr(old.date_publication, 1, 10)
+      AND date_publication < date(substr(old.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS facebook_posts_daily_insert AFTER INSERT ON facebook_posts
+WHEN new.date_publication IS NOT NULL BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = new.media_id AND plateforme = 'facebook' AND jour = substr(new.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'facebook', substr(new.date_publication, 1, 10), COUNT(*), SUM(likes), SUM(comments), SUM(shares), 0, 0, 0, 0, SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM facebook_posts
+    WHERE media_id = new.media_id
+      AND date_publication >= substr(new.date_publication, 1, 10)
+      AND date_publication < date(substr(new.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS facebook_posts_daily_update AFTER UPDATE OF media_id, date_publication, likes, comments, shares, engagement_total ON facebook_posts BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = old.media_id AND plateforme = 'facebook' AND jour = substr(old.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'facebook', substr(old.date_publication, 1, 10), COUNT(*), SUM(likes), SUM(comments), SUM(shares), 0, 0, 0, 0, SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM facebook_posts
+    WHERE media_id = old.media_id
+      AND date_publication >= substr(old.date_publication, 1, 10)
+      AND date_publication < date(substr(old.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+    DELETE FROM daily_media_stats
+    WHERE media_id = new.media_id AND plateforme = 'facebook' AND jour = substr(new.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'facebook', substr(new.date_publication, 1, 10), COUNT(*), SUM(likes), SUM(comments), SUM(shares), 0, 0, 0, 0, SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM facebook_posts
+    WHERE media_id = new.media_id
+      AND date_publication >= substr(new.date_publication, 1, 10)
+      AND date_publication < date(substr(new.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS facebook_posts_daily_delete AFTER DELETE ON facebook_posts
+WHEN old.date_publication IS NOT NULL BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = old.media_id AND plateforme = 'facebook' AND jour = substr(old.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'facebook', substr(old.date_publication, 1, 10), COUNT(*), SUM(likes), SUM(comments), SUM(shares), 0, 0, 0, 0, SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM facebook_posts
+    WHERE media_id = old.media_id
+      AND date_publication >= substr(old.date_publication, 1, 10)
+      AND date_publication < date(substr(old.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS twitter_tweets_daily_insert AFTER INSERT ON twitter_tweets
+WHEN new.date_publication IS NOT NULL BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = new.media_id AND plateforme = 'twitter' AND jour = substr(new.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'twitter', substr(new.date_publication, 1, 10), COUNT(*), SUM(likes), 0, 0, SUM(retweets), SUM(replies), SUM(quotes), SUM(impressions), SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM twitter_tweets
+    WHERE media_id = new.media_id
+      AND date_publication >= substr(new.date_publication, 1, 10)
+      AND date_publication < date(substr(new.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS twitter_tweets_daily_update AFTER UPDATE OF media_id, date_publication, retweets, replies, likes, quotes, impressions, engagement_total ON twitter_tweets BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = old.media_id AND plateforme = 'twitter' AND jour = substr(old.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'twitter', substr(old.date_publication, 1, 10), COUNT(*), SUM(likes), 0, 0, SUM(retweets), SUM(replies), SUM(quotes), SUM(impressions), SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM twitter_tweets
+    WHERE media_id = old.media_id
+      AND date_publication >= substr(old.date_publication, 1, 10)
+      AND date_publication < date(substr(old.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+    DELETE FROM daily_media_stats
+    WHERE media_id = new.media_id AND plateforme = 'twitter' AND jour = substr(new.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'twitter', substr(new.date_publication, 1, 10), COUNT(*), SUM(likes), 0, 0, SUM(retweets), SUM(replies), SUM(quotes), SUM(impressions), SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM twitter_tweets
+    WHERE media_id = new.media_id
+      AND date_publication >= substr(new.date_publication, 1, 10)
+      AND date_publication < date(substr(new.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS twitter_tweets_daily_delete AFTER DELETE ON twitter_tweets
+WHEN old.date_publication IS NOT NULL BEGIN
+    DELETE FROM daily_media_stats
+    WHERE media_id = old.media_id AND plateforme = 'twitter' AND jour = substr(old.date_publication, 1, 10);
+    INSERT INTO daily_media_stats
+    SELECT media_id, 'twitter', substr(old.date_publication, 1, 10), COUNT(*), SUM(likes), 0, 0, SUM(retweets), SUM(replies), SUM(quotes), SUM(impressions), SUM(engagement_total),
+           MIN(date_publication), MAX(date_publication)
+    FROM twitter_tweets
+    WHERE media_id = old.media_id
+      AND date_publication >= substr(old.date_publication, 1, 10)
+      AND date_publication < date(substr(old.date_publication, 1, 10), '+1 day')
+    GROUP BY media_id;
+END;
+
+-- ==================== TABLE: LLM_CACHE ====================
+-- Résultats analysés des appels LLM (classification, modération), réutilisés
+-- pour un même texte, une même version de prompt et un même modèle
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,  -- SHA-256 (tâche, version du prompt, modèle, texte normalisé)
+    tache TEXT NOT NULL,  -- 'classification', 'moderation'
+    modele TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    resultat TEXT NOT NULL,  -- JSON retourné par le modèle, déjà analysé
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))  -- ms: ordre LRU
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at);
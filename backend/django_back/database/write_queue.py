@@ -0,0 +1,201 @@
+"""
+File d'écriture SQLite à écrivain unique
+Toutes les écritures d'un processus passent par un thread dédié qui les
+regroupe en transactions (group commit): plus de "database is locked"
+entre threads, et un seul fsync pour un lot d'écritures
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+# Marqueur d'arrêt du thread écrivain
+_STOP = object()
+
+
+class WriteQueue:
+    """Thread écrivain unique regroupant les écritures en transactions"""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection],
+                 flush_interval: float = 0.0, max_batch: int = 200,
+                 max_lock_retries: int = 5):
+        """
+        Initialise la file et démarre le thread écrivain
+
+        Args:
+            connect: Fonction retournant une connexion (gardée par le thread écrivain)
+            flush_interval: Délai maximal (secondes) pendant lequel un lot est complété
+                (0: regrouper les écritures déjà en attente pendant la transaction précédente)
+            max_batch: Nombre maximum d'écritures par transaction
+            max_lock_retries: Tentatives si un autre processus verrouille la base
+        """
+        self.connect = connect
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, max_batch)
+        self.max_lock_retries = max_lock_retries
+        self.stats = {'ecritures': 0, 'transactions': 0, 'erreurs': 0}
+        self._queue: queue.Queue = queue.Queue()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def in_writer_thread(self) -> bool:
+        """Indiquer si l'appelant est le thread écrivain (écriture imbriquée)"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, func: Callable[[sqlite3.Connection], Any], transaction: bool = True) -> Future:
+        """
+        Ajouter une écriture à la file
+
+        La fonction reçoit la connexion de l'écrivain et ne doit pas appeler
+        commit(): elle est exécutée dans la transaction du lot.
+
+        Args:
+            func: Fonction d'écriture (connexion) -> résultat
+            transaction: False pour une commande impossible dans une transaction
+                (VACUUM): exécutée seule, entre deux lots
+
+        Returns:
+            Future résolu avec le résultat une fois le lot validé
+        """
+        future: Future = Future()
+        if self.in_writer_thread():
+            # Écriture imbriquée: exécutée directement dans la transaction courante
+            try:
+                future.set_result(func(self._conn))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        if not self._thread.is_alive():
+            raise RuntimeError("La file d'écriture est arrêtée")
+        self._queue.put((func, future, transaction))
+        return future
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Attendre que les écritures déjà soumises soient validées
+
+        Args:
+            timeout: Attente maximale en secondes
+        """
+        if self.in_writer_thread() or not self._thread.is_alive():
+            return
+        self.submit(lambda conn: None).result(timeout)
+
+    def close(self):
+        """Valider les écritures en attente et arrêter le thread écrivain"""
+        if self._thread.is_alive() and not self.in_writer_thread():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _next_batch(self) -> Tuple[List[Tuple[Callable, Future, bool]], bool]:
+        """Lire un lot d'écritures: (écritures, arrêt demandé)"""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            # Délai écoulé (ou nul): seulement les écritures déjà en attente (group commit)
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _begin(self):
+        """Ouvrir la transaction du lot (retente si un autre processus écrit)"""
+        for attempt in range(self.max_lock_retries + 1):
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or attempt == self.max_lock_retries:
+                    raise
+                time.sleep(min(2 ** attempt * 0.1, 5))
+
+    def _write_alone(self, func: Callable, future: Future):
+        """Exécuter une écriture hors transaction (VACUUM), sans autre écriture"""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(self._conn)
+        except Exception as e:
+            self.stats['erreurs'] += 1
+            future.set_exception(e)
+        else:
+            self.stats['ecritures'] += 1
+            future.set_result(result)
+
+    def _write_batch(self, batch: List[Tuple[Callable, Future]]):
+        """Exécuter un lot dans une transaction, chaque écriture isolée par un savepoint"""
+        # Écritures annulées par l'appelant avant leur exécution
+        batch = [(func, future) for func, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        results = {}
+        try:
+            self._begin()
+            for func, future in batch:
+                self._conn.execute("SAVEPOINT ecriture")
+                try:
+                    results[future] = (func(self._conn), None)
+                    self._conn.execute("RELEASE ecriture")
+                except Exception as e:
+                    # Annuler uniquement cette écriture, le reste du lot est conservé
+                    self._conn.execute("ROLLBACK TO ecriture")
+                    self._conn.execute("RELEASE ecriture")
+                    results[future] = (None, e)
+            self._conn.execute("COMMIT")
+        except Exception as e:
+            # Échec du lot entier (BEGIN ou COMMIT impossible)
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            results = {future: (None, e) for _, future in batch}
+
+        self.stats['transactions'] += 1
+        for _, future in batch:
+            result, error = results[future]
+            if error:
+                self.stats['erreurs'] += 1
+                future.set_exception(error)
+            else:
+                self.stats['ecritures'] += 1
+                future.set_result(result)
+
+    def _run(self):
+        self._conn = self.connect()
+        # Transactions gérées explicitement (BEGIN IMMEDIATE / SAVEPOINT)
+        self._conn.isolation_level = None
+        stop = False
+
+        try:
+            while not stop:
+                batch, stop = self._next_batch()
+                # Une écriture hors transaction coupe le lot: ce qui précède est validé d'abord
+                pending = []
+                for func, future, transaction in batch:
+                    if transaction:
+                        pending.append((func, future))
+                        continue
+                    if pending:
+                        self._write_batch(pending)
+                        pending = []
+                    self._write_alone(func, future)
+                if pending:
+                    self._write_batch(pending)
+        finally:
+            self._conn.isolation_level = ''
+            self._conn.close()
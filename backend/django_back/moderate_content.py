@@ -6,6 +6,7 @@ Détecte: toxicité, fake news, discours sensibles
 import argparse
 from database.db_manager import DatabaseManager
 from analysis.content_moderator import ContentModerator
+from analysis.llm_cache import LLMCache
 
 
 def moderate_articles(db: DatabaseManager, moderator: ContentModerator, limit: int = 10):
@@ -263,7 +264,7 @@ def main():
     
     # Initialiser
     db = DatabaseManager()
-    moderator = ContentModerator()
+    moderator = ContentModerator(cache=LLMCache(db))
     
     print("🔧 Initialisation du modérateur de contenu...")
     
@@ -299,6 +300,7 @@ def main():
     print("\n" + "=" * 80)
     show_stats(db)
     
+    print(f"\n{moderator.cache.summary()}")
     print("\n✅ Modération terminée")
 
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Script pour re-parser les articles depuis le cache HTTP, sans accès réseau
+Utile après une amélioration des extracteurs (titre, date, contenu, ...)
+"""
+
+import argparse
+from collections import Counter
+
+from database.db_manager import DatabaseManager
+from scrapers.response_cache import enable_response_cache
+from scrapers.rss_scraper import RSScraper
+from scrapers.smart_html_scraper import SmartHTMLScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-parser les articles depuis le cache HTTP')
+    parser.add_argument('--media-id', type=int,
+                       help='Restreindre à un média')
+    parser.add_argument('--days', type=int,
+                       help='Restreindre aux articles scrapés depuis N jours')
+    parser.add_argument('--cache-dir', type=str, default='data/http_cache',
+                       help='Dossier du cache HTTP (défaut: data/http_cache)')
+    parser.add_argument('--db-path', type=str, default='data/media_scan.db',
+                       help='Chemin vers la base de données (défaut: data/media_scan.db)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Afficher les modifications sans les enregistrer')
+
+    args = parser.parse_args()
+
+    print("🔧 Initialisation de la base de données...")
+    db = DatabaseManager(db_path=args.db_path)
+
+    # Toutes les requêtes des scrapers sont servies par le cache
+    cache = enable_response_cache(args.cache_dir, offline=True)
+    cache_stats = cache.get_stats()
+    print(f"💾 Cache HTTP: {cache_stats['urls']} URLs, {cache_stats['size'] / 1024 / 1024:.1f} Mo")
+
+    articles = db.get_articles_for_reparse(
+        ['html_scraping', 'rss_feed'], media_id=args.media_id, days=args.days
+    )
+    print(f"📰 {len(articles)} articles à re-parser\n")
+
+    html_scrapers = {}
+    rss_scrapers = {}
+    counts = Counter()
+
+    for article in articles:
+        url = article['url']
+        media_id = article['media_id']
+        # Un scraper par média (session et extracteur réutilisés), sur l'URL du site
+        site_url = article['media_url'] or url
+
+        if article['source_type'] == 'html_scraping':
+            if media_id not in html_scrapers:
+                html_scrapers[media_id] = SmartHTMLScraper(site_url)
+            scraper = html_scrapers[media_id]
+            html = scraper.get_html(url)
+            if not html:
+                counts['absents'] += 1
+                continue
+
+            parsed = scraper.parse_article(html, url, media_id)
+            if not parsed:
+                counts['échecs'] += 1
+                continue
+
+            fields = {
+                'titre': parsed.titre,
+                'contenu': parsed.contenu,
+                'auteur': parsed.auteur,
+                'image_url': parsed.image_url,
+            }
+            # Ne pas écraser une date connue si l'extracteur n'en trouve pas
+            if parsed.date_publication:
+                fields['date_publication'] = parsed.date_publication
+        else:
+            if media_id not in rss_scrapers:
+                rss_scrapers[media_id] = RSScraper(site_url)
+            scraper = rss_scrapers[media_id]
+            contenu = scraper.scrape_article_content(url)
+            if not contenu:
+                counts['absents'] += 1
+                continue
+            fields = {'contenu': contenu}
+
+        if not args.dry_run:
+            db.update_article(article['id'], **fields)
+        counts['mis à jour'] += 1
+
+    print("\n" + "="*60)
+    print("📊 RÉSUMÉ DU RE-PARSING")
+    print("="*60)
+    print(f"✅ Articles mis à jour: {counts['mis à jour']}{' (dry-run)' if args.dry_run else ''}")
+    print(f"💾 Absents du cache: {counts['absents']}")
+    print(f"⚠️ Échecs d'extraction: {counts['échecs']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,7 +12,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from database.db_manager import DatabaseManager
+from analysis.audience_analyzer import AudienceAnalyzer
 from scrapers.scraper_manager import ScraperManager
+from scrapers.response_cache import enable_response_cache
 
 
 def main():
@@ -48,6 +50,19 @@ def main():
         help='Scraper un seul site (URL)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Nombre de sites scrapés en parallèle (défaut: 8)'
+    )
+    
+    parser.add_argument(
+        '--http-cache',
+        action='store_true',
+        help='Conserver les pages téléchargées dans data/http_cache (re-parsing)'
+    )
+    
     parser.add_argument(
         '--stats',
         action='store_true',
@@ -65,6 +80,10 @@ def main():
         print_stats(db)
         return
     
+    # Activer le cache des pages téléchargées
+    if args.http_cache:
+        enable_response_cache()
+    
     # Initialiser le gestionnaire de scraping
     manager = ScraperManager(db)
     
@@ -77,14 +96,26 @@ def main():
         # Scraper tous les sites du fichier
         stats = manager.scrape_all_sites(
             sites_file=args.sites_file,
-            days=args.days
+            days=args.days,
+            max_workers=args.workers
         )
-        
+    
+    # Instantanés de métriques servis par l'API (classement, audience globale)
+    materialize_metrics(db)
+    
+    if not args.url:
         # Afficher les stats finales
         print("\n📊 Statistiques de la base de données:")
         print_stats(db)
 
 
+def materialize_metrics(db: DatabaseManager):
+    """Enregistrer les métriques des médias pour les périodes standard (media_metrics)"""
+    saved = AudienceAnalyzer(db).materialize_media_metrics()
+    periods = ', '.join(f"{days}j" for days in saved)
+    print(f"\n📸 Métriques matérialisées ({periods}): {max(saved.values(), default=0)} médias")
+
+
 def print_stats(db: DatabaseManager):
     """Afficher les statistiques de la base de données"""
     stats = db.get_scraping_stats()
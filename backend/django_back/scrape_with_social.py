@@ -20,7 +20,11 @@ if sys.platform == 'win32':
 
 from dotenv import load_dotenv
 from database.db_manager import DatabaseManager
+from analysis.audience_analyzer import AudienceAnalyzer
 from scrapers.scraper_manager import ScraperManager
+from scrapers.crawl_engine import CrawlEngine
+from scrapers.rate_limiter import get_rate_limiter
+from scrapers.response_cache import enable_response_cache, get_response_cache
 from scrapers.facebook_scraper import FacebookScraper
 from scrapers.twitter_scraper import TwitterScraper
 
@@ -57,24 +61,8 @@ def scrape_facebook_for_media(db: DatabaseManager, fb_scraper: FacebookScraper,
             print(f"   ⚠️ Aucun post récupéré")
             return
         
-        # Sauvegarder les posts
-        saved_count = 0
-        for post in posts:
-            try:
-                db.add_facebook_post(
-                    media_id=media_id,
-                    post_id=post['post_id'],
-                    message=post['message'],
-                    url=post['url'],
-                    image_url=post.get('image_url'),
-                    date_publication=post['date_publication'],
-                    likes=post['likes'],
-                    comments=post['comments'],
-                    shares=post['shares']
-                )
-                saved_count += 1
-            except Exception:
-                continue
+        # Sauvegarder les posts en une transaction
+        saved_count = db.add_facebook_posts_bulk(media_id, posts)
         
         stats = result.get('stats', {})
         print(f"   ✅ {saved_count} posts sauvegardés")
@@ -102,26 +90,8 @@ def scrape_twitter_for_media(db: DatabaseManager, tw_scraper: TwitterScraper,
             print(f"   ⚠️ Aucun tweet récupéré")
             return
         
-        # Sauvegarder les tweets
-        saved_count = 0
-        for tweet in tweets:
-            try:
-                db.add_twitter_tweet(
-                    media_id=media_id,
-                    tweet_id=tweet['tweet_id'],
-                    text=tweet['text'],
-                    url=tweet['url'],
-                    image_url=tweet.get('image_url'),
-                    date_publication=tweet['date_publication'],
-                    retweets=tweet['retweets'],
-                    replies=tweet['replies'],
-                    likes=tweet['likes'],
-                    quotes=tweet['quotes'],
-                    impressions=tweet['impressions']
-                )
-                saved_count += 1
-            except Exception:
-                continue
+        # Sauvegarder les tweets en une transaction
+        saved_count = db.add_twitter_tweets_bulk(media_id, tweets)
         
         stats = result.get('stats', {})
         print(f"   ✅ {saved_count} tweets sauvegardés")
@@ -144,12 +114,20 @@ def main():
                        help='Ignorer le scraping Facebook')
     parser.add_argument('--skip-twitter', action='store_true',
                        help='Ignorer le scraping Twitter')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Nombre de médias scrapés en parallèle (avec --all)')
+    parser.add_argument('--per-host', type=int, default=1,
+                       help='Nombre maximum de scrapings simultanés par hôte')
+    parser.add_argument('--http-cache', action='store_true',
+                       help='Conserver les pages téléchargées dans data/http_cache (re-parsing)')
     
     args = parser.parse_args()
     
     # Initialiser
     print("🔧 Initialisation...")
     db = DatabaseManager()
+    if args.http_cache:
+        enable_response_cache()
     scraper_manager = ScraperManager(db, auto_classify=True)
     
     # Initialiser le scraper Facebook
@@ -222,17 +200,16 @@ def main():
             print("❌ Aucun média trouvé dans la table media")
             return
         
-        total_articles = 0
+        print(f"📋 {len(medias)} médias ({args.workers} en parallèle, {args.per_host} par hôte)")
         
-        for i, media in enumerate(medias, 1):
-            print(f"\n[{i}/{len(medias)}] {media.nom} ({media.url})")
-            print("-"*60)
+        def scrape_media(media) -> int:
+            """Scraper un média complet (web + Facebook + Twitter)"""
+            count = 0
             
             # Scraping web
             if media.url:
                 count, method, message = scraper_manager.scrape_site(media.url, days=args.days)
-                total_articles += count
-                print(f"   {message}")
+                print(f"   [{media.nom}] {message}")
             
             # Scraping Facebook
             if fb_scraper and media.facebook_page:
@@ -247,6 +224,31 @@ def main():
                     db, tw_scraper, media.id,
                     media.twitter_account, args.tweets
                 )
+            
+            return count
+        
+        # Scraper les médias en parallèle
+        engine = CrawlEngine(max_workers=args.workers, max_per_host=args.per_host)
+        results = engine.run(
+            medias,
+            scrape_media,
+            key=lambda media: media.url or media.nom,
+            on_done=lambda i, media, count, error: print(
+                f"❌ [{media.nom}] Erreur: {error}" if error else f"✅ [{media.nom}] terminé"
+            )
+        )
+        
+        total_articles = sum(count or 0 for count, error in results)
+        
+        if args.http_cache:
+            removed = get_response_cache().evict()
+            if removed:
+                print(f"🧹 Cache HTTP: {removed} entrées expirées supprimées")
+        
+        # Instantanés de métriques servis par l'API (classement, audience globale)
+        saved = AudienceAnalyzer(db).materialize_media_metrics()
+        periods = ', '.join(f"{days}j" for days in saved)
+        print(f"📸 Métriques matérialisées ({periods}): {max(saved.values(), default=0)} médias")
         
         # Résumé
         print("\n" + "="*60)
@@ -254,6 +256,13 @@ def main():
         print("="*60)
         print(f"✅ Total articles: {total_articles}")
         
+        rate_limits = get_rate_limiter().rates()
+        if rate_limits:
+            print(f"\n⏱️ Débit par hôte (req/s):")
+            for host, limit in rate_limits.items():
+                print(f"   • {host}: {limit['rate']} req/s "
+                      f"({limit['requests']} requêtes, {limit['throttled']} limitées)")
+        
         # Afficher le classement
         print("\n" + "="*60)
         print("🏆 CLASSEMENT DES MÉDIAS")
@@ -278,8 +287,9 @@ def main():
         
         try:
             from analysis.content_moderator import ContentModerator
+            from analysis.llm_cache import LLMCache
             
-            moderator = ContentModerator()
+            moderator = ContentModerator(cache=LLMCache(db))
             
             # Vérifier la connexion à Ollama
             if not moderator.check_ollama_status():
@@ -344,6 +354,7 @@ def main():
                 print(f"   Contenus signalés: {flagged}")
                 if analyzed > 0:
                     print(f"   Taux de signalement: {(flagged/analyzed)*100:.1f}%")
+                print(f"   {moderator.cache.summary()}")
         
         except Exception as e:
             print(f"⚠️ Erreur lors de la modération: {e}")
@@ -1,9 +1,16 @@
 """
-Module de scraping intelligent (RSS + HTML)
+Module de scraping intelligent (API WordPress + RSS + HTML)
 """
 
 from .rss_scraper import RSScraper
 from .smart_html_scraper import SmartHTMLScraper
+from .wordpress_scraper import WordPressScraper
 from .scraper_manager import ScraperManager
+from .crawl_engine import CrawlEngine
+from .rate_limiter import RateLimitedSession
+from .response_cache import ResponseCache
+from .sitemap_discovery import SitemapDiscovery
+from .pipeline import Pipeline, Stage
 
-__all__ = ['RSScraper', 'SmartHTMLScraper', 'ScraperManager']
+__all__ = ['RSScraper', 'SmartHTMLScraper', 'WordPressScraper', 'ScraperManager', 'CrawlEngine',
+           'RateLimitedSession', 'ResponseCache', 'SitemapDiscovery', 'Pipeline', 'Stage']
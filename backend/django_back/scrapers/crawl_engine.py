@@ -0,0 +1,138 @@
+"""
+Moteur de collecte concurrente multi-sites
+Plafond global de workers + plafond par hôte
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def host_of(url: str) -> str:
+    """
+    Extraire l'hôte normalisé d'une URL (sans www.)
+
+    Args:
+        url: URL complète
+
+    Returns:
+        Nom d'hôte en minuscules
+    """
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def map_ordered(func: Callable[[Any], Any], items: Sequence[Any],
+                max_workers: int = 4) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    Appliquer une fonction en parallèle en conservant l'ordre des éléments
+
+    Une erreur sur un élément n'affecte pas les autres.
+
+    Args:
+        func: Fonction à appliquer
+        items: Éléments à traiter
+        max_workers: Nombre maximum d'appels simultanés
+
+    Returns:
+        Liste de tuples (résultat, erreur) dans l'ordre des éléments
+    """
+    def call(item):
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    if max_workers <= 1 or len(items) <= 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+def mount_pool(session: requests.Session, pool_size: int):
+    """
+    Dimensionner le pool de connexions d'une session pour N requêtes parallèles
+
+    Args:
+        session: Session requests partagée par les workers
+        pool_size: Nombre de connexions gardées ouvertes par hôte
+    """
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+
+class CrawlEngine:
+    """Exécute des tâches de scraping en parallèle avec plafonds global et par hôte"""
+
+    def __init__(self, max_workers: int = 8, max_per_host: int = 1):
+        """
+        Initialise le moteur
+
+        Args:
+            max_workers: Nombre maximum de tâches simultanées (tous hôtes confondus)
+            max_per_host: Nombre maximum de tâches simultanées sur un même hôte
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+
+    def run(self, items: Sequence[Any], task: Callable[[Any], Any],
+            key: Callable[[Any], str],
+            on_done: Optional[Callable[[int, Any, Any, Optional[Exception]], None]] = None
+            ) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Exécuter une tâche pour chaque élément
+
+        Les tâches ne sont soumises que lorsque leur hôte a une place libre,
+        un worker n'est donc jamais bloqué en attente d'un hôte saturé.
+
+        Args:
+            items: Éléments à traiter (médias, URLs, ...)
+            task: Fonction appelée pour chaque élément
+            key: Fonction retournant l'URL (ou l'hôte) d'un élément
+            on_done: Callback (index, item, résultat, erreur) appelé à chaque fin de tâche
+
+        Returns:
+            Liste de tuples (résultat, erreur) dans l'ordre des éléments
+        """
+        results: List[Tuple[Any, Optional[Exception]]] = [(None, None)] * len(items)
+        pending = deque(range(len(items)))
+        hosts = [host_of(key(item)) for item in items]
+        running: Dict[Any, int] = {}
+        per_host: Dict[str, int] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Soumettre tout ce qui peut l'être sans dépasser les plafonds
+                skipped = deque()
+                while pending and len(running) < self.max_workers:
+                    index = pending.popleft()
+                    host = hosts[index]
+                    if per_host.get(host, 0) >= self.max_per_host:
+                        skipped.append(index)
+                        continue
+                    per_host[host] = per_host.get(host, 0) + 1
+                    running[executor.submit(task, items[index])] = index
+                pending.extendleft(reversed(skipped))
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    per_host[hosts[index]] -= 1
+
+                    error = future.exception()
+                    result = None if error else future.result()
+                    results[index] = (result, error)
+
+                    if on_done:
+                        on_done(index, items[index], result, error)
+
+        return results
@@ -0,0 +1,631 @@
+"""
+Moteur d'extraction d'articles en un seul parcours du document
+Parsing lxml, sélecteurs CSS simples compilés une fois, mêmes cascades
+de repli que les extracteurs BeautifulSoup historiques
+"""
+
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+from dateutil import parser as date_parser
+
+
+# ==================== SÉLECTEURS ====================
+
+# Titre (du plus spécifique au plus général)
+TITLE_SELECTORS = [
+    'article h1',
+    '.entry-title',
+    '.post-title',
+    'h1.title',
+    'h1.article-title',
+    '.article-header h1',
+    'header h1',
+    'h1',
+]
+
+# Date dans les meta tags
+DATE_META_SELECTORS = [
+    'meta[property="article:published_time"]',
+    'meta[property="og:published_time"]',
+    'meta[name="publish_date"]',
+    'meta[name="date"]',
+    'meta[itemprop="datePublished"]',
+]
+
+# Date dans les classes courantes
+DATE_SELECTORS = [
+    '.entry-date',
+    '.post-date',
+    '.published',
+    '.date',
+    'time',
+    '.article-date',
+    'span.date',
+]
+
+# Contenu de l'article
+CONTENT_SELECTORS = [
+    'article .entry-content',
+    'article .post-content',
+    'article .content',
+    '.entry-content',
+    '.post-content',
+    '.article-content',
+    'article',
+    '.content',
+]
+
+# Contenu d'un article issu d'un flux RSS
+RSS_CONTENT_SELECTORS = [
+    'article .entry-content',
+    'article .post-content',
+    '.article-content',
+    '.post-content',
+    '.entry-content',
+    'article .content',
+    '[itemprop="articleBody"]',
+    '.article-body',
+    'main article',
+]
+
+AUTHOR_SELECTORS = [
+    '.author-name',
+    '.author',
+    '.by-author',
+    'span.author',
+    'a[rel="author"]',
+]
+
+IMAGE_SELECTORS = [
+    'article img',
+    '.entry-content img',
+    '.post-thumbnail img',
+    '.featured-image img',
+]
+
+# Balises ignorées dans le texte du contenu
+EXCLUDED_TAGS = ('script', 'style', 'iframe', 'nav', 'aside')
+
+
+# ==================== SÉLECTEURS COMPILÉS ====================
+
+_COMPOUND_RE = re.compile(
+    r'(?P<tag>[a-zA-Z][a-zA-Z0-9]*)'
+    r'|\.(?P<cls>[-\w]+)'
+    r'|#(?P<id>[-\w]+)'
+    r'|\[(?P<attr>[-\w:]+)(?:="(?P<value>[^"]*)")?\]'
+)
+
+
+class _Compound:
+    """Sélecteur simple composé (tag, classes, attributs), ex: h1.title[itemprop="name"]"""
+
+    __slots__ = ('tag', 'classes', 'attrs')
+
+    def __init__(self, text: str):
+        self.tag = None
+        self.classes = set()
+        self.attrs: List[Tuple[str, Optional[str]]] = []
+
+        pos = 0
+        while pos < len(text):
+            match = _COMPOUND_RE.match(text, pos)
+            if not match:
+                raise ValueError(f"Sélecteur non supporté: {text}")
+            if match.group('tag'):
+                self.tag = match.group('tag').lower()
+            elif match.group('cls'):
+                self.classes.add(match.group('cls'))
+            elif match.group('id'):
+                self.attrs.append(('id', match.group('id')))
+            else:
+                self.attrs.append((match.group('attr'), match.group('value')))
+            pos = match.end()
+
+    def matches(self, tag: str, classes: frozenset, attrib) -> bool:
+        if self.tag and self.tag != tag:
+            return False
+        if self.classes and not self.classes <= classes:
+            return False
+        for name, value in self.attrs:
+            actual = attrib.get(name)
+            if actual is None or (value is not None and actual != value):
+                return False
+        return True
+
+    def index_key(self) -> Tuple[str, str]:
+        """Clé d'indexation: classe, sinon tag, sinon attribut"""
+        if self.classes:
+            return ('class', next(iter(self.classes)))
+        if self.tag:
+            return ('tag', self.tag)
+        if self.attrs:
+            return ('attr', self.attrs[0][0])
+        return ('any', '')
+
+
+class _Selector:
+    """Sélecteur compilé: suite de sélecteurs simples reliés par des descendants"""
+
+    __slots__ = ('text', 'parts')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = [_Compound(part) for part in text.split()]
+
+    def matches(self, node: tuple, ancestors: List[tuple]) -> bool:
+        """Tester l'élément courant et ses ancêtres (de la racine au parent)"""
+        if not self.parts[-1].matches(*node):
+            return False
+
+        # Combinateur descendant: correspondance gloutonne de droite à gauche
+        index = len(ancestors) - 1
+        for part in reversed(self.parts[:-1]):
+            while index >= 0 and not part.matches(*ancestors[index]):
+                index -= 1
+            if index < 0:
+                return False
+            index -= 1
+        return True
+
+
+class SelectorSet:
+    """
+    Ensemble de sélecteurs évalués en un seul parcours du document
+
+    Équivalent à un select_one par sélecteur: pour chacun, le premier
+    élément correspondant dans l'ordre du document.
+    """
+
+    def __init__(self, selectors: Iterable[str]):
+        """
+        Compiler les sélecteurs
+
+        Args:
+            selectors: Sélecteurs CSS simples (tag, .classe, #id, [attr], [attr="v"], descendants)
+        """
+        self.selectors: Dict[str, _Selector] = {}
+        self._index: Dict[Tuple[str, str], List[_Selector]] = {}
+
+        for text in selectors:
+            if text in self.selectors:
+                continue
+            selector = _Selector(text)
+            self.selectors[text] = selector
+            self._index.setdefault(selector.parts[-1].index_key(), []).append(selector)
+
+    def _candidates(self, tag: str, classes: frozenset, attrib) -> List[_Selector]:
+        candidates = list(self._index.get(('tag', tag), ()))
+        for cls in classes:
+            candidates.extend(self._index.get(('class', cls), ()))
+        for name in attrib.keys():
+            candidates.extend(self._index.get(('attr', name), ()))
+        candidates.extend(self._index.get(('any', ''), ()))
+        return candidates
+
+    def match_first(self, root) -> Dict[str, Any]:
+        """
+        Parcourir le document une fois et retenir le premier élément de chaque sélecteur
+
+        Args:
+            root: Racine lxml du document
+
+        Returns:
+            Dictionnaire {sélecteur: élément lxml}
+        """
+        found: Dict[str, Any] = {}
+        ancestors: List[tuple] = []
+        remaining = len(self.selectors)
+
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue  # Commentaires, instructions
+
+            if event == 'end':
+                ancestors.pop()
+                continue
+
+            attrib = element.attrib
+            class_attr = attrib.get('class')
+            node = (tag, frozenset(class_attr.split()) if class_attr else frozenset(), attrib)
+
+            for selector in self._candidates(*node):
+                if selector.text not in found and selector.matches(node, ancestors):
+                    found[selector.text] = element
+                    remaining -= 1
+
+            if not remaining:
+                break
+            ancestors.append(node)
+
+        return found
+
+
+# ==================== UTILITAIRES ====================
+
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+
+def parse_html(html: str):
+    """
+    Parser une page HTML avec lxml
+
+    Args:
+        html: Contenu HTML décodé
+
+    Returns:
+        Racine lxml du document
+    """
+    # Passer par des octets: lxml refuse les chaînes contenant une déclaration d'encodage
+    return lxml.html.document_fromstring(html.encode('utf-8', errors='replace'), parser=_HTML_PARSER)
+
+
+def element_text(element, separator: str = '', exclude: Iterable[str] = ()) -> str:
+    """
+    Texte d'un élément, équivalent à get_text(separator, strip=True) de BeautifulSoup
+
+    Args:
+        element: Élément lxml
+        separator: Séparateur entre les morceaux de texte
+        exclude: Balises dont le texte est ignoré (script, style, ...)
+
+    Returns:
+        Texte nettoyé
+    """
+    parts = []
+
+    def walk(node):
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in exclude:
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(element)
+    return separator.join(text for text in (part.strip() for part in parts) if text)
+
+
+def parse_french_date(date_text: str) -> Optional[datetime]:
+    """Parser une date en français"""
+    try:
+        # Essayer le parser automatique
+        return date_parser.parse(date_text.strip(), fuzzy=True)
+    except (ValueError, OverflowError, TypeError):
+        pass
+
+    # Patterns français courants
+    patterns = [
+        r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # DD/MM/YYYY ou DD-MM-YYYY
+        r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # YYYY/MM/DD ou YYYY-MM-DD
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, date_text)
+        if match:
+            try:
+                groups = match.groups()
+                if len(groups[0]) == 4:  # YYYY-MM-DD
+                    return datetime(int(groups[0]), int(groups[1]), int(groups[2]))
+                else:  # DD-MM-YYYY
+                    return datetime(int(groups[2]), int(groups[1]), int(groups[0]))
+            except ValueError:
+                pass
+
+    return None
+
+
+def extract_date_from_url(url: str) -> Optional[datetime]:
+    """Extraire la date depuis l'URL (structure /YYYY/MM/DD/ ou /YYYY/MM/)"""
+    match = re.search(r'/(\d{4})/(\d{2})(?:/(\d{2}))?/', url)
+    if match:
+        try:
+            year = int(match.group(1))
+            month = int(match.group(2))
+            day = int(match.group(3)) if match.group(3) else 1
+            return datetime(year, month, day)
+        except ValueError:
+            pass
+
+    return None
+
+
+# ==================== CASCADES PAR CHAMP ====================
+
+# Règles qui ne sont pas des sélecteurs
+URL_RULE = 'url'  # Date extraite de l'URL
+PARAGRAPHS_RULE = 'article p'  # Paragraphes du premier <article> (contenu RSS)
+
+# Cascades complètes, dans l'ordre historique des extracteurs
+ARTICLE_RULES = {
+    'titre': TITLE_SELECTORS + ['meta[property="og:title"]', 'title'],
+    'date_publication': DATE_META_SELECTORS + ['time[datetime]'] + DATE_SELECTORS + [URL_RULE],
+    'contenu': CONTENT_SELECTORS,
+    'auteur': ['meta[name="author"]'] + AUTHOR_SELECTORS,
+    'image_url': ['meta[property="og:image"]'] + IMAGE_SELECTORS,
+}
+
+RSS_RULES = {
+    'contenu_rss': RSS_CONTENT_SELECTORS + [PARAGRAPHS_RULE],
+}
+
+# Valeur d'un champ introuvable
+FIELD_DEFAULTS = {'contenu': ""}
+
+
+def _rule_selectors(rule: str) -> List[str]:
+    """Sélecteurs à collecter pour évaluer une règle"""
+    if rule == URL_RULE:
+        return []
+    if rule == PARAGRAPHS_RULE:
+        return ['article']
+    return [rule]
+
+
+def _rules_selector_set(rules: Dict[str, List[str]]) -> SelectorSet:
+    return SelectorSet(sel for field_rules in rules.values()
+                       for rule in field_rules for sel in _rule_selectors(rule))
+
+
+_ARTICLE_SELECTORS = _rules_selector_set(ARTICLE_RULES)
+_RSS_SELECTORS = _rules_selector_set(RSS_RULES)
+
+
+# ==================== PROFILS PAR DOMAINE ====================
+
+class ExtractionProfile:
+    """
+    Règles gagnantes d'un domaine, apprises au fil des pages
+
+    Seules les règles préférées sont essayées pour les champs qui en ont une;
+    les champs jamais trouvés sur le domaine (auteur, image souvent absents)
+    gardent leur cascade complète, dans le même parcours. Si une règle préférée
+    échoue, la cascade complète de tous les champs est utilisée et le profil
+    est mis à jour. Une page sur refresh_every passe toujours par la cascade
+    complète pour détecter un changement de gabarit.
+    """
+
+    def __init__(self, domain: str, preferred: Optional[Dict[str, str]] = None,
+                 refresh_every: int = 20):
+        """
+        Initialise le profil
+
+        Args:
+            domain: Domaine du site (sans www.)
+            preferred: Règle préférée par champ (chargée depuis la base)
+            refresh_every: Fréquence des cascades complètes de contrôle
+        """
+        self.domain = domain
+        self.preferred: Dict[str, str] = dict(preferred or {})
+        self.refresh_every = max(1, refresh_every)
+        self._pages = 0
+        self._stats: Dict[Tuple[str, str], List[int]] = {}
+        self._selector_sets: Dict[Tuple[str, ...], Tuple[Dict[str, str], SelectorSet]] = {}
+        self._lock = threading.Lock()
+
+    def preferred_rules(self, rules: Dict[str, List[str]]) -> Optional[Tuple[Dict[str, str], SelectorSet]]:
+        """
+        Règles préférées pour une page, ou None si la cascade complète doit être utilisée
+
+        Args:
+            rules: Cascade de règles par champ à extraire
+
+        Returns:
+            Tuple (règle préférée par champ, sélecteurs compilés), ou None si aucun
+            champ n'a de règle préférée. Les sélecteurs couvrent aussi la cascade
+            complète des champs sans règle préférée
+        """
+        fields = tuple(rules)
+        with self._lock:
+            self._pages += 1
+            if self._pages % self.refresh_every == 0:
+                return None
+
+            preferred = {field: self.preferred[field] for field in fields if field in self.preferred}
+            if not preferred:
+                return None
+
+            cached = self._selector_sets.get(fields)
+            if not cached or cached[0] != preferred:
+                selectors = SelectorSet(
+                    sel for field in fields
+                    for rule in ([preferred[field]] if field in preferred else rules[field])
+                    for sel in _rule_selectors(rule)
+                )
+                cached = self._selector_sets[fields] = (preferred, selectors)
+            return cached
+
+    def record_hits(self, rules: Dict[str, str]):
+        """Compter les règles ayant produit leur champ"""
+        with self._lock:
+            for field, rule in rules.items():
+                self._stats.setdefault((field, rule), [0, 0])[0] += 1
+
+    def record_miss(self, field: str, rule: str):
+        """Compter un échec de la règle préférée d'un champ"""
+        with self._lock:
+            self._stats.setdefault((field, rule), [0, 0])[1] += 1
+
+    def learn(self, winners: Dict[str, Optional[str]]):
+        """
+        Enregistrer les règles gagnantes d'une cascade complète
+
+        Args:
+            winners: Règle gagnante par champ (None si le champ est introuvable)
+        """
+        won = {field: rule for field, rule in winners.items() if rule}
+        self.record_hits(won)
+        with self._lock:
+            self.preferred.update(won)
+
+    def drain(self) -> List[Tuple[str, str, int, int]]:
+        """
+        Récupérer et remettre à zéro les compteurs à enregistrer
+
+        Returns:
+            Liste de tuples (champ, règle, hits, misses)
+        """
+        with self._lock:
+            rows = [(field, rule, hits, misses) for (field, rule), (hits, misses) in self._stats.items()]
+            self._stats = {}
+        return rows
+
+
+# ==================== EXTRACTEUR ====================
+
+class ArticleExtractor:
+    """Extraction de tous les champs d'un article en un seul parcours"""
+
+    def __init__(self, base_url: str = '', profile: Optional[ExtractionProfile] = None):
+        """
+        Initialise l'extracteur
+
+        Args:
+            base_url: URL de base pour résoudre les URLs d'images relatives
+            profile: Profil d'extraction du domaine (règles gagnantes apprises)
+        """
+        self.base_url = base_url
+        self.profile = profile
+
+    def extract(self, html: str, url: str) -> Dict[str, Any]:
+        """
+        Extraire titre, date, contenu, auteur et image d'une page d'article
+
+        Args:
+            html: Contenu HTML de la page
+            url: URL de la page (date dans l'URL en dernier recours)
+
+        Returns:
+            Dictionnaire (titre, date_publication, contenu, auteur, image_url)
+        """
+        return self._extract(parse_html(html), url, ARTICLE_RULES, _ARTICLE_SELECTORS)
+
+    def extract_content(self, html: str) -> Optional[str]:
+        """
+        Extraire uniquement le contenu (articles issus d'un flux RSS)
+
+        Args:
+            html: Contenu HTML de la page
+
+        Returns:
+            Contenu de l'article ou None
+        """
+        return self._extract(parse_html(html), '', RSS_RULES, _RSS_SELECTORS)['contenu_rss']
+
+    def _extract(self, root, url: str, rules: Dict[str, List[str]],
+                 selectors: SelectorSet) -> Dict[str, Any]:
+        """Règles préférées du profil d'abord, cascade complète en cas d'échec"""
+        preferred = self.profile.preferred_rules(rules) if self.profile else None
+
+        if preferred:
+            preferred_rules, preferred_selectors = preferred
+            found = preferred_selectors.match_first(root)
+            fields, winners = {}, {}
+
+            for field, field_rules in rules.items():
+                rule = preferred_rules.get(field)
+                if rule is None:
+                    # Champ sans règle préférée: sa cascade, sur le même parcours
+                    fields[field], winners[field] = self._cascade(field, field_rules, found, url)
+                    continue
+                value = self._apply(field, rule, found, url)
+                if not value:
+                    self.profile.record_miss(field, rule)
+                    break
+                fields[field] = value
+            else:
+                self.profile.record_hits(preferred_rules)
+                self.profile.learn(winners)
+                return fields
+
+        found = selectors.match_first(root)
+        fields, winners = {}, {}
+
+        for field, field_rules in rules.items():
+            fields[field], winners[field] = self._cascade(field, field_rules, found, url)
+
+        if self.profile:
+            self.profile.learn(winners)
+        return fields
+
+    def _cascade(self, field: str, field_rules: List[str], found: Dict[str, Any],
+                 url: str) -> Tuple[Any, Optional[str]]:
+        """Première règle de la cascade produisant le champ: (valeur, règle gagnante)"""
+        for rule in field_rules:
+            value = self._apply(field, rule, found, url)
+            if value:
+                return value, rule
+        return FIELD_DEFAULTS.get(field), None
+
+    def _apply(self, field: str, rule: str, found: Dict[str, Any], url: str) -> Any:
+        """
+        Évaluer une règle de la cascade d'un champ
+
+        Returns:
+            Valeur du champ, ou une valeur vide si la règle ne s'applique pas
+        """
+        if rule == URL_RULE:
+            return extract_date_from_url(url)
+
+        if rule == PARAGRAPHS_RULE:
+            article = found.get('article')
+            if article is None:
+                return None
+            paragraphs = (element_text(p) for p in article.iter('p'))
+            text = '\n\n'.join(p for p in paragraphs if len(p) > 20)
+            return text if len(text) > 100 else None
+
+        element = found.get(rule)
+        if element is None:
+            return None
+
+        if rule.startswith('meta['):
+            content = element.get('content')
+            if content and field == 'date_publication':
+                return _parse_date(content)
+            return content
+
+        if field == 'titre':
+            if rule == 'title':
+                return element_text(element).split('|')[0].split('-')[0].strip()
+            titre = element_text(element)
+            return titre if len(titre) > 10 else None  # Titre significatif
+
+        if field == 'date_publication':
+            if rule == 'time[datetime]':
+                return _parse_date(element.get('datetime'))
+            return parse_french_date(element_text(element))
+
+        if field == 'contenu':
+            content = element_text(element, '\n', EXCLUDED_TAGS)
+            return content[:5000] if len(content) > 100 else None  # Limiter à 5000 caractères
+
+        if field == 'contenu_rss':
+            content = element_text(element, '\n', EXCLUDED_TAGS)
+            return content if len(content) > 100 else None
+
+        if field == 'auteur':
+            author = element_text(element)
+            return author if len(author) < 100 else None
+
+        if field == 'image_url':
+            src = element.get('src')
+            return urljoin(self.base_url, src) if src else None
+
+        return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parser une date ISO/RFC (meta tags, attribut datetime)"""
+    try:
+        return date_parser.parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return None
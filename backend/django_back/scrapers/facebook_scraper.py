@@ -2,10 +2,11 @@
 Scraper Facebook utilisant l'API Graph
 """
 
-import requests
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from .rate_limiter import RateLimitedSession
+
 
 class FacebookScraper:
     """Scraper pour récupérer les posts Facebook via Graph API"""
@@ -20,7 +21,7 @@ class FacebookScraper:
         self.access_token = access_token
         self.api_version = "v18.0"
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
-        self.session = requests.Session()
+        self.session = RateLimitedSession()
     
     def test_connection(self) -> bool:
         """
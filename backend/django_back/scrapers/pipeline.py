@@ -0,0 +1,166 @@
+"""
+Pipeline de collecte par étapes (téléchargement → parsing → sauvegarde → classification)
+Files bornées entre les étapes: chaque élément avance dès qu'il est prêt,
+la mémoire reste bornée quel que soit le nombre d'articles
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Marqueur de fin de flux
+_DONE = object()
+
+
+class Stage:
+    """Étape du pipeline: une fonction appliquée par N workers"""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                 batch_size: int = 1, batch_wait: float = 0.5):
+        """
+        Initialise l'étape
+
+        Args:
+            name: Nom de l'étape (statistiques)
+            func: Fonction appliquée à chaque élément; None retire l'élément du pipeline.
+                Si batch_size > 1, reçoit une liste d'éléments et retourne la liste des résultats
+            workers: Nombre de threads de l'étape
+            batch_size: Nombre maximum d'éléments regroupés par appel (écritures groupées)
+            batch_wait: Attente maximale (secondes) pour compléter un lot
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+
+
+class Pipeline:
+    """Enchaînement d'étapes concurrentes reliées par des files bornées"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 16):
+        """
+        Initialise le pipeline
+
+        Args:
+            stages: Étapes dans l'ordre de traitement
+            queue_size: Taille maximale de chaque file (contre-pression sur l'étape précédente)
+        """
+        if not stages:
+            raise ValueError("Le pipeline doit contenir au moins une étape")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def run(self, items: Iterable[Any],
+            on_error: Optional[Callable[[str, Any, Exception], None]] = None) -> List[Any]:
+        """
+        Faire passer les éléments dans toutes les étapes
+
+        Une erreur sur un élément le retire du pipeline sans affecter les autres.
+
+        Args:
+            items: Éléments d'entrée (consommés au rythme de la première étape)
+            on_error: Callback (étape, élément, erreur) appelé pour chaque erreur
+
+        Returns:
+            Résultats non nuls de la dernière étape (ordre d'achèvement)
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List[Any] = []
+        lock = threading.Lock()
+        self.stats = {stage.name: {'entrees': 0, 'sorties': 0, 'ignores': 0, 'erreurs': 0}
+                      for stage in self.stages}
+        remaining = [stage.workers for stage in self.stages]
+
+        def emit(index: int, item: Any):
+            if index + 1 < len(self.stages):
+                queues[index + 1].put(item)
+            else:
+                with lock:
+                    results.append(item)
+
+        def next_batch(index: int) -> Tuple[List[Any], bool]:
+            """Lire un lot d'éléments: (éléments, fin du flux atteinte)"""
+            stage = self.stages[index]
+            item = queues[index].get()
+            if item is _DONE:
+                return [], True
+
+            batch = [item]
+            deadline = time.monotonic() + stage.batch_wait
+            while len(batch) < stage.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = queues[index].get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    return batch, True
+                batch.append(item)
+            return batch, False
+
+        def worker(index: int):
+            stage = self.stages[index]
+            stats = self.stats[stage.name]
+            finished = False
+
+            while not finished:
+                batch, finished = next_batch(index)
+                if not batch:
+                    break
+
+                try:
+                    if stage.batch_size > 1:
+                        outputs = [r for r in stage.func(batch) if r is not None]
+                    else:
+                        result = stage.func(batch[0])
+                        outputs = [] if result is None else [result]
+                    error = None
+                except Exception as e:
+                    outputs, error = [], e
+
+                with lock:
+                    stats['entrees'] += len(batch)
+                    if error:
+                        stats['erreurs'] += len(batch)
+                    else:
+                        stats['sorties'] += len(outputs)
+                        stats['ignores'] += len(batch) - len(outputs)
+
+                if error:
+                    if on_error:
+                        on_error(stage.name, batch if stage.batch_size > 1 else batch[0], error)
+                for output in outputs:
+                    emit(index, output)
+
+            # Le dernier worker d'une étape ferme l'étape suivante
+            with lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last and index + 1 < len(self.stages):
+                for _ in range(self.stages[index + 1].workers):
+                    queues[index + 1].put(_DONE)
+
+        threads = [
+            threading.Thread(target=worker, args=(index,), daemon=True,
+                             name=f"pipeline-{stage.name}-{n}")
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+
+        return results
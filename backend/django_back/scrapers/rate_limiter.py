@@ -0,0 +1,245 @@
+"""
+Limiteur de débit adaptatif par hôte
+Token bucket par hôte, accélération additive sur les réponses rapides,
+ralentissement multiplicatif sur les erreurs, respect de Retry-After
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+from .crawl_engine import host_of
+from .response_cache import get_response_cache
+
+
+class _HostBucket:
+    """État du token bucket d'un hôte"""
+
+    __slots__ = ('rate', 'tokens', 'updated', 'blocked_until', 'requests', 'throttled')
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+
+
+class HostRateLimiter:
+    """Token bucket par hôte dont le débit s'adapte aux réponses du serveur"""
+
+    def __init__(self, initial_rate: float = 4.0, min_rate: float = 0.25,
+                 max_rate: float = 16.0, burst: float = 4.0,
+                 slow_response: float = 3.0, increase: float = 0.25,
+                 decrease: float = 0.5, max_block: float = 300.0):
+        """
+        Initialise le limiteur
+
+        Args:
+            initial_rate: Débit initial par hôte (requêtes/seconde)
+            min_rate: Débit minimum après ralentissements
+            max_rate: Débit maximum après accélérations
+            burst: Nombre de requêtes pouvant partir sans attendre
+            slow_response: Durée (s) au-delà de laquelle une réponse est jugée lente
+            increase: Augmentation du débit après une réponse rapide
+            decrease: Facteur appliqué au débit après une erreur ou une réponse lente
+            max_block: Durée maximale (s) de blocage d'un hôte sur Retry-After
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.slow_response = slow_response
+        self.increase = increase
+        self.decrease = decrease
+        self.max_block = max_block
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _HostBucket(self.initial_rate, self.burst)
+        return bucket
+
+    def acquire(self, host: str):
+        """
+        Attendre qu'une requête vers l'hôte soit autorisée
+
+        Args:
+            host: Hôte normalisé (voir host_of)
+        """
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+
+                if now < bucket.blocked_until:
+                    delay = bucket.blocked_until - now
+                else:
+                    bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                    bucket.updated = now
+                    if bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        bucket.requests += 1
+                        return
+                    delay = (1 - bucket.tokens) / bucket.rate
+
+            time.sleep(delay)
+
+    def record(self, host: str, status: Optional[int], elapsed: float,
+               retry_after: Optional[float] = None):
+        """
+        Adapter le débit d'un hôte selon le résultat d'une requête
+
+        Args:
+            host: Hôte normalisé
+            status: Code HTTP (None si la requête a échoué)
+            elapsed: Durée de la requête en secondes
+            retry_after: Délai demandé par le serveur (Retry-After), en secondes
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+
+            if status in (429, 503):
+                bucket.throttled += 1
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                if retry_after:
+                    bucket.blocked_until = max(bucket.blocked_until,
+                                               time.monotonic() + min(retry_after, self.max_block))
+            elif status is None or status >= 500 or elapsed > self.slow_response:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def rates(self) -> Dict[str, Dict[str, float]]:
+        """
+        Débits effectifs par hôte
+
+        Returns:
+            Dictionnaire {hôte: {rate, requests, throttled}}
+        """
+        with self._lock:
+            return {
+                host: {
+                    'rate': round(bucket.rate, 2),
+                    'requests': bucket.requests,
+                    'throttled': bucket.throttled,
+                }
+                for host, bucket in sorted(self._buckets.items())
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convertir un en-tête Retry-After (secondes ou date HTTP) en secondes
+
+    Args:
+        value: Valeur de l'en-tête
+
+    Returns:
+        Délai en secondes ou None
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_default_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Limiteur partagé par tous les scrapers du processus"""
+    return _default_limiter
+
+
+class RateLimitedSession(requests.Session):
+    """
+    Session requests dont chaque requête passe par le limiteur de son hôte
+
+    Si le cache de réponses est activé (enable_response_cache), les pages
+    téléchargées y sont conservées; en mode hors ligne, les requêtes GET
+    sont servies uniquement depuis le cache.
+    """
+
+    def __init__(self, limiter: Optional[HostRateLimiter] = None,
+                 max_retries: int = 2, max_retry_wait: float = 60.0,
+                 retry_backoff: float = 1.0):
+        """
+        Initialise la session
+
+        Args:
+            limiter: Limiteur à utiliser (limiteur partagé par défaut)
+            max_retries: Nouvelles tentatives après un 429/503
+            max_retry_wait: Retry-After au-delà duquel on ne réessaie pas (s)
+            retry_backoff: Délai de base (s) avant une nouvelle tentative sans
+                Retry-After, doublé à chaque tentative (entre la moitié et
+                la totalité du délai, tirée au hasard)
+        """
+        super().__init__()
+        self.limiter = limiter or get_rate_limiter()
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.retry_backoff = retry_backoff
+
+    def request(self, method, url, *args, **kwargs):
+        """Envoyer la requête au rythme autorisé pour l'hôte, en réessayant sur 429/503"""
+        cache = get_response_cache() if method.upper() == 'GET' else None
+        cache_key = cache.cache_key(url, kwargs.get('params')) if cache else None
+
+        if cache and cache.offline:
+            response = cache.load(cache_key)
+            if response is None:
+                raise requests.ConnectionError(f"{cache_key} absent du cache (mode hors ligne)")
+            return response
+
+        host = host_of(url)
+        attempt = 0
+
+        while True:
+            self.limiter.acquire(host)
+            start = time.monotonic()
+
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException:
+                self.limiter.record(host, None, time.monotonic() - start)
+                raise
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.limiter.record(host, response.status_code, time.monotonic() - start, retry_after)
+
+            if (response.status_code not in (429, 503) or attempt >= self.max_retries
+                    or (retry_after or 0) > self.max_retry_wait):
+                if cache and cache.is_cacheable(response):
+                    # Le cache est facultatif: son échec ne fait pas échouer la requête
+                    try:
+                        cache.store(cache_key, response)
+                    except Exception as e:
+                        print(f"⚠️ Cache HTTP: {url} non enregistré ({e})")
+                return response
+
+            # Avec Retry-After, le limiteur bloque l'hôte avant la nouvelle tentative;
+            # sans, on attend un délai exponentiel avec jitter
+            response.close()
+            if not retry_after:
+                backoff = self.retry_backoff * 2 ** attempt
+                time.sleep(backoff / 2 + random.uniform(0, backoff / 2))
+            attempt += 1
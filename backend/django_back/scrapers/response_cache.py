@@ -0,0 +1,268 @@
+"""
+Cache disque des réponses HTTP (pages HTML, flux RSS)
+Index SQLite par URL, corps compressés stockés une seule fois par hash de contenu
+Permet de re-parser l'historique sans re-télécharger (mode hors ligne)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class ResponseCache:
+    """Cache des réponses HTTP adressé par URL et par hash de contenu"""
+
+    # Seules les pages et les flux sont conservés (pas le JSON des API, qui peut contenir des jetons)
+    CACHEABLE_TYPES = ('html', 'xml', 'rss', 'atom')
+
+    def __init__(self, cache_dir: str = 'data/http_cache', max_age_days: int = 90,
+                 max_size_mb: int = 2048, offline: bool = False):
+        """
+        Initialise le cache
+
+        Args:
+            cache_dir: Dossier du cache
+            max_age_days: Âge maximum d'une entrée avant éviction
+            max_size_mb: Taille totale maximale des corps compressés
+            offline: Mode hors ligne: les requêtes sont servies uniquement depuis le cache
+        """
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / 'blobs'
+        self.index_path = self.cache_dir / 'index.db'
+        self.max_age_days = max_age_days
+        self.max_size = max_size_mb * 1024 * 1024
+        self.offline = offline
+
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    status INTEGER,
+                    headers TEXT,  -- JSON
+                    size INTEGER,  -- Taille du corps compressé
+                    fetched_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_fetched ON responses(fetched_at);
+                CREATE INDEX IF NOT EXISTS idx_responses_hash ON responses(content_hash);
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.index_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.blob_dir / content_hash[:2] / f"{content_hash}.gz"
+
+    @staticmethod
+    def cache_key(url: str, params: Any = None) -> str:
+        """
+        Clé de cache d'une requête GET (URL complète avec paramètres)
+
+        Args:
+            url: URL demandée
+            params: Paramètres de requête éventuels
+
+        Returns:
+            URL normalisée par requests
+        """
+        if not params:
+            return url
+        return requests.Request('GET', url, params=params).prepare().url
+
+    def is_cacheable(self, response: requests.Response) -> bool:
+        """Indiquer si une réponse doit être conservée"""
+        if response.status_code != 200 or not response.content:
+            return False
+        content_type = response.headers.get('Content-Type', '').lower()
+        return any(t in content_type for t in self.CACHEABLE_TYPES)
+
+    def store(self, key: str, response: requests.Response):
+        """
+        Enregistrer une réponse
+
+        Args:
+            key: Clé de cache (voir cache_key)
+            response: Réponse HTTP reçue
+        """
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        path = self._blob_path(content_hash)
+
+        # Contenu déjà connu: seul l'index est mis à jour
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Fichier temporaire unique: deux threads peuvent enregistrer le même contenu
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as tmp:
+                with gzip.GzipFile(fileobj=tmp, mode='wb') as f:
+                    f.write(response.content)
+            try:
+                os.replace(tmp.name, path)
+            except OSError:
+                os.unlink(tmp.name)
+                raise
+
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO responses (url, content_hash, status, headers, size, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    status = excluded.status,
+                    headers = excluded.headers,
+                    size = excluded.size,
+                    fetched_at = excluded.fetched_at
+            """, (key, content_hash, response.status_code, json.dumps(dict(response.headers)),
+                  path.stat().st_size, time.time()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load(self, key: str) -> Optional[requests.Response]:
+        """
+        Reconstruire une réponse depuis le cache
+
+        Args:
+            key: Clé de cache (voir cache_key)
+
+        Returns:
+            Réponse requests équivalente à l'originale, ou None si absente
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM responses WHERE url = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        try:
+            with gzip.open(self._blob_path(row['content_hash']), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        response = requests.Response()
+        response.status_code = row['status']
+        response.headers = CaseInsensitiveDict(json.loads(row['headers'] or '{}'))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.url = key
+        response.reason = 'OK'
+        return response
+
+    def evict(self) -> int:
+        """
+        Supprimer les entrées trop anciennes puis les plus anciennes au-delà de la taille maximale
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        removed = 0
+        conn = self._connect()
+
+        try:
+            cursor = conn.execute("DELETE FROM responses WHERE fetched_at < ?",
+                                  (time.time() - self.max_age_days * 86400,))
+            removed += cursor.rowcount
+
+            def total_size() -> int:
+                row = conn.execute("""
+                    SELECT COALESCE(SUM(size), 0) AS total FROM (
+                        SELECT MAX(size) AS size FROM responses GROUP BY content_hash
+                    )
+                """).fetchone()
+                return row['total']
+
+            while total_size() > self.max_size:
+                cursor = conn.execute("""
+                    DELETE FROM responses WHERE url IN (
+                        SELECT url FROM responses ORDER BY fetched_at LIMIT 500
+                    )
+                """)
+                if cursor.rowcount == 0:
+                    break
+                removed += cursor.rowcount
+
+            conn.commit()
+            referenced = {row['content_hash'] for row in conn.execute(
+                "SELECT DISTINCT content_hash FROM responses")}
+        finally:
+            conn.close()
+
+        # Supprimer les corps qui ne sont plus référencés
+        for path in self.blob_dir.glob('*/*.gz'):
+            if path.stem not in referenced:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache
+
+        Returns:
+            Nombre d'URLs, de contenus distincts et taille totale (octets)
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("""
+                SELECT COUNT(*) AS urls,
+                       COUNT(DISTINCT content_hash) AS contents
+                FROM responses
+            """).fetchone()
+            size = conn.execute("""
+                SELECT COALESCE(SUM(size), 0) AS total FROM (
+                    SELECT MAX(size) AS size FROM responses GROUP BY content_hash
+                )
+            """).fetchone()['total']
+            return {'urls': row['urls'], 'contents': row['contents'], 'size': size}
+        finally:
+            conn.close()
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def enable_response_cache(cache_dir: str = 'data/http_cache', offline: bool = False,
+                          **kwargs) -> ResponseCache:
+    """
+    Activer le cache pour toutes les sessions de scraping du processus
+
+    Args:
+        cache_dir: Dossier du cache
+        offline: Servir les requêtes uniquement depuis le cache
+        **kwargs: Options de ResponseCache (max_age_days, max_size_mb)
+
+    Returns:
+        Instance du cache activé
+    """
+    global _response_cache
+    _response_cache = ResponseCache(cache_dir, offline=offline, **kwargs)
+    return _response_cache
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Cache actif, ou None s'il n'a pas été activé"""
+    return _response_cache
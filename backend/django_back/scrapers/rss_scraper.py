@@ -4,30 +4,48 @@ Scraper RSS pour récupérer les articles via les flux RSS
 Plus rapide et plus fiable que le scraping HTML pur
 """
 
+import hashlib
 import requests
 import feedparser
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
 from database.models import Article
+from .crawl_engine import map_ordered, mount_pool
+from .extraction import ArticleExtractor, ExtractionProfile
+from .rate_limiter import RateLimitedSession
 
 
 class RSScraper:
     """Scraper basé sur les flux RSS"""
     
-    def __init__(self, base_url: str, timeout: int = 30):
+    def __init__(self, base_url: str, timeout: int = 30, max_parallel: int = 6,
+                 max_feed_failures: int = 3, feed_recheck_days: int = 7,
+                 extraction_profile: Optional[ExtractionProfile] = None):
         """
         Initialise le scraper RSS
         
         Args:
             base_url: URL de base du site
             timeout: Timeout pour les requêtes HTTP
+            max_parallel: Nombre d'articles téléchargés simultanément sur ce domaine
+            max_feed_failures: Échecs consécutifs du flux enregistré avant de relancer la découverte
+            feed_recheck_days: Délai avant de rechercher à nouveau un flux sur un site qui n'en a pas
+            extraction_profile: Règles d'extraction apprises pour ce domaine
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.max_parallel = max(1, max_parallel)
+        self.max_feed_failures = max(1, max_feed_failures)
+        self.feed_recheck_days = feed_recheck_days
+        self.skipped_existing = 0  # Articles déjà en base, non téléchargés
+        self.not_modified = False  # Flux inchangé depuis la dernière collecte
+        self.feed_state: Dict[str, Any] = {}  # Validateurs du flux lu (feed_url, etag, ...)
+        self.discovery_state: Dict[str, Any] = {}  # Flux découvert (feed_url, feed_type, ...)
         self.domain = urlparse(base_url).netloc
+        self.extractor = ArticleExtractor(self.base_url, extraction_profile)
         
         # URLs RSS communes
         self.rss_urls = [
@@ -42,10 +60,11 @@ class RSScraper:
             f"{self.base_url}/spip.php?page=backend",  # Pour SPIP (lefaso.net)
         ]
         
-        self.session = requests.Session()
+        self.session = RateLimitedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        mount_pool(self.session, self.max_parallel)
     
     def find_rss_feed(self) -> Optional[str]:
         """
@@ -94,6 +113,60 @@ class RSScraper:
         print(f"   ❌ Aucun flux RSS trouvé")
         return None
     
+    def resolve_feed(self, crawl_state: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Trouver le flux RSS en réutilisant le résultat de la dernière découverte
+        
+        La découverte complète (find_rss_feed) n'est relancée que si aucun flux
+        n'est enregistré, si le flux enregistré a échoué max_feed_failures fois,
+        ou si le site n'avait pas de flux lors d'une vérification trop ancienne.
+        
+        Args:
+            crawl_state: État enregistré (DatabaseManager.get_crawl_state)
+        
+        Returns:
+            URL du flux RSS ou None
+        """
+        state = crawl_state or {}
+        failures = state.get('feed_failures') or 0
+        
+        if state.get('feed_type') == 'none' and not self._recheck_due(state.get('checked_at')):
+            print(f"   ⏭️ Aucun flux RSS connu pour ce site (vérifié le {state['checked_at']})")
+            self.discovery_state = {}
+            return None
+        
+        if state.get('feed_url') and state.get('feed_type') != 'none' and failures < self.max_feed_failures:
+            print(f"   ✅ Flux RSS connu: {state['feed_url']}")
+            self.discovery_state = {
+                'feed_url': state['feed_url'],
+                'feed_type': state.get('feed_type'),
+                'feed_failures': failures,
+            }
+            return state['feed_url']
+        
+        return self._discover_feed()
+    
+    def _discover_feed(self) -> Optional[str]:
+        """Relancer la découverte complète et préparer l'état à enregistrer"""
+        rss_url = self.find_rss_feed()
+        self.discovery_state = {
+            'feed_url': rss_url,
+            'feed_type': None if rss_url else 'none',
+            'feed_failures': 0,
+            'checked_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        return rss_url
+    
+    def _recheck_due(self, checked_at: Optional[str]) -> bool:
+        """Indiquer si un site sans flux doit être vérifié à nouveau"""
+        if not checked_at:
+            return True
+        try:
+            checked = datetime.fromisoformat(str(checked_at))
+        except ValueError:
+            return True
+        return datetime.now() - checked >= timedelta(days=self.feed_recheck_days)
+    
     def parse_rss_date(self, date_str: str) -> Optional[datetime]:
         """
         Parser une date RSS (format RFC 822 ou ISO 8601)
@@ -133,27 +206,131 @@ class RSScraper:
         
         return None
     
-    def get_articles_from_rss(self, days: int = 30, max_articles: int = 100) -> List[dict]:
+    def fetch_feed(self, rss_url: str, validators: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+        """
+        Télécharger le flux RSS avec une requête conditionnelle
+        
+        Envoie If-None-Match / If-Modified-Since si des validateurs sont connus
+        pour ce flux. Un 304 ou un contenu identique (même hash) positionne
+        self.not_modified.
+        
+        Args:
+            rss_url: URL du flux RSS
+            validators: État enregistré (feed_url, etag, last_modified, feed_hash)
+        
+        Returns:
+            Contenu brut du flux, ou None s'il est inchangé
+        """
+        self.not_modified = False
+        
+        # Les validateurs ne valent que pour l'URL de flux qui les a produits
+        if not validators or validators.get('feed_url') != rss_url:
+            validators = {}
+        
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = self.session.get(rss_url, headers=headers, timeout=self.timeout)
+        
+        if response.status_code == 304:
+            self.not_modified = True
+            self.feed_state = {key: validators.get(key)
+                               for key in ('feed_url', 'etag', 'last_modified', 'feed_hash')}
+            return None
+        
+        response.raise_for_status()
+        
+        feed_hash = hashlib.sha256(response.content).hexdigest()
+        self.feed_state = {
+            'feed_url': rss_url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'feed_hash': feed_hash,
+        }
+        
+        if feed_hash == validators.get('feed_hash'):
+            self.not_modified = True
+            return None
+        
+        return response.content
+    
+    def _read_feed(self, rss_url: str, crawl_state: Optional[Dict[str, Any]] = None):
+        """
+        Télécharger et parser le flux RSS
+        
+        Args:
+            rss_url: URL du flux RSS
+            crawl_state: État enregistré pour la requête conditionnelle
+        
+        Returns:
+            Flux parsé par feedparser, ou None s'il est inchangé
+        
+        Raises:
+            requests.RequestException: Erreur HTTP
+            ValueError: La réponse n'est pas un flux RSS/Atom
+        """
+        content = self.fetch_feed(rss_url, crawl_state)
+        if self.not_modified:
+            return None
+        
+        feed = feedparser.parse(content)
+        if not feed.get('version') and not feed.entries:
+            raise ValueError("contenu qui n'est pas un flux RSS/Atom")
+        
+        self.discovery_state['feed_url'] = rss_url
+        self.discovery_state['feed_type'] = feed.get('version') or 'rss'
+        self.discovery_state['feed_failures'] = 0
+        return feed
+    
+    def get_articles_from_rss(self, days: int = 30, max_articles: int = 100,
+                              crawl_state: Optional[Dict[str, Any]] = None) -> List[dict]:
         """
         Récupérer les articles depuis le flux RSS
         
         Args:
             days: Nombre de jours dans le passé
             max_articles: Nombre maximum d'articles
+            crawl_state: État enregistré (flux découvert et validateurs)
         
         Returns:
             Liste de dictionnaires avec les infos des articles
         """
-        # Trouver le flux RSS
-        rss_url = self.find_rss_feed()
+        self.not_modified = False
+        self.feed_state = {}
+        
+        # Trouver le flux RSS (flux enregistré en priorité)
+        rss_url = self.resolve_feed(crawl_state)
         if not rss_url:
             return []
         
         print(f"   📡 Lecture du flux RSS...")
         
         try:
-            # Parser le flux RSS
-            feed = feedparser.parse(rss_url)
+            try:
+                feed = self._read_feed(rss_url, crawl_state)
+            except (requests.RequestException, ValueError) as e:
+                # Flux tout juste découvert: erreur normale
+                if 'checked_at' in self.discovery_state:
+                    raise
+                
+                # Flux enregistré en échec: compter l'échec, relancer la découverte au seuil
+                self.discovery_state['feed_failures'] += 1
+                print(f"   ⚠️ Flux RSS enregistré en échec "
+                      f"({self.discovery_state['feed_failures']}/{self.max_feed_failures}): {e}")
+                if self.discovery_state['feed_failures'] < self.max_feed_failures:
+                    return []
+                
+                rss_url = self._discover_feed()
+                if not rss_url:
+                    return []
+                feed = self._read_feed(rss_url, crawl_state)
+            
+            if self.not_modified:
+                print(f"   ✅ Flux RSS inchangé depuis la dernière collecte")
+                return []
             
             if not feed.entries:
                 print(f"   ⚠️ Aucune entrée dans le flux RSS")
@@ -252,50 +429,122 @@ class RSScraper:
         Returns:
             Contenu de l'article ou None
         """
+        html = self.get_article_html(url)
+        if not html:
+            return None
+        
+        # Cascade de sélecteurs en un seul parcours (voir extraction.py)
+        return self.extractor.extract_content(html)
+    
+    def get_article_html(self, url: str) -> Optional[str]:
+        """
+        Télécharger la page complète d'un article
+        
+        Args:
+            url: URL de l'article
+        
+        Returns:
+            HTML décodé ou None si la page est inaccessible
+        """
         try:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Sélecteurs pour le contenu principal
-            content_selectors = [
-                'article .entry-content',
-                'article .post-content',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                'article .content',
-                '[itemprop="articleBody"]',
-                '.article-body',
-                'main article',
-            ]
-            
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Nettoyer le contenu
-                    for tag in content_elem.find_all(['script', 'style', 'iframe', 'nav', 'aside']):
-                        tag.decompose()
-                    
-                    text = content_elem.get_text(separator='\n', strip=True)
-                    if len(text) > 100:  # Au moins 100 caractères
-                        return text
-            
-            # Fallback: chercher tous les paragraphes dans article
-            article_elem = soup.find('article')
-            if article_elem:
-                paragraphs = article_elem.find_all('p')
-                text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20])
-                if len(text) > 100:
-                    return text
-            
+            return response.text
+        
+        except Exception:
             return None
+    
+    def find_entries(self, days: int = 30, max_articles: int = 100,
+                     existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+                     crawl_state: Optional[Dict[str, Any]] = None) -> List[dict]:
+        """
+        Lire le flux et retenir les entrées dont l'article n'est pas encore en base
         
-        except Exception as e:
+        Args:
+            days: Nombre de jours dans le passé
+            max_articles: Nombre maximum d'articles
+            existing_urls: Fonction retournant les URLs déjà en base parmi une liste
+                (ex: DatabaseManager.get_existing_article_urls); ces articles ne sont pas téléchargés
+            crawl_state: État enregistré du média (DatabaseManager.get_crawl_state):
+                flux découvert et validateurs; si le flux est inchangé,
+                self.not_modified est positionné et aucune entrée n'est retournée
+        
+        Returns:
+            Entrées RSS (voir get_articles_from_rss)
+        """
+        self.skipped_existing = 0
+        
+        # Récupérer les articles du flux RSS
+        rss_articles = self.get_articles_from_rss(days, max_articles, crawl_state)
+        
+        if self.not_modified:
+            return []
+        
+        if not rss_articles:
+            print(f"   ⚠️ Aucun article trouvé dans le flux RSS")
+            return []
+        
+        # Ne pas télécharger les articles déjà en base
+        if existing_urls:
+            known = existing_urls([a['url'] for a in rss_articles])
+            if known:
+                rss_articles = [a for a in rss_articles if a['url'] not in known]
+                self.skipped_existing = len(known)
+                print(f"   ⏭️ {len(known)} articles déjà en base ignorés")
+            
+            if not rss_articles:
+                print(f"   ✅ Aucun nouvel article")
+        
+        return rss_articles
+    
+    def fetch_entry(self, rss_article: dict) -> Tuple[dict, Optional[str]]:
+        """
+        Télécharger la page complète d'une entrée RSS (étape réseau)
+        
+        Args:
+            rss_article: Entrée issue de find_entries
+        
+        Returns:
+            Tuple (entrée, html ou None)
+        """
+        return rss_article, self.get_article_html(rss_article['url'])
+    
+    def build_article(self, fetched: Tuple[dict, Optional[str]], media_id: int) -> Optional[Article]:
+        """
+        Construire un Article à partir d'une entrée RSS et de sa page téléchargée (étape CPU)
+        
+        Args:
+            fetched: Tuple (entrée, html) retourné par fetch_entry
+            media_id: ID du média en base de données
+        
+        Returns:
+            Objet Article ou None si le contenu est trop court
+        """
+        rss_article, html = fetched
+        
+        # Contenu complet, sinon la description du RSS
+        contenu = self.extractor.extract_content(html) if html else None
+        if not contenu:
+            contenu = rss_article.get('description', '')
+        
+        if not contenu or len(contenu) < 50:
+            print(f"      ⚠️ Contenu trop court, ignoré: {rss_article['url'][:80]}")
             return None
+        
+        return Article(
+            media_id=media_id,
+            titre=rss_article['titre'],
+            contenu=contenu,
+            url=rss_article['url'],
+            date_publication=rss_article.get('date_publication') or datetime.now(),
+            auteur=rss_article.get('auteur'),
+            image_url=rss_article.get('image_url'),
+            source_type='rss_feed'
+        )
     
-    def scrape(self, media_id: int, days: int = 30, max_articles: int = 100) -> List[Article]:
+    def scrape(self, media_id: int, days: int = 30, max_articles: int = 100,
+               existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+               crawl_state: Optional[Dict[str, Any]] = None) -> List[Article]:
         """
         Scraper les articles via RSS
         
@@ -303,54 +552,31 @@ class RSScraper:
             media_id: ID du média en base de données
             days: Nombre de jours dans le passé
             max_articles: Nombre maximum d'articles
+            existing_urls: Voir find_entries
+            crawl_state: Voir find_entries
         
         Returns:
             Liste d'objets Article
         """
         print(f"🌐 Scraping RSS depuis {self.base_url}...")
         
-        # Récupérer les articles du flux RSS
-        rss_articles = self.get_articles_from_rss(days, max_articles)
-        
+        rss_articles = self.find_entries(days, max_articles, existing_urls, crawl_state)
         if not rss_articles:
-            print(f"   ⚠️ Aucun article trouvé dans le flux RSS")
             return []
         
-        articles = []
+        print(f"   📄 Scraping du contenu complet ({self.max_parallel} en parallèle)...")
+        results = map_ordered(
+            lambda rss_article: self.build_article(self.fetch_entry(rss_article), media_id),
+            rss_articles,
+            max_workers=self.max_parallel
+        )
         
-        print(f"   📄 Scraping du contenu complet...")
-        for i, rss_article in enumerate(rss_articles, 1):
-            try:
-                print(f"   Article {i}/{len(rss_articles)}: {rss_article['url'][:80]}...")
-                
-                # Scraper le contenu complet
-                contenu = self.scrape_article_content(rss_article['url'])
-                
-                # Si pas de contenu, utiliser la description du RSS
-                if not contenu:
-                    contenu = rss_article.get('description', '')
-                
-                if not contenu or len(contenu) < 50:
-                    print(f"      ⚠️ Contenu trop court, ignoré")
-                    continue
-                
-                # Créer l'objet Article
-                article = Article(
-                    media_id=media_id,
-                    titre=rss_article['titre'],
-                    contenu=contenu,
-                    url=rss_article['url'],
-                    date_publication=rss_article.get('date_publication') or datetime.now(),
-                    auteur=rss_article.get('auteur'),
-                    image_url=rss_article.get('image_url'),
-                    source_type='rss_feed'
-                )
-                
+        articles = []
+        for rss_article, (article, error) in zip(rss_articles, results):
+            if error:
+                print(f"      ⚠️ Erreur scraping article {rss_article['url'][:80]}: {error}")
+            elif article:
                 articles.append(article)
-            
-            except Exception as e:
-                print(f"      ⚠️ Erreur scraping article: {e}")
-                continue
         
         print(f"✅ {len(articles)} articles scrapés avec succès")
         return articles
@@ -1,49 +1,86 @@
 """
 Gestionnaire principal de scraping avec fallback automatique
-Priorité: RSS > HTML Scraping
+Priorité: API WordPress > RSS > HTML Scraping
 Classification automatique après scraping
 """
 
-from typing import List, Tuple
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from database.db_manager import DatabaseManager
 from database.models import Article
 from .rss_scraper import RSScraper
 from .smart_html_scraper import SmartHTMLScraper
+from .wordpress_scraper import WordPressScraper
+from .crawl_engine import CrawlEngine
+from .extraction import ExtractionProfile
+from .pipeline import Pipeline, Stage
+from .rate_limiter import get_rate_limiter
+from .response_cache import get_response_cache
+from analysis.llm_cache import LLMCache
+from analysis.local_classifier import load_local_classifier
 from analysis.theme_classifier import ThemeClassifier
 
 
 class ScraperManager:
     """Gestionnaire de scraping intelligent avec RSS et HTML"""
     
-    def __init__(self, db_manager: DatabaseManager, auto_classify: bool = True):
+    def __init__(self, db_manager: DatabaseManager, auto_classify: bool = True,
+                 max_feed_failures: int = 3, feed_recheck_days: int = 7,
+                 parse_workers: int = 2, classify_workers: Optional[int] = None, queue_size: int = 16,
+                 persist_batch_size: int = 50):
         """
         Initialise le gestionnaire
         
         Args:
             db_manager: Instance de DatabaseManager
             auto_classify: Activer la classification automatique après scraping
+            max_feed_failures: Échecs consécutifs d'un flux RSS enregistré avant nouvelle découverte
+            feed_recheck_days: Délai avant de rechercher à nouveau un flux sur un site qui n'en a pas
+            parse_workers: Threads d'extraction des articles téléchargés
+            classify_workers: Requêtes de classification Ollama simultanées
+                (par défaut le plafond du client Ollama partagé, OLLAMA_NUM_PARALLEL)
+            queue_size: Taille des files entre les étapes du pipeline (mémoire bornée)
+            persist_batch_size: Nombre maximum d'articles sauvegardés par transaction
         """
         self.db = db_manager
         self.auto_classify = auto_classify
+        self.max_feed_failures = max_feed_failures
+        self.feed_recheck_days = feed_recheck_days
+        self.parse_workers = parse_workers
+        self.classify_workers = classify_workers
+        self.queue_size = queue_size
+        self.persist_batch_size = persist_batch_size
         self.classifier = None
         
         # Initialiser le classificateur si activé
         if self.auto_classify:
             try:
-                self.classifier = ThemeClassifier()
+                self.classifier = ThemeClassifier(cache=LLMCache(self.db),
+                                                  local_model=load_local_classifier())
                 # Vérifier si Ollama est accessible
                 if not self.classifier.check_ollama_status():
-                    print("⚠️ Ollama non accessible, classification désactivée")
-                    self.auto_classify = False
+                    if self.classifier.local_model:
+                        # Articles incertains laissés non classifiés (escaladés plus tard)
+                        self.classifier.local_only = True
+                        print("⚠️ Ollama non accessible, classification par le modèle local seul")
+                    else:
+                        print("⚠️ Ollama non accessible, classification désactivée")
+                        self.auto_classify = False
+                if self.auto_classify and self.classify_workers is None:
+                    self.classify_workers = self.classifier.client.max_concurrency
             except Exception as e:
                 print(f"⚠️ Erreur initialisation classificateur: {e}")
                 self.auto_classify = False
     
     def scrape_site(self, url: str, days: int = 30) -> Tuple[int, str, str]:
         """
-        Scraper un site avec RSS en priorité, sinon HTML
+        Scraper un site via l'API WordPress si disponible, sinon RSS, sinon HTML
+        
+        L'API WordPress est utilisée pour les médias de type 'wordpress' et
+        détectée automatiquement pour les médias de type inconnu; le type
+        détecté est enregistré pour les collectes suivantes.
         
         Args:
             url: URL du site à scraper
@@ -63,27 +100,99 @@ class ScraperManager:
         print(f"🎯 Scraping: {media_name} ({url})")
         print(f"{'='*60}\n")
         
+        # Résoudre le média existant avant de scraper (flux connu, validateurs)
+        media = self.db.get_media_by_url(url) or self.db.get_media_by_url(url + '/')
+        crawl_state = self.db.get_crawl_state(media.id) if media else None
+        type_site = (media.type_site if media else None) or 'unknown'
+        
+        # Règles d'extraction apprises lors des collectes précédentes du domaine
+        profile_domain = domain.replace('www.', '')
+        extraction_profile = ExtractionProfile(profile_domain,
+                                               self.db.get_extraction_profile(profile_domain))
+        
         try:
-            # Essayer d'abord avec RSS
+            # API REST WordPress en priorité (type déclaré ou à détecter)
+            if type_site in ('wordpress', 'unknown'):
+                print(f"🔄 Tentative API WordPress...")
+                wp_scraper = WordPressScraper(url)
+                
+                if type_site == 'wordpress' or wp_scraper.detect():
+                    posts = wp_scraper.find_posts(
+                        days=days, existing_urls=self.db.get_existing_article_urls
+                    )
+                    
+                    if wp_scraper.api_available:
+                        media_id = media.id if media else self.db.add_media(media_name, url, 'wordpress')
+                        if type_site != 'wordpress':
+                            self.db.update_media_type(media_id, 'wordpress')
+                        
+                        # Le JSON contient déjà les articles: pas d'étape de téléchargement
+                        saved_count = self._run_pipeline(
+                            posts,
+                            build=lambda post: wp_scraper.build_article(post, media_id)
+                        )
+                        
+                        self.db.update_media_last_scrape(media_id)
+                        
+                        self.db.add_scraping_log(
+                            media_id=media_id,
+                            status='success',
+                            methode='wordpress_api',
+                            articles_collectes=saved_count,
+                            message=f"{saved_count} articles collectés via l'API WordPress, "
+                                    f"{wp_scraper.skipped_existing} déjà en base"
+                        )
+                        
+                        return saved_count, 'wordpress_api', f"✅ {saved_count} articles collectés via l'API WordPress"
+                
+                print(f"   ⚠️ API WordPress indisponible, passage au RSS\n")
+            
+            # Sinon essayer avec RSS
             print(f"🔄 Tentative 1/2: Scraping RSS...")
-            rss_scraper = RSScraper(url)
-            articles = rss_scraper.scrape(media_id=0, days=days)  # media_id temporaire
+            rss_scraper = RSScraper(
+                url,
+                max_feed_failures=self.max_feed_failures,
+                feed_recheck_days=self.feed_recheck_days,
+                extraction_profile=extraction_profile
+            )
+            rss_articles = rss_scraper.find_entries(
+                days=days,
+                existing_urls=self.db.get_existing_article_urls,
+                crawl_state=crawl_state
+            )
             
-            # Si RSS a fonctionné
-            if len(articles) > 0:
+            # Flux inchangé (304 ou même contenu): rien à télécharger ni à classifier
+            if rss_scraper.not_modified and media:
+                self.db.save_crawl_state(media.id, **{**rss_scraper.discovery_state,
+                                                      **rss_scraper.feed_state})
+                self.db.update_media_last_scrape(media.id)
+                self.db.add_scraping_log(
+                    media_id=media.id,
+                    status='success',
+                    methode='rss_feed',
+                    articles_collectes=0,
+                    message="Flux RSS inchangé depuis la dernière collecte"
+                )
+                return 0, 'rss_feed', "✅ Flux RSS inchangé, aucun article à collecter"
+            
+            # Si RSS a fonctionné (y compris si tous les articles étaient déjà en base)
+            if rss_articles or rss_scraper.skipped_existing:
                 # Ajouter ou récupérer le média
-                media_id = self.db.add_media(media_name, url)
-                
-                # Mettre à jour les media_id
-                for article in articles:
-                    article.media_id = media_id
+                media_id = media.id if media else self.db.add_media(media_name, url, 'rss')
+                if media and type_site == 'unknown':
+                    self.db.update_media_type(media_id, 'rss')
                 
-                # Sauvegarder
-                saved_count, new_article_ids = self._save_articles(articles)
+                # Téléchargement, extraction, sauvegarde et classification en flux
+                saved_count = self._run_pipeline(
+                    rss_articles,
+                    fetch=rss_scraper.fetch_entry,
+                    fetch_workers=rss_scraper.max_parallel,
+                    build=lambda fetched: rss_scraper.build_article(fetched, media_id)
+                )
                 
-                # Classification automatique des nouveaux articles
-                if self.auto_classify and new_article_ids:
-                    self._classify_articles(new_article_ids)
+                # Enregistrer les validateurs seulement une fois les articles sauvegardés
+                self.db.save_crawl_state(media_id, **{**rss_scraper.discovery_state,
+                                                      **rss_scraper.feed_state})
                 
                 # Mettre à jour la date de dernière collecte
                 self.db.update_media_last_scrape(media_id)
@@ -94,27 +203,57 @@ class ScraperManager:
                     status='success',
                     methode='rss_feed',
                     articles_collectes=saved_count,
-                    message=f"{saved_count} articles collectés via RSS"
+                    message=f"{saved_count} articles collectés via RSS, "
+                            f"{rss_scraper.skipped_existing} déjà en base non téléchargés"
                 )
                 
                 return saved_count, 'rss_feed', f"✅ {saved_count} articles collectés via RSS"
             
             # Si RSS n'a pas fonctionné, fallback vers HTML
             print(f"\n🔄 Tentative 2/2: Scraping HTML...")
-            scraper = SmartHTMLScraper(url)
+            scraper = SmartHTMLScraper(url, extraction_profile=extraction_profile)
             
-            # Ajouter/mettre à jour le média
-            media_id = self.db.add_media(media_name, url, 'html')
+            # Ajouter le média s'il n'existe pas encore
+            media_id = media.id if media else self.db.add_media(media_name, url, 'html')
+            if media and type_site == 'unknown':
+                self.db.update_media_type(media_id, 'html')
             
-            # Scraper les articles
-            articles = scraper.scrape(media_id, days=days, max_articles=100)
+            # Mémoriser le résultat de la découverte RSS (absence de flux, échecs)
+            self.db.save_crawl_state(media_id, **rss_scraper.discovery_state)
             
-            # Sauvegarder en base
-            saved_count, new_article_ids = self._save_articles(articles)
+            # Trouver les articles à télécharger
+            print(f"🌐 Scraping HTML depuis {url}...")
+            article_links = scraper.find_links(
+                days=days, max_articles=100,
+                existing_urls=self.db.get_existing_article_urls,
+                since=media.derniere_collecte if media else None,
+                crawl_state=crawl_state
+            )
+            
+            # Page d'accueil inchangée: un seul téléchargement, rien à classifier
+            if scraper.not_modified:
+                self.db.update_media_last_scrape(media_id)
+                self.db.add_scraping_log(
+                    media_id=media_id,
+                    status='success',
+                    methode='html_scraping',
+                    articles_collectes=0,
+                    message="Liens de la page d'accueil inchangés depuis la dernière collecte"
+                )
+                return 0, 'html_scraping', "✅ Page d'accueil inchangée, aucun article à collecter"
             
-            # Classification automatique des nouveaux articles
-            if self.auto_classify and new_article_ids:
-                self._classify_articles(new_article_ids)
+            # Téléchargement, extraction, sauvegarde et classification en flux
+            date_limit = datetime.now() - timedelta(days=days)
+            saved_count = self._run_pipeline(
+                article_links,
+                fetch=scraper.fetch_article,
+                fetch_workers=scraper.max_parallel,
+                build=lambda fetched: scraper.build_article(fetched, media_id, date_limit)
+            )
+            
+            # Mémoriser les liens traités seulement une fois les articles sauvegardés
+            if scraper.links_state:
+                self.db.save_crawl_state(media_id, **scraper.links_state)
             
             # Mettre à jour la date de dernière collecte
             self.db.update_media_last_scrape(media_id)
@@ -122,10 +261,11 @@ class ScraperManager:
             # Logger
             self.db.add_scraping_log(
                 media_id=media_id,
-                status='success' if saved_count > 0 else 'partial',
+                status='success' if saved_count > 0 or scraper.skipped_existing else 'partial',
                 methode='html_scraping',
                 articles_collectes=saved_count,
-                message=f"{saved_count} articles collectés via scraping HTML"
+                message=f"{saved_count} articles collectés via scraping HTML, "
+                        f"{scraper.skipped_existing} déjà en base non téléchargés"
             )
             
             return saved_count, 'html_scraping', f"✅ {saved_count} articles collectés via scraping HTML"
@@ -135,7 +275,7 @@ class ScraperManager:
             print(error_msg)
             
             # Logger l'erreur
-            media_id = self.db.add_media(media_name, url, 'unknown')
+            media_id = media.id if media else self.db.add_media(media_name, url, 'unknown')
             self.db.add_scraping_log(
                 media_id=media_id,
                 status='error',
@@ -145,92 +285,116 @@ class ScraperManager:
             )
             
             return 0, 'error', error_msg
+        
+        finally:
+            # Cumuler les succès/échecs des règles d'extraction de ce domaine
+            self.db.save_extraction_stats(profile_domain, extraction_profile.drain())
     
-    def _save_articles(self, articles: List[Article]) -> Tuple[int, List[int]]:
+    def _run_pipeline(self, items: List[Any], build: Callable[[Any], Optional[Article]],
+                      fetch: Optional[Callable[[Any], Any]] = None, fetch_workers: int = 1) -> int:
         """
-        Sauvegarder les articles en base de données
+        Faire passer les articles dans le pipeline téléchargement → extraction → sauvegarde → classification
+        
+        Chaque article avance dès qu'il est prêt: les téléchargements, l'extraction
+        et les appels Ollama se recouvrent, et les files bornées limitent la mémoire.
         
         Args:
-            articles: Liste d'articles à sauvegarder
+            items: Éléments à traiter (URLs, entrées RSS, posts WordPress)
+            build: Construction de l'Article à partir d'un élément téléchargé
+            fetch: Téléchargement d'un élément (None si les éléments sont déjà complets)
+            fetch_workers: Téléchargements simultanés
         
         Returns:
-            Tuple (nombre d'articles sauvegardés, liste des IDs des nouveaux articles)
+            Nombre d'articles sauvegardés
         """
-        saved_count = 0
-        duplicate_count = 0
-        new_article_ids = []
-        
-        for article in articles:
-            # Vérifier si l'article existe déjà
-            if not self.db.article_exists(article.url):
-                article_id = self.db.add_article(article)
-                if article_id:
-                    saved_count += 1
-                    new_article_ids.append(article_id)
-            else:
-                duplicate_count += 1
+        if not items:
+            return 0
+        
+        classify = bool(self.auto_classify and self.classifier)
+        
+        stages = []
+        if fetch:
+            stages.append(Stage('telechargement', fetch, fetch_workers))
+        stages.append(Stage('extraction', build, self.parse_workers))
+        stages.append(Stage('sauvegarde', self._persist_articles, 1, batch_size=self.persist_batch_size))
+        if classify:
+            stages.append(Stage('classification', self._classify_article, self.classify_workers))
+        
+        print(f"   📄 Pipeline: {len(items)} articles ({fetch_workers if fetch else 0} téléchargements, "
+              f"{self.parse_workers} extractions, {self.classify_workers if classify else 0} "
+              f"classifications en parallèle)")
         
-        if duplicate_count > 0:
-            print(f"   💾 {saved_count} nouveaux articles, {duplicate_count} doublons ignorés")
+        def on_error(stage, item, error):
+            print(f"   ⚠️ Erreur {stage}: {error}")
         
-        return saved_count, new_article_ids
+        pipeline = Pipeline(stages, queue_size=self.queue_size)
+        pipeline.run(items, on_error=on_error)
+        
+        saved_count = pipeline.stats['sauvegarde']['sorties']
+        duplicate_count = pipeline.stats['sauvegarde']['ignores']
+        print(f"   💾 {saved_count} nouveaux articles" +
+              (f", {duplicate_count} doublons ignorés" if duplicate_count else ""))
+        
+        if 'classification' in pipeline.stats:
+            classification = pipeline.stats['classification']
+            print(f"   🤖 {classification['sorties']} articles classifiés" +
+                  (f", {classification['ignores']} laissés pour Mistral" if classification['ignores'] else "") +
+                  (f", {classification['erreurs']} erreurs" if classification['erreurs'] else ""))
+        
+        return saved_count
     
-    def _classify_articles(self, article_ids: List[int]):
+    def _persist_articles(self, articles: List[Article]) -> List[Tuple[int, Article]]:
         """
-        Classifier automatiquement les articles
+        Sauvegarder un lot d'articles en une transaction (étape du pipeline)
         
         Args:
-            article_ids: Liste des IDs d'articles à classifier
+            articles: Articles à sauvegarder
+        
+        Returns:
+            Tuples (ID, article) des nouveaux articles (URLs déjà en base ignorées)
+        """
+        inserted = self.db.add_articles_bulk(articles)
+        return [(inserted.pop(article.url), article) for article in articles if article.url in inserted]
+    
+    def _classify_article(self, saved: Tuple[int, Article]) -> Optional[int]:
         """
-        if not self.classifier or not article_ids:
-            return
+        Classifier un article sauvegardé (étape du pipeline)
         
-        print(f"\n🤖 Classification automatique de {len(article_ids)} articles...")
+        Args:
+            saved: Tuple (ID de l'article, article) retourné par _persist_articles
         
-        classified_count = 0
-        errors = 0
+        Returns:
+            ID de l'article classifié, ou None s'il reste à classifier (Ollama indisponible)
+        """
+        article_id, article = saved
         
-        for article_id in article_ids:
-            try:
-                # Récupérer l'article
-                article = self.db.get_article(article_id)
-                if not article:
-                    continue
-                
-                # Classifier
-                result = self.classifier.classify_article(
-                    article.get('titre', ''),
-                    article.get('contenu', '')
-                )
-                
-                # Sauvegarder la classification
-                self.db.add_classification(
-                    article_id=article_id,
-                    categorie=result['categorie'],
-                    confiance=result['confiance'],
-                    mots_cles=result.get('mots_cles', []),
-                    justification=result.get('justification', ''),
-                    methode=result.get('methode', 'mistral_ollama')
-                )
-                
-                classified_count += 1
-            
-            except Exception as e:
-                errors += 1
-                continue
+        result = self.classifier.classify_article(article.titre or '', article.contenu or '')
+        if result is None:
+            return None
         
-        if classified_count > 0:
-            print(f"   ✅ {classified_count} articles classifiés")
-        if errors > 0:
-            print(f"   ⚠️ {errors} erreurs")
+        self.db.add_classification(
+            article_id=article_id,
+            categorie=result['categorie'],
+            confiance=result['confiance'],
+            mots_cles=result.get('mots_cles', []),
+            justification=result.get('justification', ''),
+            methode=result.get('methode', 'mistral_ollama')
+        )
+        return article_id
     
-    def scrape_all_sites(self, sites_file: str = None, days: int = 30) -> dict:
+    def scrape_all_sites(self, sites_file: str = None, days: int = 30,
+                         max_workers: int = 8, max_per_host: int = 1) -> dict:
         """
         Scraper tous les sites depuis la table media (ou fichier en fallback)
         
+        Les sites sont traités en parallèle : la durée totale dépend du site
+        le plus lent et non plus de la somme de tous les sites.
+        
         Args:
             sites_file: [DEPRECATED] Chemin vers le fichier contenant les URLs (pour compatibilité)
             days: Nombre de jours à récupérer
+            max_workers: Nombre maximum de sites scrapés simultanément
+            max_per_host: Nombre maximum de scrapings simultanés sur un même hôte
         
         Returns:
             Dictionnaire avec les statistiques
@@ -246,7 +410,7 @@ class ScraperManager:
             print("⚠️ Aucun média trouvé dans la table media")
             return {}
         
-        print(f"\n📋 {len(medias)} sites à scraper")
+        print(f"\n📋 {len(medias)} sites à scraper ({max_workers} en parallèle, {max_per_host} par hôte)")
         print(f"📅 Période: {days} derniers jours\n")
         
         # Statistiques
@@ -256,6 +420,7 @@ class ScraperManager:
             'errors': 0,
             'total_articles': 0,
             'by_method': {
+                'wordpress_api': 0,
                 'html_scraping': 0,
                 'rss_feed': 0,
                 'error': 0
@@ -263,16 +428,35 @@ class ScraperManager:
             'details': []
         }
         
-        # Scraper chaque site
-        for i, media in enumerate(medias, 1):
-            print(f"\n[{i}/{len(medias)}] Traitement de {media.nom} ({media.url})...")
-            
-            count, method, message = self.scrape_site(media.url, days=days)
+        def on_done(index, media, result, error):
+            if error:
+                print(f"❌ [{media.nom}] Erreur inattendue: {error}")
+            else:
+                print(f"[{media.nom}] {result[2]}")
+        
+        # Scraper les sites en parallèle
+        engine = CrawlEngine(max_workers=max_workers, max_per_host=max_per_host)
+        results = engine.run(
+            medias,
+            lambda media: self.scrape_site(media.url, days=days),
+            key=lambda media: media.url,
+            on_done=on_done
+        )
+        
+        # Agréger dans l'ordre des médias
+        for media, (result, error) in zip(medias, results):
+            if error:
+                count, method, message = 0, 'error', f"❌ Erreur scraping: {error}"
+            else:
+                count, method, message = result
             
-            if count > 0:
+            # Un site à jour (0 nouvel article) n'est pas une erreur
+            if method != 'error':
+                status = 'success' if count > 0 else 'up_to_date'
                 stats['success'] += 1
                 stats['total_articles'] += count
             else:
+                status = 'error'
                 stats['errors'] += 1
             
             stats['by_method'][method] = stats['by_method'].get(method, 0) + count
@@ -283,10 +467,17 @@ class ScraperManager:
                 'url': media.url,
                 'articles': count,
                 'method': method,
+                'status': status,
                 'message': message
             })
-            
-            print(message)
+        
+        # Débits effectifs par hôte (limiteur adaptatif partagé)
+        stats['rate_limits'] = get_rate_limiter().rates()
+        
+        # Éviction du cache HTTP (âge, taille)
+        cache = get_response_cache()
+        if cache and not cache.offline:
+            stats['cache_evicted'] = cache.evict()
         
         # Afficher le résumé
         self._print_summary(stats)
@@ -303,11 +494,23 @@ class ScraperManager:
         print(f"   • Erreurs: {stats['errors']}")
         print(f"\n📰 Total articles collectés: {stats['total_articles']}")
         print(f"\n🔧 Par méthode:")
+        print(f"   • API WordPress: {stats['by_method'].get('wordpress_api', 0)} articles")
+        print(f"   • RSS: {stats['by_method'].get('rss_feed', 0)} articles")
         print(f"   • HTML Scraping: {stats['by_method'].get('html_scraping', 0)} articles")
         
+        if stats.get('rate_limits'):
+            print(f"\n⏱️ Débit par hôte (req/s):")
+            for host, limit in stats['rate_limits'].items():
+                print(f"   • {host}: {limit['rate']} req/s "
+                      f"({limit['requests']} requêtes, {limit['throttled']} limitées)")
+        
         print(f"\n📋 Détails par site:")
         for detail in stats['details']:
-            status = "✅" if detail['articles'] > 0 else "❌"
-            print(f"   {status} {detail['url']}: {detail['articles']} articles ({detail['method']})")
+            if detail['status'] == 'error':
+                print(f"   ❌ {detail['url']}: échec de la collecte")
+            elif detail['status'] == 'up_to_date':
+                print(f"   🔄 {detail['url']}: à jour, aucun nouvel article ({detail['method']})")
+            else:
+                print(f"   ✅ {detail['url']}: {detail['articles']} articles ({detail['method']})")
         
         print("\n" + "="*60)
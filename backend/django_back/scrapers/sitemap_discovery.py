@@ -0,0 +1,198 @@
+"""
+Découverte incrémentale des articles via les sitemaps
+robots.txt (directives Sitemap:), sinon /sitemap.xml et variantes courantes;
+index de sitemaps, sitemaps Google News et fichiers .gz
+"""
+
+import gzip
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from dateutil import parser as date_parser
+from lxml import etree
+
+from .rate_limiter import RateLimitedSession
+
+
+class SitemapDiscovery:
+    """Lecture des sitemaps d'un site filtrée par date de modification"""
+
+    # Emplacements essayés si robots.txt ne déclare aucun sitemap
+    DEFAULT_PATHS = [
+        '/sitemap.xml',
+        '/sitemap_index.xml',
+        '/wp-sitemap.xml',  # WordPress >= 5.5
+        '/news-sitemap.xml',
+        '/sitemap-news.xml',
+    ]
+
+    def __init__(self, base_url: str, session: Optional[requests.Session] = None,
+                 timeout: int = 30, max_sitemaps: int = 50):
+        """
+        Initialise la découverte
+
+        Args:
+            base_url: URL de base du site
+            session: Session HTTP à réutiliser (par défaut une RateLimitedSession)
+            timeout: Timeout pour les requêtes HTTP
+            max_sitemaps: Nombre maximum de fichiers sitemap lus par découverte
+        """
+        self.base_url = base_url.rstrip('/')
+        self.session = session or RateLimitedSession()
+        self.timeout = timeout
+        self.max_sitemaps = max_sitemaps
+        self.sitemaps_read = 0  # Fichiers lus lors de la dernière découverte
+        self._prefetched = {}  # Sitemaps déjà téléchargés par find_sitemaps
+
+    def find_sitemaps(self) -> List[str]:
+        """
+        Trouver les sitemaps déclarés dans robots.txt, sinon aux emplacements courants
+
+        Returns:
+            Liste d'URLs de sitemaps (vide si le site n'en a pas)
+        """
+        try:
+            parsed = urlparse(self.base_url)
+            response = self.session.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt",
+                                        timeout=self.timeout)
+            if response.status_code == 200:
+                sitemaps = []
+                for line in response.text.splitlines():
+                    key, _, value = line.partition(':')
+                    if key.strip().lower() == 'sitemap' and value.strip():
+                        sitemaps.append(value.strip())
+                if sitemaps:
+                    return list(dict.fromkeys(sitemaps))
+        except Exception:
+            pass
+
+        for path in self.DEFAULT_PATHS:
+            url = f"{self.base_url}{path}"
+            root = self._fetch(url)
+            if root is not None:
+                self._prefetched[url] = root
+                return [url]
+
+        return []
+
+    def _fetch(self, url: str) -> Optional[etree._Element]:
+        """Télécharger et parser un sitemap (XML ou XML gzippé)"""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                return None
+
+            content = response.content
+            if content[:2] == b'\x1f\x8b':
+                content = gzip.decompress(content)
+
+            root = etree.fromstring(content, etree.XMLParser(recover=True, resolve_entities=False))
+        except Exception:
+            return None
+
+        if root is None or etree.QName(root).localname not in ('urlset', 'sitemapindex'):
+            return None
+        return root
+
+    def discover(self, since: Optional[Union[datetime, str]] = None,
+                 max_urls: int = 100) -> Optional[List[Tuple[str, Optional[datetime]]]]:
+        """
+        Lister les URLs modifiées depuis une date, les plus récentes d'abord
+
+        Les sitemaps enfants d'un index dont le lastmod est antérieur à la date
+        ne sont pas téléchargés. Avec une date minimale, les URLs sans lastmod
+        sont écartées (impossible de savoir si elles sont nouvelles); sans date,
+        elles sont conservées après les URLs datées.
+
+        Args:
+            since: Date minimale de modification (UTC; datetime ou texte SQLite)
+            max_urls: Nombre maximum d'URLs retournées
+
+        Returns:
+            Liste de tuples (url, lastmod en UTC), ou None si le site n'a pas de sitemap
+            lisible (ou, avec une date minimale, aucune URL datée)
+        """
+        since = to_utc(since)
+        queue = self.find_sitemaps()
+        if not queue:
+            return None
+
+        seen_sitemaps = set()
+        entries = {}
+        readable = False
+        dated_urls = False
+        self.sitemaps_read = 0
+
+        while queue and self.sitemaps_read < self.max_sitemaps:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            root = self._prefetched.pop(sitemap_url, None)
+            if root is None:
+                root = self._fetch(sitemap_url)
+            self.sitemaps_read += 1
+            if root is None:
+                continue
+            readable = True
+
+            is_index = etree.QName(root).localname == 'sitemapindex'
+            for loc, lastmod in _iter_entries(root):
+                # Un lastmod d'article, ou un sitemap enfant ignoré car trop ancien:
+                # le site date ses entrées, l'absence d'URL récente est fiable
+                if lastmod and (not is_index or (since and lastmod < since)):
+                    dated_urls = True
+                if since and lastmod and lastmod < since:
+                    continue
+                if is_index:
+                    queue.append(loc)
+                elif since and not lastmod:
+                    continue
+                elif loc not in entries or (lastmod and (not entries[loc] or lastmod > entries[loc])):
+                    entries[loc] = lastmod
+
+        # Sans lastmod, le sitemap ne permet pas de trouver les nouveaux articles
+        if not readable or (since and not dated_urls):
+            return None
+
+        dated = sorted(((url, d) for url, d in entries.items() if d), key=lambda e: e[1], reverse=True)
+        undated = [(url, d) for url, d in entries.items() if not d]
+        return (dated + undated)[:max_urls]
+
+
+def _iter_entries(root):
+    """Parcourir les entrées <url>/<sitemap> d'un sitemap: (loc, lastmod)"""
+    for entry in root:
+        if not isinstance(entry.tag, str):
+            continue
+
+        loc, lastmod = None, None
+        for child in entry.iter():
+            if not isinstance(child.tag, str):
+                continue
+            name = etree.QName(child).localname
+            if name == 'loc' and loc is None and child.text:
+                loc = child.text.strip()
+            elif name in ('lastmod', 'publication_date') and child.text:
+                # Sitemaps Google News: news:publication_date
+                lastmod = max(filter(None, [lastmod, to_utc(child.text.strip())]), default=None)
+
+        if loc:
+            yield loc, lastmod
+
+
+def to_utc(value: Optional[Union[datetime, str]]) -> Optional[datetime]:
+    """Convertir une date (W3C, ISO ou SQLite) en datetime UTC naïf"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = date_parser.parse(value)
+        except (ValueError, OverflowError):
+            return None
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -3,37 +3,50 @@ Scraper HTML intelligent et ultra-performant
 Fonctionne sur n'importe quel site, n'importe quelle technologie
 """
 
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Set
+from typing import Callable, Iterable, List, Optional, Dict, Any, Set, Tuple
 from urllib.parse import urljoin, urlparse
-import time
+import hashlib
+import json
 import re
-from dateutil import parser as date_parser
 import locale
 
 from database.models import Article
+from .crawl_engine import map_ordered, mount_pool
+from .extraction import ArticleExtractor, ExtractionProfile
+from .rate_limiter import RateLimitedSession
+from .sitemap_discovery import SitemapDiscovery, to_utc
 
 
 class SmartHTMLScraper:
     """Scraper HTML intelligent et générique"""
     
-    def __init__(self, base_url: str, timeout: int = 30):
+    def __init__(self, base_url: str, timeout: int = 30, max_parallel: int = 4,
+                 extraction_profile: Optional[ExtractionProfile] = None):
         """
         Initialise le scraper HTML intelligent
         
         Args:
             base_url: URL de base du site
             timeout: Timeout pour les requêtes HTTP (en secondes)
+            max_parallel: Nombre d'articles téléchargés simultanément sur ce domaine
+            extraction_profile: Règles d'extraction apprises pour ce domaine
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.max_parallel = max(1, max_parallel)
+        self.skipped_existing = 0  # Articles déjà en base, non téléchargés
+        self.not_modified = False  # Liens de la page d'accueil inchangés
+        self.homepage_links: Optional[List[str]] = None  # Liens de la page d'accueil (hors sitemaps)
+        self.failed_urls: Set[str] = set()  # Articles non téléchargés lors de la dernière collecte
         self.domain = urlparse(base_url).netloc
-        self.session = requests.Session()
+        self.extractor = ArticleExtractor(self.base_url, extraction_profile)
+        self.session = RateLimitedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        mount_pool(self.session, self.max_parallel)
     
     def get_page(self, url: str) -> Optional[BeautifulSoup]:
         """
@@ -139,6 +152,38 @@ class SmartHTMLScraper:
         print(f"   ✅ {len(links)} liens d'articles trouvés")
         return links
     
+    def find_sitemap_links(self, since: datetime, max_links: int = 100) -> Optional[List[str]]:
+        """
+        Trouver les articles récents via les sitemaps du site
+        
+        Args:
+            since: Date minimale de modification (UTC)
+            max_links: Nombre maximum de liens à retourner
+        
+        Returns:
+            Liste d'URLs d'articles (les plus récentes d'abord), ou None si le site n'a pas
+            de sitemap lisible et daté (la page d'accueil est alors utilisée)
+        """
+        print(f"   🗺️ Recherche des sitemaps...")
+        discovery = SitemapDiscovery(self.base_url, session=self.session, timeout=self.timeout)
+        
+        # Lire plus d'entrées que nécessaire: pages non-articles filtrées ensuite
+        entries = discovery.discover(since=since, max_urls=max_links * 3)
+        if entries is None:
+            print(f"   ⚠️ Aucun sitemap lisible avec des dates de modification")
+            return None
+        
+        links = []
+        for url, _ in entries:
+            if urlparse(url).netloc == self.domain and self._is_article_url(url):
+                links.append(url)
+            if len(links) >= max_links:
+                break
+        
+        print(f"   ✅ {len(links)} articles modifiés depuis le {since:%Y-%m-%d %H:%M} "
+              f"({discovery.sitemaps_read} sitemaps lus)")
+        return links
+    
     def _is_article_url(self, url: str) -> bool:
         """
         Vérifier intelligemment si une URL est un article
@@ -217,6 +262,24 @@ class SmartHTMLScraper:
         
         return True
     
+    def get_html(self, url: str) -> Optional[str]:
+        """
+        Récupérer le HTML brut d'une page
+        
+        Args:
+            url: URL de la page
+        
+        Returns:
+            Contenu HTML décodé ou None
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            print(f"⚠️ Erreur récupération page {url}: {e}")
+            return None
+    
     def scrape_article(self, url: str, media_id: int, date_limit: datetime) -> Optional[Article]:
         """
         Scraper un article individuel avec extraction intelligente
@@ -229,257 +292,198 @@ class SmartHTMLScraper:
         Returns:
             Objet Article ou None
         """
-        soup = self.get_page(url)
-        if not soup:
+        fetched = self.fetch_article(url)
+        if not fetched:
             return None
         
+        return self.build_article(fetched, media_id, date_limit)
+    
+    def fetch_article(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Télécharger la page d'un article (étape réseau)
+        
+        Args:
+            url: URL de l'article
+        
+        Returns:
+            Tuple (url, html) ou None si la page est inaccessible
+        """
+        html = self.get_html(url)
+        if not html:
+            self.failed_urls.add(url)
+            return None
+        return url, html
+    
+    def build_article(self, fetched: Tuple[str, str], media_id: int,
+                      date_limit: datetime) -> Optional[Article]:
+        """
+        Extraire un article d'une page téléchargée et vérifier sa date (étape CPU)
+        
+        Args:
+            fetched: Tuple (url, html) retourné par fetch_article
+            media_id: ID du média
+            date_limit: Date limite de publication
+        
+        Returns:
+            Objet Article ou None (sans titre ou trop ancien)
+        """
+        url, html = fetched
+        article = self.parse_article(html, url, media_id)
+        if not article:
+            return None
+        
+        # Vérifier si l'article est dans la période (30 derniers jours)
+        if article.date_publication:
+            # Enlever la timezone pour comparaison
+            date_pub = article.date_publication
+            date_pub_naive = date_pub.replace(tzinfo=None) if date_pub.tzinfo else date_pub
+            if date_pub_naive < date_limit:
+                return None  # Article trop ancien
+        else:
+            article.date_publication = datetime.now()
+        
+        return article
+    
+    def parse_article(self, html: str, url: str, media_id: int) -> Optional[Article]:
+        """
+        Extraire les champs d'un article depuis sa page déjà téléchargée
+        
+        Tous les champs sont extraits en un seul parcours du document (voir extraction.py).
+        
+        Args:
+            html: Contenu HTML de la page
+            url: URL de l'article
+            media_id: ID du média
+        
+        Returns:
+            Objet Article (date_publication à None si introuvable) ou None
+        """
         try:
-            # Extraction du titre
-            titre = self._extract_title(soup)
-            if not titre:
+            fields = self.extractor.extract(html, url)
+            if not fields['titre']:
                 return None
             
-            # Extraction de la date
-            date_publication = self._extract_date(soup, url)
-            
-            # Vérifier si l'article est dans la période (30 derniers jours)
-            if date_publication:
-                # Enlever la timezone pour comparaison
-                date_pub_naive = date_publication.replace(tzinfo=None) if date_publication.tzinfo else date_publication
-                if date_pub_naive < date_limit:
-                    return None  # Article trop ancien
-            
-            # Extraction du contenu
-            contenu = self._extract_content(soup)
-            
-            # Extraction de l'auteur
-            auteur = self._extract_author(soup)
-            
-            # Extraction de l'image
-            image_url = self._extract_image(soup)
-            
             return Article(
                 media_id=media_id,
-                titre=titre,
-                contenu=contenu,
                 url=url,
-                date_publication=date_publication or datetime.now(),
-                auteur=auteur,
-                image_url=image_url,
-                source_type='html_scraping'
+                source_type='html_scraping',
+                **fields
             )
         
         except Exception as e:
             print(f"   ⚠️ Erreur extraction article {url}: {e}")
             return None
     
-    def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extraire le titre de l'article"""
-        # Sélecteurs pour le titre (du plus spécifique au plus général)
-        selectors = [
-            'article h1',
-            '.entry-title',
-            '.post-title',
-            'h1.title',
-            'h1.article-title',
-            '.article-header h1',
-            'header h1',
-            'h1',
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                titre = elem.get_text(strip=True)
-                if titre and len(titre) > 10:  # Titre significatif
-                    return titre
-        
-        # Fallback: meta title ou title
-        meta_title = soup.find('meta', property='og:title')
-        if meta_title and meta_title.get('content'):
-            return meta_title['content']
+    @staticmethod
+    def fingerprint_links(links: Iterable[str]) -> str:
+        """
+        Empreinte d'un ensemble de liens (indépendante de l'ordre)
         
-        title_tag = soup.find('title')
-        if title_tag:
-            return title_tag.get_text(strip=True).split('|')[0].split('-')[0].strip()
+        Args:
+            links: URLs d'articles
         
-        return None
+        Returns:
+            Hash SHA-256 hexadécimal
+        """
+        return hashlib.sha256('\n'.join(sorted(set(links))).encode('utf-8')).hexdigest()
     
-    def _extract_date(self, soup: BeautifulSoup, url: str) -> Optional[datetime]:
-        """Extraire intelligemment la date de publication"""
-        
-        # 1. Chercher dans les meta tags
-        meta_selectors = [
-            ('meta', 'property', 'article:published_time'),
-            ('meta', 'property', 'og:published_time'),
-            ('meta', 'name', 'publish_date'),
-            ('meta', 'name', 'date'),
-            ('meta', 'itemprop', 'datePublished'),
-        ]
-        
-        for tag, attr, value in meta_selectors:
-            elem = soup.find(tag, {attr: value})
-            if elem and elem.get('content'):
-                try:
-                    return date_parser.parse(elem['content'])
-                except:
-                    pass
-        
-        # 2. Chercher dans les éléments time
-        time_elem = soup.find('time', datetime=True)
-        if time_elem:
-            try:
-                return date_parser.parse(time_elem['datetime'])
-            except:
-                pass
-        
-        # 3. Chercher dans les classes/IDs courants
-        date_selectors = [
-            '.entry-date',
-            '.post-date',
-            '.published',
-            '.date',
-            'time',
-            '.article-date',
-            'span.date',
-        ]
-        
-        for selector in date_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                date_text = elem.get_text(strip=True)
-                date_obj = self._parse_french_date(date_text)
-                if date_obj:
-                    return date_obj
-        
-        # 4. Extraire de l'URL (structure /YYYY/MM/DD/)
-        url_date = self._extract_date_from_url(url)
-        if url_date:
-            return url_date
+    @property
+    def links_state(self) -> Dict[str, Any]:
+        """
+        Liens de la page d'accueil à mémoriser après la collecte (crawl_state)
         
-        return None
-    
-    def _parse_french_date(self, date_text: str) -> Optional[datetime]:
-        """Parser une date en français"""
-        try:
-            # Nettoyer le texte
-            date_text = date_text.strip()
-            
-            # Essayer le parser automatique
-            return date_parser.parse(date_text, fuzzy=True)
-        except:
-            pass
-        
-        # Patterns français courants
-        patterns = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # DD/MM/YYYY ou DD-MM-YYYY
-            r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # YYYY/MM/DD ou YYYY-MM-DD
-        ]
+        Les liens en échec n'en font pas partie: ils seront retentés à la prochaine collecte.
         
-        for pattern in patterns:
-            match = re.search(pattern, date_text)
-            if match:
-                try:
-                    groups = match.groups()
-                    if len(groups[0]) == 4:  # YYYY-MM-DD
-                        return datetime(int(groups[0]), int(groups[1]), int(groups[2]))
-                    else:  # DD-MM-YYYY
-                        return datetime(int(groups[2]), int(groups[1]), int(groups[0]))
-                except:
-                    pass
-        
-        return None
-    
-    def _extract_date_from_url(self, url: str) -> Optional[datetime]:
-        """Extraire la date depuis l'URL"""
-        # Pattern: /YYYY/MM/DD/ ou /YYYY/MM/
-        match = re.search(r'/(\d{4})/(\d{2})(?:/(\d{2}))?/', url)
-        if match:
-            try:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3)) if match.group(3) else 1
-                return datetime(year, month, day)
-            except:
-                pass
-        
-        return None
+        Returns:
+            Dictionnaire (links_hash, links), vide si les liens viennent des sitemaps
+        """
+        if self.homepage_links is None:
+            return {}
+        processed = [url for url in self.homepage_links if url not in self.failed_urls]
+        return {'links_hash': self.fingerprint_links(processed), 'links': json.dumps(processed)}
     
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """Extraire le contenu de l'article"""
-        # Sélecteurs pour le contenu
-        selectors = [
-            'article .entry-content',
-            'article .post-content',
-            'article .content',
-            '.entry-content',
-            '.post-content',
-            '.article-content',
-            'article',
-            '.content',
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                # Supprimer les scripts, styles, etc.
-                for tag in elem.find_all(['script', 'style', 'iframe', 'nav', 'aside']):
-                    tag.decompose()
-                
-                content = elem.get_text(separator='\n', strip=True)
-                if content and len(content) > 100:  # Contenu significatif
-                    return content[:5000]  # Limiter à 5000 caractères
+    def find_links(self, days: int = 30, max_articles: int = 100,
+                   existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+                   since: Optional[datetime] = None, use_sitemaps: bool = True,
+                   crawl_state: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Trouver les articles à télécharger (sitemaps ou page d'accueil), hors articles connus
         
-        return ""
-    
-    def _extract_author(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extraire l'auteur de l'article"""
-        # Meta tags
-        meta_author = soup.find('meta', attrs={'name': 'author'})
-        if meta_author and meta_author.get('content'):
-            return meta_author['content']
-        
-        # Sélecteurs courants
-        selectors = [
-            '.author-name',
-            '.author',
-            '.by-author',
-            'span.author',
-            'a[rel="author"]',
-        ]
+        Args:
+            days: Nombre de jours à récupérer
+            max_articles: Nombre maximum d'articles
+            existing_urls: Fonction retournant les URLs déjà en base parmi une liste
+                (ex: DatabaseManager.get_existing_article_urls); ces articles ne sont pas téléchargés
+            since: Date de la dernière collecte (UTC); seuls les articles modifiés depuis
+                sont lus dans les sitemaps
+            use_sitemaps: Découvrir les articles via les sitemaps, la page d'accueil
+                n'étant utilisée qu'en l'absence de sitemap
+            crawl_state: État de collecte du média (links_hash, links de la collecte précédente)
         
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                author = elem.get_text(strip=True)
-                if author and len(author) < 100:
-                    return author
+        Returns:
+            Liste d'URLs d'articles (self.not_modified indique que la page d'accueil n'a pas changé)
+        """
+        self.skipped_existing = 0
+        self.not_modified = False
+        self.homepage_links = None
+        self.failed_urls = set()
+        
+        # Sitemaps: articles modifiés depuis la dernière collecte (dans la fenêtre de N jours)
+        article_links = None
+        if use_sitemaps:
+            window_start = datetime.utcnow() - timedelta(days=days)
+            last_collect = to_utc(since)
+            sitemap_since = max(window_start, last_collect) if last_collect else window_start
+            article_links = self.find_sitemap_links(sitemap_since, max_links=max_articles)
+        
+        from_homepage = article_links is None
+        if from_homepage:
+            # Récupérer la page d'accueil
+            soup = self.get_page(self.base_url)
+            if not soup:
+                return []
+            
+            # Trouver les liens d'articles
+            article_links = self.find_article_links(soup, max_links=max_articles)
         
-        return None
-    
-    def _extract_image(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extraire l'image principale de l'article"""
-        # Meta tags Open Graph
-        og_image = soup.find('meta', property='og:image')
-        if og_image and og_image.get('content'):
-            return og_image['content']
-        
-        # Image dans l'article
-        selectors = [
-            'article img',
-            '.entry-content img',
-            '.post-thumbnail img',
-            '.featured-image img',
-        ]
+        if not article_links:
+            print("   ⚠️ Aucun lien d'article trouvé")
+            return []
         
-        for selector in selectors:
-            img = soup.select_one(selector)
-            if img and img.get('src'):
-                return urljoin(self.base_url, img['src'])
+        if from_homepage:
+            # Mêmes liens qu'à la collecte précédente: aucun article à visiter
+            if crawl_state and crawl_state.get('links_hash') == self.fingerprint_links(article_links):
+                self.not_modified = True
+                print("   ✅ Liens de la page d'accueil inchangés depuis la dernière collecte")
+                return []
+            
+            self.homepage_links = article_links
+            
+            # Ne visiter que les liens apparus depuis la collecte précédente
+            previous = set(json.loads(crawl_state.get('links') or '[]')) if crawl_state else set()
+            if previous:
+                article_links = [url for url in article_links if url not in previous]
+                print(f"   🆕 {len(article_links)} nouveaux liens sur {len(self.homepage_links)}")
+                if not article_links:
+                    return []
+        
+        # Ne pas télécharger les articles déjà en base
+        if existing_urls:
+            known = existing_urls(article_links)
+            if known:
+                article_links = [url for url in article_links if url not in known]
+                self.skipped_existing = len(known)
+                print(f"   ⏭️ {len(known)} articles déjà en base ignorés")
+            
+            if not article_links:
+                print("   ✅ Aucun nouvel article")
         
-        return None
+        return article_links
     
-    def scrape(self, media_id: int, days: int = 30, max_articles: int = 100) -> List[Article]:
+    def scrape(self, media_id: int, days: int = 30, max_articles: int = 100,
+               existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+               since: Optional[datetime] = None, use_sitemaps: bool = True,
+               crawl_state: Optional[Dict[str, Any]] = None) -> List[Article]:
         """
         Scraper le site complet
         
@@ -487,38 +491,41 @@ class SmartHTMLScraper:
             media_id: ID du média
             days: Nombre de jours à récupérer
             max_articles: Nombre maximum d'articles
+            existing_urls: Voir find_links
+            since: Voir find_links
+            use_sitemaps: Voir find_links
+            crawl_state: Voir find_links
         
         Returns:
-            Liste d'articles
+            Liste d'articles (self.not_modified indique que la page d'accueil n'a pas changé,
+            self.links_state contient les liens à enregistrer une fois les articles sauvegardés)
         """
         print(f"🌐 Scraping HTML depuis {self.base_url}...")
         
         # Date limite
         date_limit = datetime.now() - timedelta(days=days)
         
-        # Récupérer la page d'accueil
-        soup = self.get_page(self.base_url)
-        if not soup:
-            return []
-        
-        # Trouver les liens d'articles
-        article_links = self.find_article_links(soup, max_links=max_articles)
-        
+        article_links = self.find_links(days, max_articles, existing_urls, since,
+                                        use_sitemaps, crawl_state)
         if not article_links:
-            print("   ⚠️ Aucun lien d'article trouvé")
             return []
         
-        # Scraper chaque article
+        # Scraper les articles par vagues parallèles (plafonnées par domaine
+        # pour ne pas surcharger le serveur), dans l'ordre de la page
+        print(f"   📄 Scraping de {len(article_links)} articles ({self.max_parallel} en parallèle)...")
+        results = map_ordered(
+            lambda url: self.scrape_article(url, media_id, date_limit),
+            article_links,
+            max_workers=self.max_parallel
+        )
+        
         articles = []
-        for i, url in enumerate(article_links, 1):
-            print(f"   Article {i}/{len(article_links)}: {url[:80]}...")
-            
-            article = self.scrape_article(url, media_id, date_limit)
-            if article:
+        for url, (article, error) in zip(article_links, results):
+            if error:
+                self.failed_urls.add(url)
+                print(f"   ⚠️ Erreur scraping article {url[:80]}: {error}")
+            elif article:
                 articles.append(article)
-            
-            # Pause pour ne pas surcharger le serveur
-            time.sleep(0.5)
         
         print(f"✅ {len(articles)} articles scrapés avec succès")
         return articles
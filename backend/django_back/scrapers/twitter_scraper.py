@@ -2,10 +2,11 @@
 Scraper X (Twitter) utilisant l'API v2
 """
 
-import requests
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from .rate_limiter import RateLimitedSession
+
 
 class TwitterScraper:
     """Scraper pour récupérer les tweets via Twitter API v2"""
@@ -19,7 +20,7 @@ class TwitterScraper:
         """
         self.bearer_token = bearer_token
         self.base_url = "https://api.twitter.com/2"
-        self.session = requests.Session()
+        self.session = RateLimitedSession()
         self.session.headers.update({
             'Authorization': f'Bearer {bearer_token}',
             'Content-Type': 'application/json'
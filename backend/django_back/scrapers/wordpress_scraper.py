@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Scraper WordPress via l'API REST (/wp-json/wp/v2/posts)
+Titre, contenu, auteur, date, catégories et image sont lus dans le JSON:
+aucune page d'article n'est téléchargée
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+
+from database.models import Article
+from .rate_limiter import RateLimitedSession
+
+
+class WordPressScraper:
+    """Scraper basé sur l'API REST WordPress"""
+
+    def __init__(self, base_url: str, timeout: int = 30, per_page: int = 100):
+        """
+        Initialise le scraper WordPress
+
+        Args:
+            base_url: URL de base du site
+            timeout: Timeout pour les requêtes HTTP
+            per_page: Nombre d'articles par page d'API (100 maximum côté WordPress)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.api_url = f"{self.base_url}/wp-json/wp/v2/posts"
+        self.timeout = timeout
+        self.per_page = max(1, min(per_page, 100))
+        self.skipped_existing = 0  # Articles déjà en base
+        self.api_available = False  # L'API a répondu lors du dernier appel
+        self.domain = urlparse(base_url).netloc
+
+        self.session = RateLimitedSession()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'application/json'
+        })
+
+    def detect(self) -> bool:
+        """
+        Vérifier que le site expose l'API REST WordPress
+
+        Returns:
+            True si /wp-json/wp/v2/posts renvoie une liste JSON
+        """
+        print(f"   🔍 Détection de l'API WordPress...")
+
+        try:
+            response = self.session.get(
+                self.api_url,
+                params={'per_page': 1, '_fields': 'id'},
+                timeout=self.timeout
+            )
+            self.api_available = response.status_code == 200 and isinstance(response.json(), list)
+        except Exception:
+            self.api_available = False
+
+        print(f"   {'✅ API WordPress disponible' if self.api_available else '❌ API WordPress indisponible'}")
+        return self.api_available
+
+    def get_posts(self, days: int = 30, max_articles: int = 100) -> List[Dict[str, Any]]:
+        """
+        Récupérer les posts publiés depuis N jours, page par page
+
+        Args:
+            days: Nombre de jours dans le passé
+            max_articles: Nombre maximum d'articles
+
+        Returns:
+            Liste des posts (JSON WordPress avec _embedded)
+
+        Raises:
+            requests.RequestException: Si la première page est inaccessible
+        """
+        after = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%S')
+        per_page = min(self.per_page, max_articles)
+        posts = []
+        page = 1
+
+        while len(posts) < max_articles:
+            try:
+                response = self.session.get(self.api_url, params={
+                    'after': after,
+                    'per_page': per_page,
+                    'page': page,
+                    'orderby': 'date',
+                    'order': 'desc',
+                    '_embed': 1,
+                }, timeout=self.timeout)
+
+                # WordPress renvoie 400 au-delà de la dernière page
+                if response.status_code == 400 and page > 1:
+                    break
+                response.raise_for_status()
+                batch = response.json()
+            except Exception:
+                if page == 1:
+                    raise
+                print(f"   ⚠️ Erreur page {page} de l'API, arrêt de la pagination")
+                break
+
+            if not isinstance(batch, list) or not batch:
+                break
+
+            posts.extend(batch)
+            print(f"   📄 Page {page}: {len(batch)} articles")
+
+            total_pages = int(response.headers.get('X-WP-TotalPages', 0) or 0)
+            if len(batch) < per_page or (total_pages and page >= total_pages):
+                break
+            page += 1
+
+        return posts[:max_articles]
+
+    def _html_to_text(self, html: str, separator: str = '\n') -> str:
+        """Convertir un fragment HTML rendu par WordPress en texte"""
+        if not html:
+            return ''
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in soup.find_all(['script', 'style', 'iframe']):
+            tag.decompose()
+        return soup.get_text(separator=separator, strip=True)
+
+    def _parse_date(self, post: Dict[str, Any]) -> datetime:
+        """Lire la date de publication d'un post (heure locale du site)"""
+        try:
+            return datetime.fromisoformat(post.get('date', ''))
+        except (TypeError, ValueError):
+            return datetime.now()
+
+    def _build_article(self, post: Dict[str, Any], media_id: int) -> Optional[Article]:
+        """
+        Construire un Article à partir d'un post WordPress
+
+        Args:
+            post: Post JSON (avec _embed)
+            media_id: ID du média
+
+        Returns:
+            Objet Article ou None si le contenu est trop court
+        """
+        url = post.get('link')
+        titre = self._html_to_text(post.get('title', {}).get('rendered', ''), separator=' ')
+        contenu = self._html_to_text(post.get('content', {}).get('rendered', ''))
+
+        if not url or not titre or len(contenu) < 50:
+            return None
+
+        embedded = post.get('_embedded', {})
+
+        auteur = None
+        authors = embedded.get('author') or []
+        if authors and isinstance(authors[0], dict):
+            auteur = authors[0].get('name')
+
+        image_url = None
+        media = embedded.get('wp:featuredmedia') or []
+        if media and isinstance(media[0], dict):
+            image_url = media[0].get('source_url')
+
+        categories, tags = [], []
+        for terms in embedded.get('wp:term') or []:
+            for term in terms or []:
+                if not isinstance(term, dict):
+                    continue
+                if term.get('taxonomy') == 'category':
+                    categories.append(term.get('name'))
+                elif term.get('taxonomy') == 'post_tag':
+                    tags.append(term.get('name'))
+
+        return Article(
+            media_id=media_id,
+            titre=titre,
+            contenu=contenu,
+            extrait=self._html_to_text(post.get('excerpt', {}).get('rendered', ''), separator=' '),
+            url=url,
+            auteur=auteur,
+            date_publication=self._parse_date(post),
+            image_url=image_url,
+            categories=categories or None,
+            tags=tags or None,
+            source_type='wordpress_api'
+        )
+
+    def find_posts(self, days: int = 30, max_articles: int = 100,
+                   existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Récupérer les posts récents qui ne sont pas encore en base
+
+        Args:
+            days: Nombre de jours dans le passé
+            max_articles: Nombre maximum d'articles
+            existing_urls: Fonction retournant les URLs déjà en base parmi une liste
+
+        Returns:
+            Liste des posts JSON (self.api_available indique si l'API a répondu)
+        """
+        self.skipped_existing = 0
+
+        try:
+            posts = self.get_posts(days, max_articles)
+            self.api_available = True
+        except Exception as e:
+            print(f"   ❌ Erreur API WordPress: {e}")
+            self.api_available = False
+            return []
+
+        if existing_urls and posts:
+            known = existing_urls([post.get('link') for post in posts if post.get('link')])
+            if known:
+                posts = [post for post in posts if post.get('link') not in known]
+                self.skipped_existing = len(known)
+                print(f"   ⏭️ {len(known)} articles déjà en base ignorés")
+
+        return posts
+
+    def build_article(self, post: Dict[str, Any], media_id: int) -> Optional[Article]:
+        """
+        Construire un Article à partir d'un post, en journalisant les erreurs
+
+        Args:
+            post: Post JSON (avec _embed)
+            media_id: ID du média
+
+        Returns:
+            Objet Article ou None
+        """
+        try:
+            return self._build_article(post, media_id)
+        except Exception as e:
+            print(f"   ⚠️ Erreur parsing post {post.get('id')}: {e}")
+            return None
+
+    def scrape(self, media_id: int, days: int = 30, max_articles: int = 100,
+               existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None) -> List[Article]:
+        """
+        Scraper les articles via l'API REST WordPress
+
+        Args:
+            media_id: ID du média
+            days: Nombre de jours dans le passé
+            max_articles: Nombre maximum d'articles
+            existing_urls: Fonction retournant les URLs déjà en base parmi une liste
+
+        Returns:
+            Liste d'objets Article (self.api_available indique si l'API a répondu)
+        """
+        print(f"🌐 Scraping API WordPress depuis {self.base_url}...")
+
+        posts = self.find_posts(days, max_articles, existing_urls)
+        articles = [article for article in (self.build_article(post, media_id) for post in posts) if article]
+
+        print(f"✅ {len(articles)} articles récupérés via l'API WordPress")
+        return articles
@@ -0,0 +1,89 @@
+"""
+Tests de l'extraction d'articles avec profil de domaine
+"""
+
+import unittest
+from unittest import mock
+
+from scrapers import extraction
+from scrapers.extraction import ArticleExtractor, ExtractionProfile
+
+CONTENT = "<p>" + "Contenu de l'article suffisamment long pour être retenu. " * 5 + "</p>"
+
+# Page sans date, auteur ni image: seuls le titre et le contenu sont trouvés
+BARE_PAGE = f"""
+<html><head><title>Page nue</title></head><body>
+<h1 class="entry-title">Un premier article sans métadonnées</h1>
+<div class="entry-content">{CONTENT}</div>
+</body></html>
+"""
+
+FULL_PAGE = f"""
+<html><head>
+<meta property="article:published_time" content="2024-03-05T10:00:00+00:00">
+<meta name="author" content="Awa Ouédraogo">
+<meta property="og:image" content="https://example.bf/image.jpg">
+</head><body>
+<h1 class="entry-title">Un second article avec toutes ses métadonnées</h1>
+<div class="entry-content">{CONTENT}</div>
+</body></html>
+"""
+
+
+class ExtractionProfileTest(unittest.TestCase):
+
+    def test_field_without_preferred_rule_uses_full_cascade(self):
+        extractor = ArticleExtractor('https://example.bf', ExtractionProfile('example.bf'))
+
+        bare = extractor.extract(BARE_PAGE, 'https://example.bf/a')
+        self.assertIsNone(bare['date_publication'])
+        self.assertIsNone(bare['auteur'])
+
+        full = extractor.extract(FULL_PAGE, 'https://example.bf/b')
+        expected = ArticleExtractor('https://example.bf').extract(FULL_PAGE, 'https://example.bf/b')
+        self.assertEqual(full, expected)
+        self.assertEqual(full['date_publication'].year, 2024)
+        self.assertEqual(full['auteur'], 'Awa Ouédraogo')
+        self.assertEqual(full['image_url'], 'https://example.bf/image.jpg')
+
+    def test_learned_rules_give_same_fields_as_full_cascade(self):
+        profile = ExtractionProfile('example.bf')
+        extractor = ArticleExtractor('https://example.bf', profile)
+        extractor.extract(FULL_PAGE, 'https://example.bf/a')
+        self.assertEqual(set(profile.preferred),
+                         {'titre', 'date_publication', 'contenu', 'auteur', 'image_url'})
+
+        # Deuxième page: règles préférées seules
+        self.assertEqual(extractor.extract(FULL_PAGE, 'https://example.bf/b'),
+                         ArticleExtractor('https://example.bf').extract(FULL_PAGE, 'https://example.bf/b'))
+
+    def test_domain_without_optional_fields_uses_preferred_rules(self):
+        # Ni auteur ni image sur le domaine: ces champs n'auront jamais de règle préférée
+        page = FULL_PAGE.replace('name="author"', 'name="generator"').replace('og:image', 'og:site_name')
+        profile = ExtractionProfile('example.bf')
+        extractor = ArticleExtractor('https://example.bf', profile)
+        full_walk = mock.patch.object(extraction._ARTICLE_SELECTORS, 'match_first',
+                                      wraps=extraction._ARTICLE_SELECTORS.match_first)
+
+        with full_walk as match_first:
+            pages = [extractor.extract(page, f'https://example.bf/{i}') for i in range(5)]
+
+        # Cascade complète pour la première page seulement
+        self.assertEqual(match_first.call_count, 1)
+        self.assertEqual(set(profile.preferred), {'titre', 'date_publication', 'contenu'})
+        expected = ArticleExtractor('https://example.bf').extract(page, 'https://example.bf/4')
+        self.assertEqual(pages[-1], expected)
+        self.assertIsNone(pages[-1]['auteur'])
+
+    def test_preferred_rule_miss_falls_back_to_full_cascade(self):
+        extractor = ArticleExtractor('https://example.bf', ExtractionProfile('example.bf'))
+        extractor.extract(FULL_PAGE, 'https://example.bf/a')
+
+        # La date n'est plus dans la meta apprise mais dans l'URL
+        page = FULL_PAGE.replace('article:published_time', 'article:modified_time')
+        fields = extractor.extract(page, 'https://example.bf/2024/06/01/article')
+        self.assertEqual((fields['date_publication'].year, fields['date_publication'].month), (2024, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
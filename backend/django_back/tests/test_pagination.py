@@ -0,0 +1,104 @@
+"""
+Tests de la pagination par curseur (keyset)
+"""
+
+import sqlite3
+import unittest
+
+from database.pagination import decode_cursor, encode_cursor, fetch_keyset_page
+
+QUERY = "SELECT * FROM articles WHERE media_id = ? AND {keyset}"
+
+
+class KeysetPaginationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, media_id INTEGER, date_publication TEXT)")
+        # Dates en double (départage par id), articles sans date et un autre média
+        dates = ['2024-03-01', '2024-03-02', '2024-03-02', None, '2024-03-05',
+                 '2024-03-02', None, '2024-03-04', '2024-03-01', None, '2024-03-03']
+        for date in dates:
+            self.conn.execute("INSERT INTO articles (media_id, date_publication) VALUES (1, ?)", (date,))
+            self.conn.execute("INSERT INTO articles (media_id, date_publication) VALUES (2, ?)", (date,))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def expected_ids(self):
+        dated = self.conn.execute("""
+            SELECT id FROM articles WHERE media_id = 1 AND date_publication IS NOT NULL
+            ORDER BY date_publication DESC, id DESC
+        """).fetchall()
+        undated = self.conn.execute("""
+            SELECT id FROM articles WHERE media_id = 1 AND date_publication IS NULL
+            ORDER BY id DESC
+        """).fetchall()
+        return [row['id'] for row in dated + undated]
+
+    def all_pages(self, limit):
+        ids, pages, cursor = [], 0, None
+        while True:
+            page = fetch_keyset_page(self.conn, QUERY, [1], cursor, limit)
+            ids += [row['id'] for row in page['rows']]
+            pages += 1
+            cursor = page['next']
+            if cursor is None:
+                return ids, pages
+
+    def test_pages_cover_all_rows_without_duplicates(self):
+        expected = self.expected_ids()
+        for limit in (1, 2, 3, 4, len(expected), len(expected) + 5):
+            with self.subTest(limit=limit):
+                ids, pages = self.all_pages(limit)
+                self.assertEqual(ids, expected)
+                self.assertEqual(pages, max(1, -(-len(expected) // limit)))
+
+    def test_page_boundary_between_dated_and_undated_rows(self):
+        dated = self.conn.execute(
+            "SELECT COUNT(*) FROM articles WHERE media_id = 1 AND date_publication IS NOT NULL"
+        ).fetchone()[0]
+
+        first = fetch_keyset_page(self.conn, QUERY, [1], None, dated)
+        second = fetch_keyset_page(self.conn, QUERY, [1], first['next'], dated)
+
+        self.assertTrue(all(row['date_publication'] for row in first['rows']))
+        self.assertTrue(all(row['date_publication'] is None for row in second['rows']))
+        self.assertIsNone(second['next'])
+
+    def test_rows_inserted_between_pages_do_not_shift_results(self):
+        first = fetch_keyset_page(self.conn, QUERY, [1], None, 4)
+        # Un article plus récent arrive pendant la lecture: avec OFFSET il décalerait la page suivante
+        self.conn.execute("INSERT INTO articles (media_id, date_publication) VALUES (1, '2024-03-09')")
+        second = fetch_keyset_page(self.conn, QUERY, [1], first['next'], 4)
+
+        first_ids = [row['id'] for row in first['rows']]
+        second_ids = [row['id'] for row in second['rows']]
+        self.assertFalse(set(first_ids) & set(second_ids))
+        self.assertEqual(first_ids + second_ids, self.expected_ids()[1:9])
+
+    def test_limit_below_one_returns_one_row(self):
+        page = fetch_keyset_page(self.conn, QUERY, [1], None, 0)
+        self.assertEqual(len(page['rows']), 1)
+        self.assertIsNotNone(page['next'])
+
+    def test_empty_result(self):
+        page = fetch_keyset_page(self.conn, QUERY, [99], None, 10)
+        self.assertEqual(page, {'rows': [], 'next': None})
+
+    def test_invalid_cursor(self):
+        # Base64 invalide, mauvais nombre de clés, JSON invalide ("not json")
+        for cursor in ('%%%', encode_cursor(['2024-03-01']), 'bm90IGpzb24'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    fetch_keyset_page(self.conn, QUERY, [1], cursor, 10)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(['2024-03-01', 7]), 2), ['2024-03-01', 7])
+        self.assertEqual(decode_cursor(encode_cursor([None, 7]), 2), [None, 7])
+        self.assertIsNone(decode_cursor(None, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
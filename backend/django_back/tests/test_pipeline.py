@@ -0,0 +1,116 @@
+"""
+Tests du pipeline de collecte par étapes
+"""
+
+import threading
+import unittest
+
+from scrapers.pipeline import Pipeline, Stage
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_stages_run_in_order_and_keep_item_order(self):
+        pipeline = Pipeline([
+            Stage('telechargement', lambda item: item + ['telechargement']),
+            Stage('parsing', lambda item: item + ['parsing']),
+            Stage('sauvegarde', lambda item: item + ['sauvegarde']),
+        ], queue_size=2)
+
+        results = pipeline.run([[i] for i in range(50)])
+
+        # Un worker par étape: files FIFO, l'ordre d'entrée est conservé
+        self.assertEqual(results, [[i, 'telechargement', 'parsing', 'sauvegarde'] for i in range(50)])
+        for name in ('telechargement', 'parsing', 'sauvegarde'):
+            self.assertEqual(pipeline.stats[name]['entrees'], 50)
+            self.assertEqual(pipeline.stats[name]['sorties'], 50)
+
+    def test_every_item_passes_every_stage_with_concurrent_workers(self):
+        seen = []
+        lock = threading.Lock()
+
+        def record(item):
+            with lock:
+                seen.append(item)
+            return item
+
+        pipeline = Pipeline([
+            Stage('telechargement', lambda item: item * 10, workers=4),
+            Stage('sauvegarde', record, workers=3),
+        ])
+
+        results = pipeline.run(range(100))
+
+        self.assertEqual(sorted(results), [i * 10 for i in range(100)])
+        self.assertEqual(sorted(seen), sorted(results))
+
+    def test_none_drops_item(self):
+        pipeline = Pipeline([
+            Stage('filtre', lambda item: item if item % 2 else None),
+            Stage('sauvegarde', lambda item: item),
+        ])
+
+        self.assertEqual(pipeline.run(range(10)), [1, 3, 5, 7, 9])
+        self.assertEqual(pipeline.stats['filtre']['ignores'], 5)
+        self.assertEqual(pipeline.stats['sauvegarde']['entrees'], 5)
+
+    def test_error_drops_only_failing_item_and_reaches_on_error(self):
+        errors = []
+        later_stage = []
+
+        def parse(item):
+            if item == 3:
+                raise ValueError("page illisible")
+            return item
+
+        def save(item):
+            later_stage.append(item)
+            return item
+
+        pipeline = Pipeline([Stage('parsing', parse), Stage('sauvegarde', save)])
+        results = pipeline.run(range(6), on_error=lambda stage, item, error: errors.append((stage, item, error)))
+
+        self.assertEqual(results, [0, 1, 2, 4, 5])
+        self.assertNotIn(3, later_stage)
+        self.assertEqual(len(errors), 1)
+        stage, item, error = errors[0]
+        self.assertEqual((stage, item), ('parsing', 3))
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(pipeline.stats['parsing']['erreurs'], 1)
+        self.assertEqual(pipeline.stats['sauvegarde']['entrees'], 5)
+
+    def test_batch_error_reports_whole_batch(self):
+        errors = []
+
+        def save(batch):
+            if 2 in batch:
+                raise RuntimeError("écriture impossible")
+            return batch
+
+        pipeline = Pipeline([Stage('sauvegarde', save, batch_size=5, batch_wait=0.1)])
+        pipeline.run(range(5), on_error=lambda stage, item, error: errors.append((stage, item)))
+
+        self.assertEqual(errors, [('sauvegarde', [0, 1, 2, 3, 4])])
+        self.assertEqual(pipeline.stats['sauvegarde']['erreurs'], 5)
+
+    def test_input_error_propagates_after_stages_finish(self):
+        def items():
+            yield 1
+            yield 2
+            raise RuntimeError("source indisponible")
+
+        processed = []
+        pipeline = Pipeline([Stage('sauvegarde', processed.append)])
+
+        with self.assertRaises(RuntimeError):
+            pipeline.run(items())
+        # Les éléments déjà lus ont été traités avant la remontée de l'erreur
+        self.assertEqual(processed, [1, 2])
+
+    def test_empty_pipeline_rejected(self):
+        with self.assertRaises(ValueError):
+            Pipeline([])
+
+
+if __name__ == '__main__':
+    unittest.main()
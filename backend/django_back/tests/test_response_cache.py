@@ -0,0 +1,65 @@
+"""
+Tests du cache disque des réponses HTTP
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import requests
+
+from scrapers.response_cache import ResponseCache
+
+
+def html_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response._content = body.encode('utf-8')
+    return response
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_and_load(self):
+        self.cache.store('https://example.bf/a', html_response('<html>a</html>'))
+
+        response = self.cache.load('https://example.bf/a')
+        self.assertEqual(response.text, '<html>a</html>')
+        self.assertIsNone(self.cache.load('https://example.bf/b'))
+
+    def test_same_content_stored_from_concurrent_threads(self):
+        # Même page (redirection, page d'erreur) enregistrée en même temps par plusieurs workers
+        body = '<html>' + 'page identique ' * 20000 + '</html>'
+        barrier = threading.Barrier(8)
+        errors = []
+
+        def store(i):
+            barrier.wait()
+            try:
+                self.cache.store(f'https://example.bf/{i}', html_response(body))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=store, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.cache.get_stats()['contents'], 1)
+        self.assertEqual(self.cache.load('https://example.bf/3').text, body)
+        self.assertEqual(list(Path(self.tmp.name).rglob('*.tmp')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
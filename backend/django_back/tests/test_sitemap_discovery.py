@@ -0,0 +1,96 @@
+"""
+Tests de la découverte des articles via les sitemaps
+"""
+
+import unittest
+from datetime import datetime
+
+from scrapers.sitemap_discovery import SitemapDiscovery
+
+SITE = 'https://example.bf'
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+
+
+class FakeSession:
+    """Session servant des pages fixes (404 pour les autres URLs)"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, timeout=None):
+        if url in self.pages:
+            return FakeResponse(200, self.pages[url])
+        return FakeResponse(404)
+
+
+def urlset(*entries):
+    urls = ''.join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}</url>"
+        for loc, lastmod in entries
+    )
+    return f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+
+def sitemapindex(*entries):
+    sitemaps = ''.join(
+        f"<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>" for loc, lastmod in entries
+    )
+    return f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{sitemaps}</sitemapindex>'
+
+
+def discovery(sitemap):
+    return SitemapDiscovery(SITE, session=FakeSession({f'{SITE}/sitemap.xml': sitemap}))
+
+
+class SitemapDiscoveryTest(unittest.TestCase):
+
+    since = datetime(2024, 3, 1)
+
+    def test_recent_urls_first_and_undated_dropped_with_since(self):
+        entries = discovery(urlset(
+            (f'{SITE}/ancien', '2024-02-01'),
+            (f'{SITE}/sans-date', None),
+            (f'{SITE}/recent', '2024-03-02'),
+            (f'{SITE}/plus-recent', '2024-03-05T08:00:00+00:00'),
+        )).discover(since=self.since)
+
+        self.assertEqual([url for url, _ in entries], [f'{SITE}/plus-recent', f'{SITE}/recent'])
+
+    def test_undated_urls_kept_after_dated_without_since(self):
+        entries = discovery(urlset(
+            (f'{SITE}/sans-date', None),
+            (f'{SITE}/recent', '2024-03-02'),
+        )).discover()
+
+        self.assertEqual([url for url, _ in entries], [f'{SITE}/recent', f'{SITE}/sans-date'])
+
+    def test_sitemap_without_lastmod_falls_back_to_homepage(self):
+        result = discovery(urlset(
+            (f'{SITE}/article-1', None),
+            (f'{SITE}/article-2', None),
+        )).discover(since=self.since)
+
+        # None: la page d'accueil est utilisée à la place du sitemap
+        self.assertIsNone(result)
+
+    def test_nothing_new_in_dated_index(self):
+        result = discovery(sitemapindex(
+            (f'{SITE}/sitemap-2024-01.xml', '2024-01-31'),
+        )).discover(since=self.since)
+
+        # Le site date ses sitemaps: aucune URL récente, sans repli sur la page d'accueil
+        self.assertEqual(result, [])
+
+    def test_no_sitemap(self):
+        self.assertIsNone(SitemapDiscovery(SITE, session=FakeSession({})).discover(since=self.since))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests du classificateur thématique avec modèle local et Ollama indisponible
+"""
+
+import unittest
+
+from analysis.ollama_client import OllamaClient
+from analysis.theme_classifier import ThemeClassifier
+
+TITRE = "Les Étalons en finale de la CAN"
+CONTENU = "Match, victoire, stade, joueur, entraîneur: le football burkinabè en fête."
+
+
+class FixedModel:
+    """Modèle local retournant toujours la même prédiction"""
+
+    def __init__(self, categorie, confiance):
+        self.prediction = (categorie, confiance)
+
+    def predict(self, titre, contenu):
+        return self.prediction
+
+
+def unreachable_client():
+    # Aucun serveur sur ce port: échec immédiat, sans nouvelle tentative
+    return OllamaClient('http://127.0.0.1:9', max_retries=0, connect_timeout=0.5)
+
+
+class ThemeClassifierTest(unittest.TestCase):
+
+    def classifier(self, confiance, local_only=False):
+        return ThemeClassifier(client=unreachable_client(), local_model=FixedModel('Politique', confiance),
+                               local_threshold=0.8, local_only=local_only)
+
+    def test_confident_local_prediction_skips_llm(self):
+        result = self.classifier(0.95).classify_article(TITRE, CONTENU)
+
+        self.assertEqual((result['categorie'], result['confiance'], result['methode']),
+                         ('Politique', 0.95, 'local_model'))
+
+    def test_failed_escalation_keeps_local_prediction(self):
+        result = self.classifier(0.55).classify_article(TITRE, CONTENU)
+
+        # Pas de repli sur les mots-clés (qui auraient donné 'Sport')
+        self.assertEqual((result['categorie'], result['confiance'], result['methode']),
+                         ('Politique', 0.55, 'local_model'))
+
+    def test_local_only_leaves_uncertain_articles_unclassified(self):
+        classifier = self.classifier(0.55, local_only=True)
+
+        self.assertIsNone(classifier.classify_article(TITRE, CONTENU))
+        results = classifier.classify_batch([{'id': 1, 'titre': TITRE, 'contenu': CONTENU}],
+                                            show_progress=False)
+        self.assertEqual(results, [])
+        self.assertEqual(classifier.client.stats['requetes'], 0)
+
+    def test_local_only_keeps_confident_predictions(self):
+        results = self.classifier(0.9, local_only=True).classify_batch(
+            [{'id': 1, 'titre': TITRE, 'contenu': CONTENU}], show_progress=False)
+
+        self.assertEqual([(r['article_id'], r['methode']) for r in results], [(1, 'local_model')])
+
+    def test_keyword_fallback_without_local_model(self):
+        result = ThemeClassifier(client=unreachable_client()).classify_article(TITRE, CONTENU)
+
+        self.assertEqual((result['categorie'], result['methode']), ('Sport', 'keywords_fallback'))
+
+
+if __name__ == '__main__':
+    unittest.main()
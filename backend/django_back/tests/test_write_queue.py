@@ -0,0 +1,122 @@
+"""
+Tests de la file d'écriture SQLite à écrivain unique
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from database.write_queue import WriteQueue
+
+
+class WriteQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'test.db')
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT UNIQUE)")
+        conn.close()
+        self.queue = WriteQueue(lambda: sqlite3.connect(self.path, check_same_thread=False))
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def values(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return [row[0] for row in conn.execute("SELECT value FROM items ORDER BY id")]
+        finally:
+            conn.close()
+
+    def insert(self, value):
+        return lambda conn: conn.execute("INSERT INTO items (value) VALUES (?)", (value,)).lastrowid
+
+    def block_writer(self):
+        """Occuper le thread écrivain: les écritures soumises ensuite forment un seul lot"""
+        started, release = threading.Event(), threading.Event()
+
+        def wait(conn):
+            started.set()
+            release.wait(5)
+
+        future = self.queue.submit(wait)
+        started.wait(5)
+        return release, future
+
+    def test_pending_writes_share_one_transaction(self):
+        release, blocker = self.block_writer()
+        futures = [self.queue.submit(self.insert(f'v{i}')) for i in range(50)]
+        release.set()
+
+        ids = [future.result(5) for future in futures]
+        blocker.result(5)
+        self.assertEqual(self.values(), [f'v{i}' for i in range(50)])
+        self.assertEqual(len(set(ids)), 50)
+        # Un lot pour l'écriture bloquante, un seul pour les 50 suivantes
+        self.assertEqual(self.queue.stats['transactions'], 2)
+        self.assertEqual(self.queue.stats['ecritures'], 51)
+
+    def test_max_batch_splits_transactions(self):
+        self.queue.close()
+        self.queue = WriteQueue(lambda: sqlite3.connect(self.path, check_same_thread=False), max_batch=10)
+        release, blocker = self.block_writer()
+        futures = [self.queue.submit(self.insert(f'v{i}')) for i in range(25)]
+        release.set()
+
+        for future in futures:
+            future.result(5)
+        self.assertEqual(len(self.values()), 25)
+        self.assertEqual(self.queue.stats['transactions'], 1 + 3)
+
+    def test_failing_write_is_rolled_back_alone(self):
+        def insert_then_fail(conn):
+            conn.execute("INSERT INTO items (value) VALUES ('partielle')")
+            raise RuntimeError("écriture interrompue")
+
+        release, blocker = self.block_writer()
+        before = self.queue.submit(self.insert('avant'))
+        failing = self.queue.submit(insert_then_fail)
+        duplicate = self.queue.submit(self.insert('avant'))
+        after = self.queue.submit(self.insert('apres'))
+        release.set()
+
+        before.result(5)
+        after.result(5)
+        with self.assertRaises(RuntimeError):
+            failing.result(5)
+        with self.assertRaises(sqlite3.IntegrityError):
+            duplicate.result(5)
+        # Les écritures du même lot sont validées, l'insertion partielle est annulée
+        self.assertEqual(self.values(), ['avant', 'apres'])
+        self.assertEqual(self.queue.stats['transactions'], 2)
+        self.assertEqual(self.queue.stats['erreurs'], 2)
+
+    def test_nested_write_runs_in_current_transaction(self):
+        def outer(conn):
+            conn.execute("INSERT INTO items (value) VALUES ('externe')")
+            return self.queue.submit(self.insert('imbriquee')).result(0)
+
+        self.queue.submit(outer).result(5)
+        self.assertEqual(self.values(), ['externe', 'imbriquee'])
+
+    def test_write_outside_transaction_runs_between_batches(self):
+        futures = [self.queue.submit(self.insert(f'a{i}')) for i in range(20)]
+        vacuum = self.queue.submit(lambda conn: conn.execute("VACUUM"), transaction=False)
+        futures += [self.queue.submit(self.insert(f'b{i}')) for i in range(20)]
+
+        vacuum.result(5)
+        for future in futures:
+            future.result(5)
+        self.assertEqual(len(self.values()), 40)
+
+    def test_vacuum_inside_transaction_fails(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            self.queue.submit(lambda conn: conn.execute("VACUUM")).result(5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Script pour entraîner le modèle local de classification thématique
+Apprend à partir des classifications déjà produites par Mistral (table
+classifications): les articles pour lesquels le modèle local est confiant
+ne sont plus soumis au LLM
+"""
+
+import argparse
+import time
+
+from database.db_manager import DatabaseManager
+from analysis.local_classifier import DEFAULT_MODEL_PATH, LocalClassifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Entraîner le modèle local de classification')
+    parser.add_argument('--db-path', type=str, default='data/media_scan.db',
+                       help='Chemin vers la base de données (défaut: data/media_scan.db)')
+    parser.add_argument('--output', type=str, default=DEFAULT_MODEL_PATH,
+                       help=f'Fichier du modèle (défaut: {DEFAULT_MODEL_PATH})')
+    parser.add_argument('--min-confidence', type=float, default=0.6,
+                       help='Confiance minimale des étiquettes Mistral retenues')
+    parser.add_argument('--min-samples', type=int, default=200,
+                       help="Nombre minimum d'articles étiquetés pour entraîner")
+    parser.add_argument('--threshold', type=float, default=0.8,
+                       help="Seuil de confiance évalué (en dessous: escalade vers le LLM)")
+    parser.add_argument('--test-size', type=float, default=0.2,
+                       help="Part des articles réservée à l'évaluation")
+
+    args = parser.parse_args()
+
+    print("🔧 Initialisation de la base de données...")
+    db = DatabaseManager(db_path=args.db_path)
+
+    samples = db.get_classification_training_set(min_confidence=args.min_confidence)
+    print(f"📚 {len(samples)} articles étiquetés par Mistral (confiance ≥ {args.min_confidence})")
+
+    if len(samples) < args.min_samples:
+        print(f"❌ Pas assez d'articles pour entraîner le modèle (minimum: {args.min_samples})")
+        print("💡 Classifier d'abord des articles avec Mistral: python classify_articles.py")
+        return
+
+    print("\n🧠 Entraînement du modèle local...")
+    start = time.perf_counter()
+    try:
+        model = LocalClassifier.train(samples, test_size=args.test_size, threshold=args.threshold)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print(f"✅ Modèle entraîné en {time.perf_counter() - start:.1f}s")
+
+    print("\n📋 Par catégorie:")
+    for cat, count in sorted(model.metadata['categories'].items(), key=lambda x: x[1], reverse=True):
+        print(f"   • {cat}: {count} articles")
+
+    evaluation = model.metadata['evaluation']
+    if evaluation:
+        print(f"\n🔎 Évaluation sur {evaluation['articles']} articles réservés:")
+        print(f"   Précision (tous les articles): {evaluation['precision']}%")
+        print(f"   Articles classés sans LLM (confiance ≥ {args.threshold}): {evaluation['couverture']}%")
+        print(f"   Précision sur ces articles: {evaluation['precision_couverte']}%")
+        print(f"   Taux d'escalade vers le LLM: {evaluation['taux_escalade']}%")
+
+        # Latence d'une classification locale
+        texts = samples[:200]
+        start = time.perf_counter()
+        for sample in texts:
+            model.predict(sample['titre'], sample['contenu'])
+        per_article = (time.perf_counter() - start) / len(texts) * 1000
+        print(f"   Latence: {per_article:.2f} ms par article")
+
+    model.save(args.output)
+    print(f"\n💾 Modèle sauvegardé: {args.output}")
+    print("💡 Utilisé automatiquement par classify_articles.py et le scraper")
+
+
+if __name__ == '__main__':
+    main()